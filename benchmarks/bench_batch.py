@@ -0,0 +1,43 @@
+"""Benchmark: TokenOptimizer.optimize_batch scaling with worker count.
+
+Optimizes a batch of distinct CPU-bound prompts serially and with an
+increasing number of worker processes.  Run with::
+
+    python benchmarks/bench_batch.py [n_prompts]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from token_optimizer import TokenOptimizer
+
+PARAGRAPH = (
+    "I would like you to please write a function. In order to do this, due "
+    "to the fact that it matters, you should basically take into account the "
+    "majority of the edge cases. Make sure to validate the input. "
+)
+
+
+def main() -> None:
+    n_prompts = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    prompts = [f"Task {i}. " + PARAGRAPH * 8 for i in range(n_prompts)]
+
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>8} {'prompts/s':>10} {'speedup':>8}")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        optimizer = TokenOptimizer(strategy="moderate", cache_enabled=False)
+        start = time.perf_counter()
+        optimizer.optimize_batch(prompts, workers=workers, chunksize=32)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8} {elapsed:>8.2f} {n_prompts / elapsed:>10.0f} "
+            f"{baseline / elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
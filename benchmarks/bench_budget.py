@@ -0,0 +1,114 @@
+"""Benchmark: token-budget mode vs. retrying strategies until a prompt fits.
+
+The baseline is what callers did before ``max_tokens``: optimize with
+conservative, then moderate, then aggressive, recounting from scratch
+each time, until the result fits.  Budget mode counts once, returns prompts
+already within budget untouched, and otherwise escalates one analyzer at a
+time with incremental counting.  "Counted chars" is the text handed to the
+tokenizer, a proxy for encoding work with a real tokenizer.  Run with::
+
+    python benchmarks/bench_budget.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import warnings
+from typing import Sequence
+
+from token_optimizer import OptimizationResult, TokenOptimizer
+from token_optimizer.tokenizers.base import BaseTokenizer
+
+BUDGET = 400
+SENTENCES = [
+    "I would like you to please review the {0} module for errors.",
+    "In order to do this, you should basically read every function.",
+    "Due to the fact that the {0} code is old, make sure to check types.",
+    "It is important to note that the tests for {0} are slow.",
+    "Could you please summarize the findings for {0} in a short list?",
+]
+
+
+class _Recording(BaseTokenizer):
+    """Wraps a tokenizer and records how many characters it was given."""
+
+    def __init__(self, inner: BaseTokenizer) -> None:
+        self._inner = inner
+        self.chars = 0
+
+    @property
+    def name(self) -> str:
+        return self._inner.name
+
+    def count_tokens(self, text: str) -> int:
+        self.chars += len(text)
+        return self._inner.count_tokens(text)
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+        self.chars += sum(map(len, texts))
+        return self._inner.count_tokens_batch(texts)
+
+
+def _prompts(n: int = 200, seed: int = 0) -> list[str]:
+    """60% short prompts within budget, 40% long ones over it."""
+    rng = random.Random(seed)
+    prompts = []
+    for i in range(n):
+        paragraphs = 1 if rng.random() < 0.6 else rng.randint(6, 12)
+        prompts.append("\n\n".join(
+            " ".join(rng.choice(SENTENCES).format(f"part{i}x{p}") for _ in range(5))
+            for p in range(paragraphs)
+        ))
+    return prompts
+
+
+def _optimizer(strategy: str = "moderate") -> TokenOptimizer:
+    optimizer = TokenOptimizer(strategy=strategy, cache_enabled=False, token_memo=False)
+    optimizer._tokenizer = _Recording(optimizer._tokenizer)
+    return optimizer
+
+
+def _retry(ladder: list[TokenOptimizer], prompt: str) -> OptimizationResult:
+    for optimizer in ladder:
+        result = optimizer.optimize(prompt)
+        if result.optimized_tokens <= BUDGET:
+            break
+    return result
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")  # word-count estimate without tiktoken
+    prompts = _prompts()
+    counter = _optimizer()
+    groups = {"within budget": [], "over budget": []}
+    for prompt in prompts:
+        fits = counter.optimize(prompt, max_tokens=BUDGET).original_tokens <= BUDGET
+        groups["within budget" if fits else "over budget"].append(prompt)
+
+    print(f"{len(prompts)} prompts, budget {BUDGET} tokens")
+    print(
+        f"{'prompts':<20} {'mode':<18} {'ms':>8} {'counted chars':>14} "
+        f"{'fit':>5} {'saved':>7}"
+    )
+    for group, members in groups.items():
+        ladder = [_optimizer(name) for name in ("conservative", "moderate", "aggressive")]
+        budget = _optimizer()
+        for mode, run, tokenizers in [
+            ("retry strategies", lambda p: _retry(ladder, p), ladder),
+            ("max_tokens", lambda p: budget.optimize(p, max_tokens=BUDGET), [budget]),
+        ]:
+            start = time.perf_counter()
+            results = [run(prompt) for prompt in members]
+            ms = (time.perf_counter() - start) * 1000
+            chars = sum(optimizer._tokenizer.chars for optimizer in tokenizers)
+            fit = sum(r.optimized_tokens <= BUDGET for r in results)
+            saved = sum(r.tokens_saved for r in results)
+            label = f"{group} ({len(members)})"
+            print(
+                f"{label:<20} {mode:<18} {ms:>8.1f} {chars:>14,} {fit:>5} {saved:>7,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
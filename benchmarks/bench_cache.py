@@ -0,0 +1,74 @@
+"""Benchmark: optimize() latency on cache misses vs. cache hits, and
+PromptCache throughput with several threads sharing one cache.
+
+Run with::
+
+    python benchmarks/bench_cache.py
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from token_optimizer import TokenOptimizer
+from token_optimizer.cache import PromptCache
+
+PARAGRAPH = (
+    "I would like you to please write a function. In order to do this, due "
+    "to the fact that it matters, you should basically take into account the "
+    "majority of the edge cases. "
+)
+SIZES = [1_000, 10_000, 100_000]
+THREADS = [1, 4, 8]
+OPS_PER_THREAD = 20_000
+
+
+def bench_threads(shards: int, threads: int) -> float:
+    """Return get/put operations per second across ``threads`` threads."""
+    cache = PromptCache(maxsize=1024, shards=shards)
+    keys = [f"prompt {i}" for i in range(2048)]
+
+    def worker(offset: int) -> None:
+        for i in range(OPS_PER_THREAD):
+            key = keys[(offset + i * 7) % len(keys)]
+            if cache.get(key, "moderate") is None:
+                cache.put(key, "moderate", key)
+
+    pool = [threading.Thread(target=worker, args=(n * 97,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return threads * OPS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'chars':>8} {'miss (ms)':>10} {'hit (us)':>9}")
+    for size in SIZES:
+        text = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+
+        start = time.perf_counter()
+        optimizer.optimize(text)
+        miss = time.perf_counter() - start
+
+        hits = 1_000
+        start = time.perf_counter()
+        for _ in range(hits):
+            optimizer.optimize(text)
+        hit = (time.perf_counter() - start) / hits
+
+        print(f"{size:>8} {miss * 1e3:>10.2f} {hit * 1e6:>9.1f}")
+
+    print()
+    print(f"{'threads':>8} {'1 shard (ops/s)':>16} {'16 shards (ops/s)':>18}")
+    for threads in THREADS:
+        single = bench_threads(1, threads)
+        sharded = bench_threads(16, threads)
+        print(f"{threads:>8} {single:>16,.0f} {sharded:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: PromptCache hit ratio, LRU vs. W-TinyLFU admission, on traces.
+
+Each trace is replayed as get-then-put-on-miss against caches of the same
+capacity.  Traces mix Zipf-distributed requests for reusable prompts with
+bursts of one-off prompts (scans), and the byte-budget rows use prompt
+sizes ranging from a few hundred bytes to a few hundred kilobytes.
+
+Run with::
+
+    python benchmarks/bench_cache_policy.py
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+
+from token_optimizer.cache import PromptCache
+
+KEYS = 20_000
+REQUESTS = 200_000
+CAPACITY = 1_000
+MAX_BYTES = 2 * 1024 * 1024
+
+
+def zipf_trace(rng: random.Random, n: int, skew: float = 0.9) -> list[str]:
+    weights = [1 / (rank**skew) for rank in range(1, KEYS + 1)]
+    return [f"prompt {k}" for k in rng.choices(range(KEYS), weights, k=n)]
+
+
+def with_scans(
+    trace: list[str], every: int = 5_000, length: int = 2_000
+) -> list[str]:
+    """Insert a burst of ``length`` one-off prompts every ``every`` requests."""
+    one_off = (f"one-off {i}" for i in itertools.count())
+    mixed: list[str] = []
+    for start in range(0, len(trace), every):
+        mixed.extend(trace[start : start + every])
+        mixed.extend(itertools.islice(one_off, length))
+    return mixed
+
+
+def sizes_for(rng: random.Random, keys: set[str]) -> dict[str, str]:
+    """Assign each key a payload with log-normally distributed size.
+
+    Sizes are rounded to whole kilobytes so payloads can share strings.
+    """
+    blocks: dict[int, str] = {}
+    payloads = {}
+    for key in sorted(keys):
+        kb = min(400, round(rng.lognormvariate(7.5, 1.5) / 1024))
+        payloads[key] = blocks.setdefault(kb, "x" * (kb * 1024 + 1))
+    return payloads
+
+
+def replay(cache: PromptCache, trace: list[str], payloads: dict[str, str]) -> float:
+    for key in trace:
+        if cache.get(key, "moderate") is None:
+            cache.put(key, "moderate", payloads.get(key, key))
+    return cache.stats().hit_ratio
+
+
+def main() -> None:
+    rng = random.Random(7)
+    zipf = zipf_trace(rng, REQUESTS)
+    scans = with_scans(zipf)
+    payloads = sizes_for(rng, set(zipf) | set(scans))
+
+    rows = [
+        ("zipf", zipf, {}, None),
+        ("zipf + scans", scans, {}, None),
+        ("zipf, 2 MB budget", zipf, payloads, MAX_BYTES),
+        ("zipf + scans, 2 MB budget", scans, payloads, MAX_BYTES),
+    ]
+    print(f"{'trace':<28} {'lru':>7} {'tinylfu':>8}")
+    for name, trace, sized, max_bytes in rows:
+        ratios = [
+            replay(
+                PromptCache(maxsize=CAPACITY, max_bytes=max_bytes, admission=policy),
+                trace,
+                sized,
+            )
+            for policy in ("lru", "tinylfu")
+        ]
+        print(f"{name:<28} {ratios[0]:>7.1%} {ratios[1]:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: document-level fallback vs. the sentence-level similarity guard.
+
+Builds a long prompt (about 20 pages) in which a few sentences lose
+keywords when rewritten, so the whole-document similarity drops below the
+threshold.  With ``similarity_guard="document"`` the optimizer reruns the
+whole prompt conservatively; with ``"segment"`` it reverts only the
+sentences that fell below the threshold.  Run with::
+
+    python benchmarks/bench_guard.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import warnings
+
+from token_optimizer import TokenOptimizer
+
+RUNS = 5
+THRESHOLDS = (0.0, 0.8, 0.9)  # 0.0: no guard runs, pipeline cost only
+PLAIN = [
+    "I would like you to please validate the {0} field against the schema.",
+    "Make sure to log the {0} errors together with the line number.",
+    "You should basically cache the parsed {0} results on disk.",
+    "Could you please return a short summary of the {0} warnings?",
+    "It is important to note that the {0} parser must handle nested arrays.",
+]
+NOUNS = ["invoice", "order", "session", "account", "report", "ticket"]
+LOSSY = (
+    "At this point in time, due to the fact that the majority of {0} users "
+    "are on mobile, render a compact view."
+)
+
+
+def _prompt(paragraphs: int = 200, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = []
+    for p in range(paragraphs):
+        names = [f"{rng.choice(NOUNS)}{p}x{s}" for s in range(5)]
+        sentences = [rng.choice(PLAIN).format(name) for name in names]
+        if p % 4 == 0:
+            sentences[rng.randrange(5)] = LOSSY.format(names[0])
+        out.append(" ".join(sentences))
+    return "\n\n".join(out)
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")  # word-count estimate without tiktoken
+    prompt = _prompt()
+    print(f"prompt: {len(prompt):,} chars")
+    print(
+        f"{'threshold':>9} {'guard':<10} {'ms':>8} {'savings':>8} "
+        f"{'similarity':>11}  strategy"
+    )
+    for threshold in THRESHOLDS:
+        for guard in ("document", "segment"):
+            optimizer = TokenOptimizer(
+                strategy="aggressive",
+                similarity_threshold=threshold,
+                similarity_guard=guard,
+                cache_enabled=False,
+            )
+            samples = []
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                result = optimizer.optimize(prompt)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{threshold:>9} {guard:<10} {min(samples):>8.1f} "
+                f"{result.savings_percent:>7.1f}% {result.similarity_score:>11.3f}  "
+                f"{result.strategy_used}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: import time and CLI startup, checked against a budget.
+
+Each measurement runs a fresh interpreter several times and takes the
+median.  Import costs come from ``python -X importtime``; the CLI rows are
+wall-clock time for one ``token-optimizer`` run minus an empty interpreter.
+Bytecode caching is left on so the numbers match an installed package.
+
+Exits with status 1 if any row exceeds its budget, so it can gate CI::
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --scale 2   # loosen budgets on slow hosts
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 7
+PROMPT = "I would like you to please write a function that sums a list."
+
+# (row, module, budget in ms) for ``python -X importtime -c "import module"``.
+# The package import is mostly ``typing``, for TYPE_CHECKING.
+IMPORTS = [
+    ("import token_optimizer", "token_optimizer", 25.0),
+    ("import token_optimizer.cli", "token_optimizer.cli", 40.0),
+    ("import token_optimizer.engine", "token_optimizer.engine", 80.0),
+]
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_ms(module: str) -> float:
+    """Median cumulative import time of ``module`` in a fresh interpreter."""
+    samples = []
+    for _ in range(RUNS + 1):  # the first run writes bytecode caches
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True, env=_env(),
+        ).stderr
+        for line in stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if name.strip() == module:
+                samples.append(int(cumulative) / 1000)
+    return statistics.median(samples[1:])
+
+
+def run_ms(code: str) -> float:
+    """Median wall-clock time of ``python -c code``."""
+    samples = []
+    for _ in range(RUNS + 1):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, check=True, env=_env(),
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples[1:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every budget by this."
+    )
+    args = parser.parse_args()
+
+    baseline = run_ms("pass")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cli = "from token_optimizer.cli import main; main({!r})"
+        rows = [
+            (name, import_ms(module), budget) for name, module, budget in IMPORTS
+        ]
+        rows.append(("cli --help", run_ms(cli.format(["--help"])) - baseline, 60.0))
+        rows.append(
+            ("cli, one prompt", run_ms(cli.format([PROMPT])) - baseline, 250.0)
+        )
+        rows.append((
+            "cli, persistent cache hit",
+            run_ms(cli.format([PROMPT, "--cache-dir", cache_dir])) - baseline,
+            250.0,
+        ))
+
+    print(f"interpreter startup: {baseline:.1f} ms (subtracted from cli rows)")
+    print(f"{'row':<32} {'ms':>8} {'budget':>8}")
+    over = []
+    for name, ms, budget in rows:
+        budget *= args.scale
+        flag = "  OVER" if ms > budget else ""
+        print(f"{name:<32} {ms:>8.1f} {budget:>8.1f}{flag}")
+        if ms > budget:
+            over.append(name)
+    if over:
+        sys.exit(f"startup budget exceeded: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
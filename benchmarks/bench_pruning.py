@@ -0,0 +1,82 @@
+"""Benchmark: extractive pruning of large documents to a token budget.
+
+Times ``SentencePruner`` on synthetic documents of up to 50k sentences,
+pruned to half their size, split into the centrality scoring and the
+whole call (sentence split, per-sentence counts, selection and removal).
+Scoring uses numpy when it is installed and at least 256 sentences are
+scored; run once with and once without numpy to compare.  Counts use the
+generic word estimate.  Run with::
+
+    python benchmarks/bench_pruning.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from token_optimizer.analyzers.pruning import (
+    SentencePruner,
+    centrality,
+    split_sentences,
+)
+from token_optimizer.tokenizers.generic import GenericTokenizer
+
+SIZES = (1_000, 10_000, 50_000)
+TOPICS = ["cache", "parser", "schema", "session", "invoice", "report", "queue"]
+TEMPLATES = [
+    "The {0} {1} must validate every {2} before it is stored.",
+    "Log each {0} error together with the {1} and the {2} identifier.",
+    "Return a short summary of the {0} {1} warnings for the {2} team.",
+    "Old {0} records are moved to the {1} archive after the {2} job runs.",
+    "It is worth noting that the {0} {1} was rewritten last year.",
+]
+
+
+def _document(sentences: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for start in range(0, sentences, 5):
+        lines.append(" ".join(
+            rng.choice(TEMPLATES).format(
+                rng.choice(TOPICS), f"field{rng.randrange(500)}", rng.choice(TOPICS)
+            )
+            for _ in range(min(5, sentences - start))
+        ))
+    return "\n".join(lines)
+
+
+def _ms(run) -> float:
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    try:
+        import numpy  # noqa: F401
+        scoring = "numpy"
+    except ImportError:
+        scoring = "pure Python"
+    count = GenericTokenizer().count_tokens_batch
+    print(f"centrality scoring: {scoring}")
+    print(
+        f"{'sentences':>10} {'chars':>11} {'score ms':>9} {'prune ms':>9} "
+        f"{'tokens':>9} {'pruned':>9}"
+    )
+    for size in SIZES:
+        text = _document(size)
+        sentences = [text[start:end] for start, end in split_sentences(text)]
+        tokens = count([text])[0]
+        pruner = SentencePruner(tokens // 2, count)
+        score_ms = _ms(lambda: centrality(sentences))
+        pruned: list[str] = []
+        prune_ms = _ms(lambda: pruned.append(pruner.analyze(text, ["invoice"])))
+        print(
+            f"{len(sentences):>10,} {len(text):>11,} {score_ms:>9.1f} "
+            f"{prune_ms:>9.1f} {tokens:>9,} {count(pruned)[0]:>9,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
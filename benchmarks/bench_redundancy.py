@@ -0,0 +1,55 @@
+"""Benchmark: exact vs. MinHash/LSH sentence deduplication.
+
+Builds a single long paragraph of synthetic sentences with a fraction of
+near-duplicates and times ``RedundancyAnalyzer`` in both modes.  Run with::
+
+    python benchmarks/bench_redundancy.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+
+SIZES = [500, 1_000, 2_000, 4_000]
+WORDS = [f"term{i}" for i in range(5_000)]
+
+
+def _make_paragraph(n_sentences: int, dup_rate: float = 0.2, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sentences: list[str] = []
+    for _ in range(n_sentences):
+        if sentences and rng.random() < dup_rate:
+            words = rng.choice(sentences).rstrip(".").split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        else:
+            words = rng.sample(WORDS, 14)
+        sentences.append(" ".join(words) + ".")
+    return " ".join(sentences)
+
+
+def _time(analyzer: RedundancyAnalyzer, text: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = analyzer.analyze(text)
+    return time.perf_counter() - start, result.count(".")
+
+
+def main() -> None:
+    print(
+        f"{'sentences':>10} {'exact (s)':>10} {'lsh (s)':>9} "
+        f"{'kept exact':>11} {'kept lsh':>9}"
+    )
+    for size in SIZES:
+        text = _make_paragraph(size)
+        exact_time, exact_kept = _time(RedundancyAnalyzer(mode="exact"), text)
+        lsh_time, lsh_kept = _time(RedundancyAnalyzer(mode="lsh"), text)
+        print(
+            f"{size:>10} {exact_time:>10.2f} {lsh_time:>9.2f} "
+            f"{exact_kept:>11} {lsh_kept:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark: similarity backends, throughput and separation.
+
+Throughput: per-pair score() vs. score_batch() on synthetic prompts over a
+few thousand distinct words, each paired with a copy that keeps roughly
+70% of its words.  Batches use numpy when it is installed.
+
+Separation: mean score of compressions that keep the meaning minus mean
+score of pairs that change it, on a small hand-labelled set.  Higher is
+better; the guard threshold has to fall between the two groups.
+
+The embedding rows only appear when sentence-transformers and its model
+are available.
+
+Run with::
+
+    python benchmarks/bench_similarity.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from token_optimizer.metrics.similarity import SimilarityScorer
+
+PAIRS = 10_000
+VOCABULARY = [f"term{i}" for i in range(5_000)] + ["the", "of", "please", "a"]
+
+# (original, rewrite) pairs where the rewrite keeps the meaning ...
+SAME = [
+    ("I would like you to please write a function that parses the dates",
+     "Write a function parsing dates"),
+    ("Refactor the parsing functions and add failing tests",
+     "Refactor parser function, add failing test"),
+    ("Could you summarize the following customer reviews for me",
+     "Summarize these customer reviews"),
+    ("Please explain in detail how the caching layer invalidates entries",
+     "Explain how caching layer invalidates entries"),
+    ("Generate unit tests covering the authentication middleware",
+     "Generate unit tests for authentication middleware"),
+    ("Translate the following paragraphs from English into German",
+     "Translate paragraphs English to German"),
+]
+# ... and pairs where it does not.
+DIFFERENT = [
+    ("Write a function that parses the dates", "Write a function that formats numbers"),
+    ("Summarize the customer reviews", "Delete the customer reviews"),
+    ("Explain how the caching layer invalidates entries",
+     "Explain how the logging layer rotates files"),
+    ("Generate unit tests covering the authentication middleware",
+     "Generate documentation for the billing service"),
+    ("Translate the paragraphs from English into German",
+     "Translate the paragraphs from Spanish into French"),
+    ("Refactor the parsing functions", "Benchmark the rendering pipeline"),
+]
+
+
+def make_pairs(rng: random.Random, n: int) -> tuple[list[str], list[str]]:
+    originals = [
+        " ".join(rng.choices(VOCABULARY, k=rng.randint(20, 120))) for _ in range(n)
+    ]
+    optimizeds = [
+        " ".join(w for w in text.split() if rng.random() < 0.7) for text in originals
+    ]
+    return originals, optimizeds
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def separation(scorer: SimilarityScorer) -> float:
+    same = scorer.score_batch(*zip(*SAME))
+    different = scorer.score_batch(*zip(*DIFFERENT))
+    return sum(same) / len(same) - sum(different) / len(different)
+
+
+def main() -> None:
+    try:
+        import numpy  # noqa: F401
+        print("numpy: installed")
+    except ImportError:
+        print("numpy: not installed (pure-Python batches)")
+
+    scorers = {"keyword": SimilarityScorer(), "hashing": SimilarityScorer(backend="hashing")}
+    try:
+        scorers["embedding"] = SimilarityScorer(backend="embedding")
+    except (ImportError, OSError):
+        pass
+
+    originals, optimizeds = make_pairs(random.Random(11), PAIRS)
+    print(
+        f"{'backend':<10} {'score (pairs/s)':>16} {'score_batch (pairs/s)':>22} "
+        f"{'separation':>11}"
+    )
+    for name, scorer in scorers.items():
+        single = best_of(
+            lambda: [scorer.score(a, b) for a, b in zip(originals, optimizeds)],
+            repeat=1,
+        )
+        batch = best_of(lambda: scorer.score_batch(originals, optimizeds))
+        print(
+            f"{name:<10} {PAIRS / single:>16,.0f} {PAIRS / batch:>22,.0f} "
+            f"{separation(scorer):>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
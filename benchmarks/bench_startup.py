@@ -0,0 +1,39 @@
+"""Benchmark: per-instance construction cost of TokenOptimizer.
+
+Measures model lookups and full optimizer construction, as done when
+building one optimizer per tenant or request.
+
+Run with::
+
+    python benchmarks/bench_startup.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from token_optimizer import TokenOptimizer
+from token_optimizer.providers import ProviderRegistry
+
+MODELS = ["gpt-4o", "claude-3-haiku-20240307", "command-r-plus", "llama-3-70b"]
+ROUNDS = 2_000
+
+
+def per_call_us(fn, rounds: int = ROUNDS) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    print(f"{'model':<26} {'lookup (us)':>12} {'construct (us)':>15}")
+    for model in MODELS:
+        registry = ProviderRegistry()
+        lookup = per_call_us(lambda: registry.lookup(model), ROUNDS * 10)
+        construct = per_call_us(lambda: TokenOptimizer(model=model))
+        print(f"{model:<26} {lookup:>12.2f} {construct:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: evaluating several strategies with and without a stage memo.
+
+Times, over a set of prompts, the two multi-strategy paths of the engine:
+best-of (conservative, moderate and aggressive on every prompt) and the
+conservative fallback after a moderate attempt.  Each is run once as
+independent ``optimize`` calls and once through a shared ``StageMemo`` per
+prompt, and the outputs are checked to be identical.  Run with::
+
+    python benchmarks/bench_strategies.py
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from token_optimizer.analyzers.stages import StageMemo
+from token_optimizer.strategies.aggressive import AggressiveStrategy
+from token_optimizer.strategies.best import BestOfStrategy
+from token_optimizer.strategies.conservative import ConservativeStrategy
+from token_optimizer.strategies.moderate import ModerateStrategy
+
+REPEATS = 3
+PARAGRAPH = (
+    "I would like you to please write a function. In order to do this, due "
+    "to the fact that it matters, you should basically take into account "
+    "the majority of the edge cases. Make sure to validate the input. "
+)
+MARKDOWN = (
+    "## Requirements\n\n**Please** make sure to handle the errors.\n\n"
+    "- It is important to note that the input may be empty.\n"
+    "- You should just return the result.\n\n\n"
+)
+
+
+def _prompts(n: int = 300) -> list[str]:
+    return [
+        f"Task {i}. " + (PARAGRAPH * 6 if i % 2 else MARKDOWN * 4 + PARAGRAPH * 2)
+        for i in range(n)
+    ]
+
+
+def _best_ms(run: Callable[[], object]) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def main() -> None:
+    prompts = _prompts()
+    conservative = ConservativeStrategy()
+    moderate = ModerateStrategy()
+    aggressive = AggressiveStrategy()
+    best = BestOfStrategy([conservative, moderate, aggressive])
+    memos: list[StageMemo] = []
+
+    def best_separate() -> list[list[str]]:
+        return [
+            [s.optimize(p) for s in (conservative, moderate, aggressive)]
+            for p in prompts
+        ]
+
+    def best_memoized() -> list[list[str]]:
+        memos.clear()
+        memos.extend(StageMemo() for _ in prompts)
+        return [
+            [text for _, text in best.evaluate(p, memo=memo)]
+            for p, memo in zip(prompts, memos)
+        ]
+
+    def fallback_separate() -> list[list[str]]:
+        return [[moderate.optimize(p), conservative.optimize(p)] for p in prompts]
+
+    def fallback_memoized() -> list[list[str]]:
+        memos.clear()
+        memos.extend(StageMemo() for _ in prompts)
+        return [
+            [
+                moderate.optimize_memoized(p, memo),
+                conservative.optimize_memoized(p, memo),
+            ]
+            for p, memo in zip(prompts, memos)
+        ]
+
+    print(f"{len(prompts)} prompts, best of {REPEATS} runs")
+    print(f"{'path':<10} {'separate ms':>12} {'memoized ms':>12} "
+          f"{'speedup':>8} {'stage hits':>11}")
+    for name, separate, memoized in [
+        ("best-of", best_separate, best_memoized),
+        ("fallback", fallback_separate, fallback_memoized),
+    ]:
+        assert separate() == memoized(), f"{name}: memoized outputs differ"
+        hits = sum(memo.hits for memo in memos)
+        total = hits + sum(memo.misses for memo in memos)
+        separate_ms = _best_ms(separate)
+        memoized_ms = _best_ms(memoized)
+        print(
+            f"{name:<10} {separate_ms:>12.1f} {memoized_ms:>12.1f} "
+            f"{separate_ms / memoized_ms:>7.2f}x {hits / total:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
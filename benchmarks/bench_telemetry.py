@@ -0,0 +1,85 @@
+"""Benchmark: cost of telemetry recording.
+
+Times cache-hit ``optimize`` calls (the cheapest path, where a fixed cost
+shows most) with telemetry off and on, then raw ``inc``/``observe`` calls
+from several threads while another thread scrapes the registry in a loop.
+Run with::
+
+    python benchmarks/bench_telemetry.py
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+
+from token_optimizer import TokenOptimizer
+from token_optimizer.metrics.telemetry import Telemetry
+
+PROMPT = "Please could you kindly write a function in order to sort a list."
+CALLS = 20_000
+THREADS = (1, 4)
+RECORDS = 50_000
+
+
+def _per_call_us(run, calls: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def _threaded(threads: int) -> tuple[float, int]:
+    """Seconds to record RECORDS per thread, and scrapes completed meanwhile."""
+    telemetry = Telemetry()
+    done = threading.Event()
+    scrapes = 0
+
+    def record() -> None:
+        for _ in range(RECORDS):
+            telemetry.inc("prompts", ("gpt-4o",))
+            telemetry.observe("optimize_seconds", ("gpt-4o",), 0.003)
+
+    def scrape() -> None:
+        nonlocal scrapes
+        while not done.is_set():
+            telemetry.exposition()
+            scrapes += 1
+
+    scraper = threading.Thread(target=scrape)
+    workers = [threading.Thread(target=record) for _ in range(threads)]
+    start = time.perf_counter()
+    scraper.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    scraper.join()
+    assert telemetry.counters()["prompts", ("gpt-4o",)] == threads * RECORDS
+    return elapsed, scrapes
+
+
+def main() -> None:
+    warnings.simplefilter("ignore")
+    for enabled in (False, True):
+        optimizer = TokenOptimizer(model="gpt-4o", telemetry=enabled)
+        optimizer.optimize(PROMPT)
+        us = _per_call_us(lambda: optimizer.optimize(PROMPT), CALLS)
+        state = "on " if enabled else "off"
+        print(f"cache-hit optimize, telemetry {state}: {us:6.2f} us")
+
+    print(f"\n{'threads':>7} {'records/s':>12} {'scrapes':>8}")
+    for threads in THREADS:
+        elapsed, scrapes = _threaded(threads)
+        rate = threads * RECORDS / elapsed
+        print(f"{threads:>7} {rate:>12,.0f} {scrapes:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: counting 100k strings one at a time vs. count_tokens_batch,
+and serial vs. parallel chunked counting of one 1, 10 and 100 MB text.
+
+The OpenAI rows need tiktoken; they are skipped when tiktoken is missing.
+
+Run with::
+
+    python benchmarks/bench_tokenize.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from token_optimizer.tokenizers.anthropic_tokenizer import AnthropicTokenizer
+from token_optimizer.tokenizers.base import BaseTokenizer
+from token_optimizer.tokenizers.generic import GenericTokenizer
+
+COUNT = 100_000
+LARGE_SIZES_MB = [1, 10, 100]
+WORDS = "write a function that returns the sum of every value in the list".split()
+
+
+def make_texts(rng: random.Random) -> list[str]:
+    return [" ".join(rng.choices(WORDS, k=rng.randint(5, 200))) for _ in range(COUNT)]
+
+
+def tokenizers() -> list[BaseTokenizer]:
+    found: list[BaseTokenizer] = [GenericTokenizer(), AnthropicTokenizer()]
+    try:
+        from token_optimizer.tokenizers.openai_tokenizer import OpenAITokenizer
+
+        found.append(OpenAITokenizer("gpt-4o"))
+    except ImportError:
+        print("tiktoken not installed; skipping openai")
+    return found
+
+
+def main() -> None:
+    texts = make_texts(random.Random(3))
+    print(f"{'tokenizer':<10} {'single (s)':>11} {'batch (s)':>10} {'speedup':>8}")
+    for tokenizer in tokenizers():
+        start = time.perf_counter()
+        single = [tokenizer.count_tokens(text) for text in texts]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = tokenizer.count_tokens_batch(texts)
+        batch_time = time.perf_counter() - start
+
+        assert batch == single
+        print(
+            f"{tokenizer.name:<10} {single_time:>11.3f} {batch_time:>10.3f} "
+            f"{single_time / batch_time:>7.1f}x"
+        )
+
+
+def bench_large_text() -> None:
+    try:
+        from token_optimizer.tokenizers.openai_tokenizer import OpenAITokenizer
+
+        serial = OpenAITokenizer("gpt-4o", parallel_min_chars=None)
+        parallel = OpenAITokenizer("gpt-4o")
+    except ImportError:
+        return
+
+    rng = random.Random(5)
+    paragraph = "\n".join(make_texts(rng)[:200]) + "\n\n"
+    print()
+    print(f"{'MB':>4} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    for size in LARGE_SIZES_MB:
+        chars = size * 1_000_000
+        text = (paragraph * (chars // len(paragraph) + 1))[:chars]
+
+        start = time.perf_counter()
+        expected = serial.count_tokens(text)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = parallel.count_tokens(text)
+        parallel_time = time.perf_counter() - start
+
+        assert count == expected
+        print(
+            f"{size:>4} {serial_time:>11.2f} {parallel_time:>13.2f} "
+            f"{serial_time / parallel_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
+    bench_large_text()
@@ -6,6 +6,12 @@ from token_optimizer.analyzers.filler import FillerAnalyzer
 from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
 from token_optimizer.analyzers.verbosity import VerbosityAnalyzer
 from token_optimizer.analyzers.structural import StructuralAnalyzer
+from token_optimizer.analyzers.matcher import compile_phrases
+from token_optimizer.analyzers.pruning import (
+    SentencePruner,
+    centrality,
+    split_sentences,
+)
 
 
 # ── Filler Analyzer ──────────────────────────────────────────────────────
@@ -62,6 +68,18 @@ class TestFillerAnalyzer:
         with pytest.raises(ValueError):
             FillerAnalyzer(aggressiveness=0)
 
+    def test_prefers_longest_phrase(self):
+        analyzer = FillerAnalyzer(aggressiveness=1)
+        result = analyzer.analyze("Can you help me to write a function")
+        assert result == "write a function"
+
+    def test_preserved_keyword_keeps_phrase(self):
+        analyzer = FillerAnalyzer(aggressiveness=1)
+        result = analyzer.analyze(
+            "Could you please write a function", preserve_keywords=["please"]
+        )
+        assert "please" in result
+
 
 # ── Redundancy Analyzer ─────────────────────────────────────────────────
 
@@ -101,6 +119,39 @@ class TestRedundancyAnalyzer:
         with pytest.raises(ValueError):
             RedundancyAnalyzer(similarity_threshold=0.0)
 
+    def test_repeated_phrase_removal_is_case_insensitive(self):
+        analyzer = RedundancyAnalyzer()
+        text = "check the input first then Check The Input again"
+        result = analyzer.analyze(text)
+        assert result == "check the input first then again"
+
+    def test_long_paragraph_phrase_dedup(self):
+        analyzer = RedundancyAnalyzer()
+        words = [f"w{i}" for i in range(50_000)]
+        text = " ".join(words + words[:5])
+        assert analyzer.analyze(text) == " ".join(words)
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            RedundancyAnalyzer(mode="fuzzy")
+
+    def test_lsh_mode_matches_exact_mode(self):
+        text = (
+            "Format the output as JSON. Write a parser for the config file. "
+            "Make sure to format output as JSON. Write a parser for config file."
+        )
+        exact = RedundancyAnalyzer(mode="exact").analyze(text)
+        lsh = RedundancyAnalyzer(mode="lsh").analyze(text)
+        assert lsh == exact
+        assert len(lsh) < len(text)
+
+    def test_cross_paragraph_dedup(self):
+        text = "Return the result as JSON.\nReturn the result as JSON."
+        within = RedundancyAnalyzer().analyze(text)
+        across = RedundancyAnalyzer(mode="lsh", cross_paragraph=True).analyze(text)
+        assert within.count("JSON") == 2
+        assert across.count("JSON") == 1
+
 
 # ── Verbosity Analyzer ──────────────────────────────────────────────────
 
@@ -114,6 +165,11 @@ class TestVerbosityAnalyzer:
         assert "to" in result.lower()
         assert "because" in result.lower()
 
+    def test_rewrites_unicode_case_variants(self):
+        # "ſ" (long s) matches "s" case-insensitively but is not lowercase "s".
+        analyzer = VerbosityAnalyzer(aggressiveness=1)
+        assert analyzer.analyze("The tool iſ able to run.") == "The tool can run."
+
     def test_prunes_articles_at_level_2(self):
         analyzer = VerbosityAnalyzer(aggressiveness=2)
         text = "Write a function and create the class"
@@ -154,6 +210,28 @@ class TestVerbosityAnalyzer:
         with pytest.raises(ValueError):
             VerbosityAnalyzer(aggressiveness=4)
 
+    def test_rewrites_many_rules_in_one_pass(self):
+        analyzer = VerbosityAnalyzer(aggressiveness=1)
+        text = "Due to the fact that it fails, in order to fix it, at this point in time"
+        result = analyzer.analyze(text)
+        assert result == "Because it fails, to fix it, now"
+
+
+# ── Multi-pattern Matcher ───────────────────────────────────────────────
+
+
+class TestCompilePhrases:
+    def test_longest_match_wins(self):
+        pattern = compile_phrases(("take into", "take into account"))
+        assert pattern.sub("X", "Take into account this") == "X this"
+
+    def test_words_match_on_boundaries(self):
+        pattern = compile_phrases((), ("just",))
+        assert pattern.sub("", "just adjust") == " adjust"
+
+    def test_empty_rule_set(self):
+        assert compile_phrases(()) is None
+
 
 # ── Structural Analyzer ─────────────────────────────────────────────────
 
@@ -208,3 +286,90 @@ class TestStructuralAnalyzer:
     def test_invalid_aggressiveness(self):
         with pytest.raises(ValueError):
             StructuralAnalyzer(aggressiveness=0)
+
+
+# ── Sentence Pruner ──────────────────────────────────────────────────────
+
+
+def word_count(text):
+    return len(text.split())
+
+
+def word_count_batch(texts):
+    return [word_count(text) for text in texts]
+
+
+class TestSentencePruner:
+    TEXT = (
+        "The cache stores parsed results. The cache evicts old results.\n"
+        "Unrelated weather remark here.\n\n"
+        "Results in the cache expire hourly."
+    )
+
+    def test_fitting_text_is_unchanged(self):
+        assert SentencePruner(1000).analyze(self.TEXT) == self.TEXT
+
+    def test_drops_least_central_sentence_first(self):
+        pruner = SentencePruner(word_count(self.TEXT) - 1, word_count_batch)
+        result = pruner.analyze(self.TEXT)
+        assert "weather" not in result
+        assert "cache stores" in result
+        assert result == (
+            "The cache stores parsed results. The cache evicts old results.\n\n"
+            "Results in the cache expire hourly."
+        )
+
+    def test_meets_budget_and_keeps_order(self):
+        result = SentencePruner(10, word_count_batch).analyze(self.TEXT)
+        assert word_count(result) <= 10
+        sentences = [self.TEXT[a:b] for a, b in split_sentences(self.TEXT)]
+        kept = [s for s in sentences if s in result]
+        assert len(kept) == len(split_sentences(result))
+        positions = [result.index(s) for s in kept]
+        assert positions == sorted(positions)
+
+    def test_preserved_sentences_are_never_dropped(self):
+        pruner = SentencePruner(0, word_count_batch)
+        result = pruner.analyze(self.TEXT, preserve_keywords=["Weather"])
+        assert result == "Unrelated weather remark here."
+
+    def test_keeps_one_sentence(self):
+        result = SentencePruner(0, word_count_batch).analyze(self.TEXT)
+        assert result == "The cache stores parsed results."
+
+    def test_removes_emptied_lines(self):
+        text = "Intro line.\n  Drop me now.\nKeep cache here. Keep cache too."
+        pruner = SentencePruner(word_count(text) - 1, word_count_batch)
+        assert pruner.analyze(text, ["intro", "cache"]) == (
+            "Intro line.\nKeep cache here. Keep cache too."
+        )
+
+    def test_centrality_ranks_shared_content_higher(self):
+        scores = centrality([
+            "cache results expire",
+            "cache results stored",
+            "weather remark",
+            "the of and",
+        ])
+        assert scores[0] > scores[2]
+        assert scores[1] > scores[2]
+        assert scores[2] == scores[3] == 0.0
+
+    def test_centrality_numpy_matches_python(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        import random
+        from token_optimizer.analyzers import pruning
+
+        rng = random.Random(0)
+        vocabulary = ["cache", "data", "the", "store", "alpha", "beta", "x"]
+        sentences = [
+            " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8)))
+            for _ in range(300)
+        ]
+        fast = pruning._centrality_numpy(np, sentences)
+        monkeypatch.setattr(pruning, "_NUMPY_MIN_SENTENCES", 10**9)
+        assert fast == pytest.approx(centrality(sentences))
+
+    def test_negative_budget_rejected(self):
+        with pytest.raises(ValueError):
+            SentencePruner(-1)
@@ -0,0 +1,198 @@
+"""Tests for the benchmark suite."""
+
+import json
+
+import pytest
+
+from token_optimizer.analyzers.filler import FillerAnalyzer
+from token_optimizer.bench.corpus import CorpusSpec, corpus_digest, generate_corpus
+from token_optimizer.bench.report import (
+    EXAMPLE_PROMPTS,
+    render_performance,
+    render_savings,
+    update_document,
+)
+from token_optimizer.bench.runner import (
+    BenchReport,
+    BenchResult,
+    compare,
+    run_benchmarks,
+)
+from token_optimizer.cli import bench_main, main
+
+SMALL = CorpusSpec("small", prompts=5, chars=400)
+
+
+def _result(**overrides):
+    values = dict(
+        corpus="small",
+        target="filler",
+        kind="analyzer",
+        prompts=5,
+        chars=2000,
+        passes=10,
+        seconds=1.0,
+        mb_per_s=2.0,
+        prompts_per_s=50.0,
+        p50_ms=10.0,
+        p99_ms=20.0,
+        peak_mib=8.0,
+        reduction=0.05,
+    )
+    values.update(overrides)
+    return BenchResult(**values)
+
+
+def _report(*results, digest="abc"):
+    return BenchReport(list(results), corpora={"small": {"digest": digest}})
+
+
+class TestCorpus:
+    def test_reproducible(self):
+        texts = generate_corpus(SMALL)
+        assert generate_corpus(SMALL) == texts
+        assert corpus_digest(generate_corpus(SMALL)) == corpus_digest(texts)
+        other = generate_corpus(CorpusSpec("small", prompts=5, chars=400, seed=1))
+        assert corpus_digest(other) != corpus_digest(texts)
+
+    def test_sizes(self):
+        texts = generate_corpus(CorpusSpec("doc", prompts=3, chars=20_000))
+        assert len(texts) == 3
+        assert all(20_000 <= len(text) < 21_000 for text in texts)
+
+    def test_knobs(self):
+        plain = generate_corpus(
+            CorpusSpec("plain", 20, 1000, filler=0.0, redundancy=0.0, markdown=0.0)
+        )
+        text = "\n".join(plain)
+        assert "```" not in text and "\n- " not in text and "|" not in text
+        assert "basically" not in text and "Could you please" not in text
+
+        marked = "\n".join(generate_corpus(CorpusSpec("md", 20, 1000, markdown=1.0)))
+        assert "```" in marked and "|---|" in marked
+
+        filler = FillerAnalyzer()
+
+        def removed(fraction):
+            spec = CorpusSpec("f", 20, 1000, filler=fraction, markdown=0.0)
+            texts = generate_corpus(spec)
+            cut = sum(len(text) - len(filler.analyze(text)) for text in texts)
+            return cut / sum(map(len, texts))
+
+        assert removed(0.0) < 0.01 < 0.05 < removed(1.0)
+
+    def test_rejects_out_of_range_knobs(self):
+        with pytest.raises(ValueError):
+            CorpusSpec("bad", prompts=1, chars=100, redundancy=1.5)
+
+
+class TestRunner:
+    def test_run_in_process(self):
+        report = run_benchmarks(
+            [SMALL], ["filler", "moderate"], min_seconds=0, isolate=False
+        )
+        assert [(r.corpus, r.target, r.kind) for r in report.results] == [
+            ("small", "filler", "analyzer"),
+            ("small", "moderate", "strategy"),
+        ]
+        for result in report.results:
+            assert result.passes == 1
+            assert result.prompts == 5
+            assert result.chars == sum(map(len, generate_corpus(SMALL)))
+            assert 0 < result.p50_ms <= result.p99_ms
+            assert result.mb_per_s > 0 and result.peak_mib is None
+            assert 0 < result.reduction < 1
+        digest = corpus_digest(generate_corpus(SMALL))
+        assert report.corpora["small"]["digest"] == digest
+        assert "python" in report.environment
+
+    def test_isolated_run_measures_memory(self):
+        pytest.importorskip("resource")
+        report = run_benchmarks([SMALL], ["structural"], min_seconds=0)
+        assert report.results[0].peak_mib is not None
+
+    def test_rejects_unknown_target(self):
+        with pytest.raises(ValueError):
+            run_benchmarks([SMALL], ["nope"], isolate=False)
+
+    def test_json_round_trip(self):
+        report = _report(_result(), _result(target="moderate", peak_mib=None))
+        report.environment = {"python": "3.11"}
+        loaded = BenchReport.from_json(report.to_json())
+        assert loaded == report
+        assert json.loads(report.to_json())["results"][1]["peak_mib"] is None
+
+
+class TestCompare:
+    def test_finds_regressions_beyond_tolerance(self):
+        baseline = _report(_result())
+        current = _report(_result(mb_per_s=1.5, p50_ms=11.0, peak_mib=12.0))
+        regressions = compare(current, baseline, tolerance=0.2)
+        assert {r.metric for r in regressions} == {"mb_per_s", "peak_mib"}
+        throughput = next(r for r in regressions if r.metric == "mb_per_s")
+        assert throughput.change == pytest.approx(0.25)
+        assert "small/filler: mb_per_s" in str(throughput)
+
+    def test_ignores_noise_and_improvements(self):
+        baseline = _report(_result(p50_ms=0.01, peak_mib=0.1))
+        current = _report(_result(mb_per_s=4.0, p50_ms=0.03, peak_mib=0.5))
+        assert compare(current, baseline) == []
+
+    def test_skips_changed_corpora_and_new_targets(self):
+        baseline = _report(_result())
+        slower = _result(mb_per_s=0.5)
+        assert compare(_report(slower, digest="other"), baseline) == []
+        assert compare(_report(_result(target="best", mb_per_s=0.1)), baseline) == []
+
+
+class TestReport:
+    def test_update_document_replaces_only_generated_sections(self):
+        document = (
+            "# Title\n\n<!-- bench:savings -->\nold table\n<!-- /bench:savings -->\n"
+            "Hand-written.\n<!-- bench:performance -->\n<!-- /bench:performance -->\n"
+        )
+        updated = update_document(document, {"savings": "new", "performance": "perf"})
+        assert updated == (
+            "# Title\n\n<!-- bench:savings -->\nnew\n<!-- /bench:savings -->\n"
+            "Hand-written.\n"
+            "<!-- bench:performance -->\nperf\n<!-- /bench:performance -->\n"
+        )
+        assert update_document(updated, {"savings": "new"}) == updated
+
+    def test_update_document_requires_markers(self):
+        with pytest.raises(ValueError):
+            update_document("# Title\n", {"savings": "new"})
+
+    def test_render_savings(self):
+        outputs = [
+            {"conservative": prompt.text, "moderate": prompt.text, "aggressive": "a b"}
+            for prompt in EXAMPLE_PROMPTS
+        ]
+        lines = render_savings(outputs).splitlines()
+        assert len(lines) == 2 + len(EXAMPLE_PROMPTS)
+        assert lines[2].startswith("| AI History Summary | 138 words | 138 words (0%)")
+        assert lines[2].endswith("| 2 words (-99%) |")
+
+    def test_render_performance(self):
+        report = BenchReport(
+            [_result()],
+            corpora={"small": {**vars(SMALL), "digest": "abc"}},
+            environment={"python": "3.11"},
+        )
+        table = render_performance(report)
+        assert "#### small: 5 × ~400 characters" in table
+        row = "| filler | analyzer | 2.00 | 50.0 | 10.000 | 20.000 | 8.0 | 5.0% |"
+        assert row in table
+
+
+class TestCli:
+    def test_bench_is_an_ordinary_prompt(self, capsys):
+        main(["bench"])
+        assert "bench" in capsys.readouterr().out
+
+    def test_bench_entry_point(self, capsys):
+        bench_main(
+            ["--corpus", "chat", "--target", "filler", "--min-time", "0", "--in-process"]
+        )
+        out = capsys.readouterr().out
+        assert out.startswith("corpus") and "chat" in out
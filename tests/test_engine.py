@@ -1,6 +1,15 @@
 """Tests for the core TokenOptimizer engine."""
 
-from token_optimizer import TokenOptimizer, OptimizationResult
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+import token_optimizer
+
+from token_optimizer import AsyncTokenOptimizer, TokenOptimizer, OptimizationResult
+from token_optimizer.metrics.telemetry import Telemetry
 
 
 class TestTokenOptimizer:
@@ -23,6 +32,129 @@ class TestTokenOptimizer:
         assert result.strategy_used == "conservative"
         assert result.optimized_tokens <= result.original_tokens
 
+    def test_best_strategy_picks_most_compressed(self):
+        text = (
+            "I would like you to please write a function. "
+            "Could you please make sure it handles errors? "
+            "I want you to also add very good documentation."
+        )
+        best = TokenOptimizer(
+            model="gpt-4o", strategy="best", similarity_threshold=0.0
+        ).optimize(text)
+        assert best.strategy_used.startswith("best->")
+        for name in ("conservative", "moderate", "aggressive"):
+            single = TokenOptimizer(
+                model="gpt-4o", strategy=name, similarity_threshold=0.0
+            ).optimize(text)
+            assert best.optimized_tokens <= single.optimized_tokens
+
+    def test_best_strategy_falls_back_to_conservative(self, monkeypatch):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="best")
+        monkeypatch.setattr(
+            optimizer._similarity, "score_batch", lambda a, b: [0.0] * len(a)
+        )
+        result = optimizer.optimize("Please just basically write a simple function.")
+        assert result.strategy_used == "best->conservative"
+
+    def test_segment_guard_keeps_savings(self):
+        text = (
+            "Write a parser for the config files. Validate every field against "
+            "the schema. At this point in time, due to the fact that the "
+            "majority of users are on mobile, render a compact view. "
+            "Return a summary of the warnings."
+        )
+        settings = dict(
+            model="gpt-4o", strategy="aggressive", similarity_threshold=0.85
+        )
+        document = TokenOptimizer(**settings).optimize(text)
+        segment = TokenOptimizer(**settings, similarity_guard="segment").optimize(text)
+        assert document.strategy_used == "aggressive->conservative"
+        assert segment.strategy_used == "aggressive->repaired"
+        assert "At this point in time" in segment.optimized_text
+        assert segment.optimized_tokens < document.optimized_tokens
+        assert segment.similarity_score >= 0.85
+
+    LONG_PROMPT = "\n\n".join(
+        f"I would like you to please review module {i}. In order to do this, "
+        "you should basically read every function. Due to the fact that the "
+        "code is old, make sure to check the types."
+        for i in range(8)
+    )
+
+    def test_max_tokens_within_budget_counts_once(self, monkeypatch):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        calls = []
+        tokenizer = optimizer._calculator._tokenizer
+        original_count = tokenizer.count_tokens
+        monkeypatch.setattr(
+            tokenizer, "count_tokens", lambda t: calls.append(t) or original_count(t)
+        )
+        result = optimizer.optimize(self.LONG_PROMPT, max_tokens=10_000)
+        assert result.strategy_used == "budget"
+        assert result.optimized_text == self.LONG_PROMPT
+        assert calls == [self.LONG_PROMPT]
+        assert "_budget_ladder" not in vars(optimizer)
+
+    def test_max_tokens_stops_once_within_budget(self):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        original = optimizer.optimize(self.LONG_PROMPT, max_tokens=10_000)
+        budget = original.original_tokens * 9 // 10
+        result = optimizer.optimize(self.LONG_PROMPT, max_tokens=budget)
+        assert result.optimized_tokens <= budget
+        assert result.strategy_used == "budget->conservative"
+        # Less compressed than a full conservative run, which does not stop early.
+        full = TokenOptimizer(model="gpt-4o", strategy="conservative").optimize(
+            self.LONG_PROMPT
+        )
+        assert result.optimized_tokens >= full.optimized_tokens
+
+    def test_max_tokens_escalates(self):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        conservative = TokenOptimizer(model="gpt-4o", strategy="conservative")
+        floor = conservative.optimize(self.LONG_PROMPT).optimized_tokens
+        result = optimizer.optimize(self.LONG_PROMPT, max_tokens=floor - 1)
+        assert result.strategy_used in ("budget->moderate", "budget->aggressive")
+        assert result.optimized_tokens <= floor - 1
+
+    def test_max_tokens_unreachable_returns_most_aggressive(self):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        result = optimizer.optimize(self.LONG_PROMPT, max_tokens=1)
+        assert result.strategy_used == "budget->aggressive"
+        assert result.optimized_tokens > 1
+
+    def test_budget_pruning_drops_sentences_to_fit(self):
+        plain = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        budget = plain.optimize(self.LONG_PROMPT, max_tokens=1).optimized_tokens // 2
+        optimizer = TokenOptimizer(
+            model="gpt-4o", budget_pruning=True, cache_enabled=False
+        )
+        result = optimizer.optimize(
+            self.LONG_PROMPT, preserve_keywords=["module 3"], max_tokens=budget
+        )
+        assert result.strategy_used == "budget->pruned"
+        assert result.optimized_tokens <= budget
+        assert "module 3" in result.optimized_text
+
+    def test_budget_pruning_is_off_by_default(self):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        aggressive = optimizer.optimize(self.LONG_PROMPT, max_tokens=1)
+        result = optimizer.optimize(
+            self.LONG_PROMPT, max_tokens=aggressive.optimized_tokens // 2
+        )
+        assert result.optimized_text == aggressive.optimized_text
+
+    def test_max_tokens_is_part_of_cache_key(self):
+        optimizer = TokenOptimizer(model="gpt-4o")
+        loose = optimizer.optimize(self.LONG_PROMPT, max_tokens=10_000)
+        tight = optimizer.optimize(self.LONG_PROMPT, max_tokens=50)
+        assert not tight.from_cache
+        assert tight.optimized_text != loose.optimized_text
+        assert optimizer.optimize(self.LONG_PROMPT, max_tokens=50).from_cache
+
+    def test_max_tokens_must_be_non_negative(self):
+        with pytest.raises(ValueError):
+            TokenOptimizer(model="gpt-4o").optimize("Hi", max_tokens=-1)
+
     def test_aggressive_strategy(self):
         optimizer = TokenOptimizer(model="gpt-4o", strategy="aggressive")
         text = (
@@ -61,6 +193,154 @@ class TestTokenOptimizer:
         assert result2.from_cache
         assert result2.optimized_text == result1.optimized_text
 
+    def test_cache_hit_returns_stored_metrics(self, monkeypatch):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        text = "I would like you to write a function please."
+        first = optimizer.optimize(text)
+
+        calls = []
+        tokenizer = optimizer._calculator._tokenizer
+        original_count = tokenizer.count_tokens
+        monkeypatch.setattr(
+            tokenizer, "count_tokens", lambda t: calls.append(t) or original_count(t)
+        )
+
+        second = optimizer.optimize(text)
+        assert second.from_cache
+        assert calls == []
+        assert second.similarity_score == first.similarity_score
+        assert second.strategy_used == first.strategy_used
+        assert second.optimized_tokens == first.optimized_tokens
+
+    def test_persistent_cache_dir(self, tmp_path):
+        text = "I would like you to write a function please."
+        first = TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path)).optimize(text)
+        second = TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path)).optimize(text)
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.optimized_text == first.optimized_text
+
+    def test_cache_hit_does_not_build_tokenizer(self, tmp_path):
+        text = "I would like you to write a function please."
+        TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path)).optimize(text)
+        optimizer = TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path))
+        assert optimizer.optimize(text).from_cache
+        assert "_tokenizer" not in vars(optimizer)
+
+    def test_profile_is_off_by_default(self):
+        result = TokenOptimizer(model="gpt-4o").optimize("Please write a function.")
+        assert result.profile is None
+
+    def test_profile_records_phases_and_stages(self):
+        optimizer = TokenOptimizer(model="gpt-4o", profile=True)
+        text = "I would like you to please basically write a function."
+        result = optimizer.optimize(text)
+        profile = result.profile
+        assert [e.name for e in profile.phases] == [
+            "cache.lookup", "strategy", "similarity", "counting", "cache.store"
+        ]
+        strategy = profile.phases[1]
+        assert strategy.input_chars == len(text)
+        assert strategy.output_chars == len(result.optimized_text)
+        assert strategy.tokens_removed == result.tokens_saved
+        stage_keys = [stage.key for stage in optimizer._strategy.stages([])]
+        assert [e.name for e in profile.stages] == stage_keys
+        assert sum(e.tokens_removed for e in profile.stages) == result.tokens_saved
+        assert profile.phases[2].input_chars is None
+        assert "  filler.scan:words" in profile.format()
+
+    def test_profile_is_not_cached(self, tmp_path):
+        text = "I would like you to please basically write a function."
+        TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path), profile=True).optimize(
+            text
+        )
+        optimizer = TokenOptimizer(
+            model="gpt-4o", cache_dir=str(tmp_path), profile=True
+        )
+        cached = optimizer.optimize(text)
+        assert cached.from_cache
+        assert [e.name for e in cached.profile.entries] == ["cache.lookup"]
+        assert "_tokenizer" not in vars(optimizer)
+
+    def test_profile_records_fallback(self, monkeypatch):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False, profile=True)
+        monkeypatch.setattr(
+            optimizer._similarity, "score_batch", lambda a, b: [0.0] * len(a)
+        )
+        result = optimizer.optimize("Please just basically write a simple function.")
+        assert result.strategy_used == "moderate->conservative"
+        assert [e.name for e in result.profile.phases] == [
+            "strategy", "similarity", "fallback", "similarity", "counting"
+        ]
+
+    def test_profile_records_budget_levels(self):
+        optimizer = TokenOptimizer(model="gpt-4o", cache_enabled=False, profile=True)
+        result = optimizer.optimize(self.LONG_PROMPT, max_tokens=1)
+        names = [e.name for e in result.profile.phases]
+        assert names[:4] == [
+            "counting", "budget.conservative", "budget.moderate", "budget.aggressive"
+        ]
+        removed = sum(
+            e.tokens_removed for e in result.profile.phases if e.name.startswith("budget.")
+        )
+        assert removed == result.tokens_saved
+
+    def test_telemetry_is_off_by_default(self):
+        assert TokenOptimizer(model="gpt-4o")._telemetry is None
+
+    def test_telemetry_records_optimize_calls(self):
+        optimizer = TokenOptimizer(model="gpt-4o", telemetry=True)
+        optimizer._telemetry = telemetry = Telemetry()
+        text = "I would like you to please basically write a function."
+        first = optimizer.optimize(text)
+        optimizer.optimize(text)
+        counters = telemetry.counters()
+        labels = ("gpt-4o",)
+        assert counters["prompts", labels] == 2
+        assert counters["cache_hits", labels] == 1
+        assert counters["cache_misses", labels] == 1
+        assert counters["tokens_saved", labels] == 2 * first.tokens_saved
+        assert counters["cost_saved_dollars", labels] == pytest.approx(
+            2 * first.estimated_cost_savings
+        )
+        assert sum(telemetry.histograms()["optimize_seconds", labels][:-1]) == 2
+
+    def test_telemetry_counts_fallbacks_and_batches(self, monkeypatch):
+        optimizer = TokenOptimizer(
+            model="gpt-4o", cache_enabled=False, telemetry=True
+        )
+        optimizer._telemetry = telemetry = Telemetry()
+        monkeypatch.setattr(
+            optimizer._similarity, "score_batch", lambda a, b: [0.0] * len(a)
+        )
+        prompts = ["Please just basically write a function.", "Kindly sort the list."]
+        optimizer.optimize_batch([*prompts, prompts[0]], workers=1)
+        counters = telemetry.counters()
+        assert counters["prompts", ("gpt-4o",)] == 3
+        assert counters["fallbacks", ("gpt-4o", "conservative")] == 2
+        assert ("cache_hits", ("gpt-4o",)) not in counters
+        assert sum(telemetry.histograms()["batch_seconds", ("gpt-4o",)][:-1]) == 1
+
+    def test_telemetry_counts_fallbacks_in_batch_workers(self, monkeypatch):
+        optimizer = TokenOptimizer(
+            model="gpt-4o",
+            cache_enabled=False,
+            similarity_threshold=1.01,
+            telemetry=True,
+        )
+        optimizer._telemetry = telemetry = Telemetry()
+        prompts = [f"Please just basically write function {i}." for i in range(4)]
+        results = optimizer.optimize_batch(prompts, workers=2, chunksize=2)
+        assert all(r.strategy_used == "moderate->conservative" for r in results)
+        assert telemetry.counters()["fallbacks", ("gpt-4o", "conservative")] == 4
+
+    def test_telemetry_ignores_best_of_picking_conservative(self):
+        optimizer = TokenOptimizer(strategy="best", telemetry=True)
+        optimizer._telemetry = telemetry = Telemetry()
+        result = optimizer.optimize("Validate the input.")
+        assert result.strategy_used == "best->conservative"
+        assert not any(name == "fallbacks" for name, _ in telemetry.counters())
+
     def test_cache_disabled(self):
         optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate", cache_enabled=False)
         text = "Please write a function."
@@ -69,6 +349,84 @@ class TestTokenOptimizer:
         result2 = optimizer.optimize(text)
         assert not result1.from_cache
         assert not result2.from_cache
+        assert optimizer.cache_stats() is None
+
+    def test_cache_key_includes_keywords(self):
+        optimizer = TokenOptimizer(model="gpt-4o")
+        text = "Please basically write a simple function."
+        plain = optimizer.optimize(text)
+        kept = optimizer.optimize(text, preserve_keywords=["basically"])
+        assert not kept.from_cache
+        assert "basically" in kept.optimized_text
+        assert "basically" not in plain.optimized_text
+        again = optimizer.optimize(text, preserve_keywords=["basically"])
+        assert again.from_cache
+
+    def test_cache_key_includes_pricing(self, tmp_path):
+        text = "I would like you to write a function please."
+        TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path)).optimize(text)
+        repriced = TokenOptimizer(
+            model="gpt-4o", cache_dir=str(tmp_path), cost_per_1k_input=1.0
+        ).optimize(text)
+        assert not repriced.from_cache
+
+    def test_hashing_similarity_backend(self, tmp_path):
+        text = "I would like you to write a function please."
+        TokenOptimizer(model="gpt-4o", cache_dir=str(tmp_path)).optimize(text)
+        result = TokenOptimizer(
+            model="gpt-4o", cache_dir=str(tmp_path), similarity_backend="hashing"
+        ).optimize(text)
+        assert not result.from_cache
+        assert 0.0 <= result.similarity_score <= 1.0
+
+    def test_fingerprint_computed_once_per_call(self, monkeypatch):
+        from token_optimizer.cache.keys import Fingerprint
+
+        calls = []
+        original = Fingerprint.of.__func__
+        monkeypatch.setattr(
+            Fingerprint,
+            "of",
+            classmethod(lambda cls, text: calls.append(text) or original(cls, text)),
+        )
+        optimizer = TokenOptimizer(model="gpt-4o")
+        optimizer.optimize("Please write a function.")
+        optimizer.optimize("Please write a function.")
+        assert len(calls) == 2
+
+    def test_no_token_memo_for_estimates(self):
+        optimizer = TokenOptimizer(model="claude-sonnet-4-5-20250929")
+        assert optimizer._calculator.memo is None
+        assert optimizer.token_memo_stats() is None
+
+    def test_pricing_override_does_not_leak(self):
+        from token_optimizer.providers.registry import ProviderRegistry
+
+        default = ProviderRegistry().lookup("gpt-4o").cost_per_1k_input
+        TokenOptimizer(model="gpt-4o", cost_per_1k_input=default + 1)
+        assert ProviderRegistry().lookup("gpt-4o").cost_per_1k_input == default
+        assert TokenOptimizer(model="gpt-4o")._model_info.cost_per_1k_input == default
+
+    def test_cache_stats(self):
+        optimizer = TokenOptimizer(model="gpt-4o")
+        optimizer.optimize("Please write a function.")
+        optimizer.optimize("Please write a function.")
+        stats = optimizer.cache_stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_shared_across_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        optimizer = TokenOptimizer(model="gpt-4o", cache_maxsize=8)
+        prompts = [f"Please write function number {i % 20}." for i in range(200)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(optimizer.optimize, prompts))
+        expected = TokenOptimizer(model="gpt-4o", cache_enabled=False)
+        for prompt, result in zip(prompts, results):
+            assert result.optimized_text == expected.optimize(prompt).optimized_text
+        stats = optimizer.cache_stats()
+        assert stats.hits + stats.misses == 200
+        assert stats.entries <= 8
 
     def test_empty_prompt(self):
         optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
@@ -106,3 +464,169 @@ class TestTokenOptimizer:
         optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
         result = optimizer.optimize("I would like you to please help me write code.")
         assert result.tokens_saved == result.original_tokens - result.optimized_tokens
+
+    def test_lsh_redundancy_mode(self):
+        optimizer = TokenOptimizer(
+            model="gpt-4o",
+            strategy="conservative",
+            redundancy_mode="lsh",
+            cross_paragraph_dedup=True,
+        )
+        result = optimizer.optimize("Validate the input.\n\nValidate the input.")
+        assert result.optimized_text.count("Validate") == 1
+
+    def test_optimize_batch_preserves_order_and_dedupes(self):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        prompts = [
+            "Please write a function.",
+            "I would like you to write a test.",
+            "Please write a function.",
+        ]
+        results = optimizer.optimize_batch(prompts, workers=2, chunksize=1)
+        assert [r.original_text for r in results] == prompts
+        assert results[0] is results[2]
+        assert results[1].optimized_text == optimizer.optimize(prompts[1]).optimized_text
+
+    def test_optimize_batch_in_process(self):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        results = optimizer.optimize_batch(["Please write code."] * 2, workers=1)
+        assert len(results) == 2
+        assert optimizer.optimize_batch(["Please write code."])[0].from_cache
+
+    def test_optimize_batch_invalid_workers(self):
+        optimizer = TokenOptimizer(model="gpt-4o")
+        with pytest.raises(ValueError):
+            optimizer.optimize_batch(["a"], workers=0)
+
+
+class TestOptimizeStream:
+    def test_stream_matches_small_document(self):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        text = "I would like you to write a function. Please add tests."
+        stream = optimizer.optimize_stream([text[:10], text[10:]])
+        assert "".join(stream) == optimizer.optimize(text).optimized_text
+        assert stream.windows == 1
+        assert stream.optimized_tokens <= stream.original_tokens
+
+    def test_stream_emits_multiple_windows(self):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        paragraphs = [
+            f"Paragraph {i} explains step number {i} in detail." for i in range(40)
+        ]
+        chunks = (p + "\n\n" for p in paragraphs)
+        stream = optimizer.optimize_stream(chunks, window_chars=200)
+        pieces = list(stream)
+        assert len(pieces) > 1
+        output = "".join(pieces)
+        assert all(f"step number {i} " in output for i in range(40))
+
+    def test_stream_drops_sentences_repeated_across_windows(self):
+        optimizer = TokenOptimizer(
+            model="gpt-4o", strategy="conservative", cross_paragraph_dedup=True
+        )
+        repeated = "Always validate the user input before saving.\n\n"
+        similar = "Always validate all user input before saving.\n\n"
+        filler = "".join(f"Unique note number {i} goes here.\n\n" for i in range(10))
+        stream = optimizer.optimize_stream(
+            [repeated, filler, similar], window_chars=120
+        )
+        output = "".join(stream)
+        assert output.count("validate") == 1
+        assert output == optimizer.optimize(repeated + filler + similar).optimized_text
+
+    def test_stream_keeps_repeats_the_strategy_keeps(self):
+        line = "You MUST validate every request before it is stored.\n"
+        filler = "".join(f"Unique note number {i} goes here.\n" for i in range(10))
+        text = line + filler + line + filler + line
+        for dedup, keywords in ((False, None), (True, ["must"])):
+            optimizer = TokenOptimizer(
+                model="gpt-4o",
+                strategy="conservative",
+                cross_paragraph_dedup=dedup,
+                cache_enabled=False,
+            )
+            stream = optimizer.optimize_stream(
+                [text], preserve_keywords=keywords, window_chars=120
+            )
+            assert "".join(stream).count("MUST") == 3
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="conservative")
+        assert optimizer.optimize(text).optimized_text.count("MUST") == 3
+
+    def test_empty_stream(self):
+        optimizer = TokenOptimizer(model="gpt-4o")
+        stream = optimizer.optimize_stream([])
+        assert list(stream) == []
+        assert stream.savings_percent == 0.0
+
+
+class TestAsyncTokenOptimizer:
+    def test_optimize_async(self):
+        optimizer = TokenOptimizer(model="gpt-4o", strategy="moderate")
+        text = "I would like you to write code."
+        result = asyncio.run(optimizer.optimize_async(text))
+        assert result.optimized_text == optimizer.optimize(text).optimized_text
+
+    def test_concurrent_requests_with_small_queue(self):
+        prompts = [f"Please write function number {i}." for i in range(40)]
+
+        async def run():
+            async with AsyncTokenOptimizer(
+                model="gpt-4o", max_queue_size=2, max_batch_size=8
+            ) as optimizer:
+                return await asyncio.gather(*(optimizer.optimize(p) for p in prompts))
+
+        results = asyncio.run(run())
+        assert [r.original_text for r in results] == prompts
+        assert all("function" in r.optimized_text for r in results)
+
+    def test_errors_reach_caller(self):
+        async def run():
+            async with AsyncTokenOptimizer(model="gpt-4o") as optimizer:
+                return await optimizer.optimize(None)  # type: ignore[arg-type]
+
+        with pytest.raises(Exception):
+            asyncio.run(run())
+
+    def test_closed_optimizer_rejects_requests(self):
+        async def run():
+            optimizer = AsyncTokenOptimizer(model="gpt-4o")
+            await optimizer.aclose()
+            await optimizer.optimize("Write code.")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+
+def _modules_after(statement: str) -> set[str]:
+    """Modules loaded by ``statement`` in a fresh interpreter."""
+    code = f"{statement}; import sys; print(' '.join(sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(out.split())
+
+
+class TestLazyImport:
+    def test_package_import_loads_no_submodules(self):
+        loaded = _modules_after("import token_optimizer")
+        assert not {"token_optimizer.engine", "asyncio", "sqlite3"} & loaded
+
+    def test_engine_import_skips_optional_machinery(self):
+        loaded = _modules_after("import token_optimizer.engine")
+        heavy = {
+            "asyncio",
+            "concurrent.futures",
+            "sqlite3",
+            "tiktoken",
+            "token_optimizer.cache.disk_cache",
+            "token_optimizer.streaming",
+        }
+        assert not heavy & loaded
+
+    def test_exports_resolve_on_access(self):
+        from token_optimizer.engine import TokenOptimizer as engine_optimizer
+
+        assert token_optimizer.TokenOptimizer is engine_optimizer
+        assert set(token_optimizer.__all__) <= set(dir(token_optimizer))
+        with pytest.raises(AttributeError):
+            token_optimizer.NotAnExport
@@ -1,10 +1,43 @@
 """Tests for metrics modules."""
 
-from token_optimizer.metrics.calculator import TokenCalculator
-from token_optimizer.metrics.similarity import SimilarityScorer
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+from token_optimizer.metrics.calculator import IncrementalCounter, TokenCalculator
+from token_optimizer.metrics.hashing import HashingBackend
+from token_optimizer.metrics.profiling import Profiler
+from token_optimizer.metrics.segments import (
+    SegmentGuard,
+    align_segments,
+    split_segments,
+)
+from token_optimizer.metrics.similarity import EmbeddingBackend, SimilarityScorer
+from token_optimizer.metrics.telemetry import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    Telemetry,
+    serve_metrics,
+)
+from token_optimizer.metrics.token_memo import TokenCountMemo, shared_token_memo
+from token_optimizer.tokenizers.anthropic_tokenizer import AnthropicTokenizer
+from token_optimizer.tokenizers.base import BaseTokenizer
+from token_optimizer.tokenizers.gemini_tokenizer import GeminiTokenizer
+from token_optimizer.tokenizers.openai_tokenizer import (
+    OpenAITokenizer,
+    split_at_safe_boundaries,
+)
 from token_optimizer.tokenizers.generic import GenericTokenizer
 from token_optimizer.providers.registry import ModelInfo, ProviderRegistry
+from token_optimizer.cache.keys import Fingerprint, config_fingerprint
 from token_optimizer.cache.prompt_cache import PromptCache
+from token_optimizer.cache.sketch import FrequencySketch
+from token_optimizer.cache.disk_cache import DiskCache
+from token_optimizer.config import OptimizationResult
 
 
 # ── Token Calculator ─────────────────────────────────────────────────────
@@ -48,9 +81,303 @@ class TestTokenCalculator:
         assert savings == 0.0
 
 
+class _CountingTokenizer(BaseTokenizer):
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "counting"
+
+    def count_tokens(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+class TestCountTokensBatch:
+    TEXTS = ["", "hello", "hello world foo", "a " * 37, "x" * 1001, "  spaced  out  "]
+
+    @pytest.mark.parametrize(
+        "tokenizer",
+        [GenericTokenizer(), AnthropicTokenizer(), GeminiTokenizer()],
+        ids=lambda t: t.name,
+    )
+    def test_matches_single_counts(self, tokenizer):
+        expected = [tokenizer.count_tokens(text) for text in self.TEXTS]
+        assert tokenizer.count_tokens_batch(self.TEXTS) == expected
+
+    def test_default_batch_uses_count_tokens(self):
+        tokenizer = _CountingTokenizer()
+        assert tokenizer.count_tokens_batch(["a b", "c"]) == [2, 1]
+        assert tokenizer.calls == 2
+
+    def test_openai_batch_matches_single_counts(self):
+        pytest.importorskip("tiktoken")
+        tokenizer = OpenAITokenizer("gpt-4o", num_threads=4)
+        texts = [f"Sentence number {i} about tokens." * (i % 7) for i in range(100)]
+        expected = [tokenizer.count_tokens(text) for text in texts]
+        assert tokenizer.count_tokens_batch(texts) == expected
+
+    def test_openai_parallel_count_matches_serial(self):
+        pytest.importorskip("tiktoken")
+        serial = OpenAITokenizer("gpt-4o", parallel_min_chars=None)
+        parallel = OpenAITokenizer("gpt-4o", num_threads=4, parallel_min_chars=1)
+        text = (
+            "First line of text.\n  indented line\n\n12345 numbers, "
+            "don't split contractions!\r\nÜnïcödé wörds and   spaces.\n"
+        ) * 500
+        assert parallel.count_tokens(text) == serial.count_tokens(text)
+
+    def test_calculator_batch_uses_memo(self):
+        tokenizer = _CountingTokenizer()
+        memo = TokenCountMemo()
+        calc = TokenCalculator(tokenizer, ModelInfo("test", "generic", 0, 0), memo)
+        calc.count_tokens("one two")
+        assert calc.count_tokens_batch(["one two", "", "three"]) == [2, 0, 1]
+        assert tokenizer.calls == 2
+        assert calc.count_tokens_batch(["three"]) == [1]
+        assert tokenizer.calls == 2
+
+
+class TestIncrementalCounter:
+    def _counter(self):
+        tokenizer = _CountingTokenizer()
+        calc = TokenCalculator(tokenizer, ModelInfo("test", "generic", 0, 0))
+        return IncrementalCounter(calc), tokenizer
+
+    def test_sums_line_and_sentence_chunks(self):
+        counter, _ = self._counter()
+        text = "First sentence here. Second one.\nA new line\n\n  indented"
+        assert counter.count(text) == len(text.split())
+
+    def test_recounts_only_changed_chunks(self):
+        counter, _ = self._counter()
+        before = "Keep this sentence. Rewrite this long sentence.\nKeep this line."
+        after = "Keep this sentence. Rewrite it.\nKeep this line."
+        counter.count(before)
+        counted = counter.counted_chars
+        assert counter.count(after) == len(after.split())
+        assert counter.counted_chars - counted == len(" Rewrite it.\n")
+
+    def test_repeated_chunks_counted_once(self):
+        counter, tokenizer = self._counter()
+        assert counter.count("Same line.\nSame line.\nSame line.") == 6
+        assert tokenizer.calls == 2  # "Same line.\n" and the last "Same line."
+
+
+class TestSafeBoundaries:
+    @staticmethod
+    def _split(text, chunk_chars):
+        return split_at_safe_boundaries(text, chunk_chars)
+
+    def test_cuts_after_newline_before_text(self):
+        text = "alpha beta\ngamma delta\n  epsilon\nzeta"
+        cuts = self._split(text, 12)
+        assert cuts
+        for cut in cuts:
+            assert text[cut - 1] == "\n" and not text[cut].isspace()
+
+    def test_falls_back_to_space_before_word(self):
+        text = "word " * 100
+        cuts = self._split(text, 50)
+        assert len(cuts) >= 8
+        for cut in cuts:
+            assert text[cut] == " " and text[cut + 1].isalpha()
+            assert not text[cut - 1].isspace()
+
+    def test_chunks_respect_size_when_possible(self):
+        text = "line of text\n" * 1000
+        cuts = self._split(text, 500)
+        bounds = [0, *cuts, len(text)]
+        assert all(0 < b - a <= 500 for a, b in zip(bounds, bounds[1:]))
+
+    def test_no_safe_boundary_keeps_text_whole(self):
+        assert self._split("x" * 1000, 10) == []
+        assert self._split("1 2 3 4 5 6 7 8 9 " * 10, 10) == []
+
+    def test_takes_next_safe_cut_beyond_window(self):
+        text = "x" * 100 + " word" + "y" * 10
+        assert self._split(text, 20) == [100]
+
+
+class TestTokenCountMemo:
+    def _model_info(self):
+        return ModelInfo("test", "generic", 0.01, 0.03)
+
+    def test_memo_skips_repeat_counts(self):
+        tokenizer = _CountingTokenizer()
+        memo = TokenCountMemo(maxsize=10)
+        calc = TokenCalculator(tokenizer, self._model_info(), memo)
+        assert calc.count_tokens("one two three") == 3
+        assert calc.count_tokens("one two three") == 3
+        assert tokenizer.calls == 1
+        stats = memo.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_memo_is_bounded(self):
+        memo = TokenCountMemo(maxsize=2)
+        for i in range(5):
+            memo.put(bytes([i]), i)
+        assert memo.stats().entries == 2
+        assert memo.get(bytes([0])) is None
+        assert memo.get(bytes([4])) == 4
+
+    def test_shared_memo_per_tokenizer_identity(self):
+        first = shared_token_memo("test:shared")
+        assert shared_token_memo("test:shared") is first
+        assert shared_token_memo("test:other") is not first
+
+        tokenizer = _CountingTokenizer()
+        TokenCalculator(tokenizer, self._model_info(), first).count_tokens("a b")
+        TokenCalculator(tokenizer, self._model_info(), first).count_tokens("a b")
+        assert tokenizer.calls == 1
+
+    def test_heuristic_tokenizers_are_estimates(self):
+        assert GenericTokenizer().is_estimate
+        assert not _CountingTokenizer().is_estimate
+        assert _CountingTokenizer().identity == "counting"
+
+
 # ── Similarity Scorer ────────────────────────────────────────────────────
 
 
+class TestProfiler:
+    def test_finish_measures_recorded_texts(self):
+        profiler = Profiler()
+        start = time.perf_counter()
+        profiler.record("stage", "trim", start, ("a b c",), ("a b",))
+        profiler.record("phase", "similarity", start)
+        profiler.record("phase", "strategy", start, ["a b c", "d e"], ["a b", "d"])
+        counted = []
+
+        def count(texts):
+            counted.append(list(texts))
+            return [len(text.split()) for text in texts]
+
+        profile = profiler.finish(count)
+        assert counted == [["a b c", "a b", "d e", "d"]]
+        trim, similarity, strategy = profile.entries
+        assert (trim.input_chars, trim.output_chars, trim.tokens_removed) == (5, 3, 1)
+        assert similarity.input_chars is None and similarity.tokens_removed is None
+        assert strategy.tokens_removed == 2
+        assert profile.stages == [trim]
+        assert profile.total_seconds == similarity.seconds + strategy.seconds
+
+    def test_finish_without_texts_does_not_count(self):
+        profiler = Profiler()
+        profiler.record("phase", "cache.lookup", time.perf_counter())
+        profile = profiler.finish(lambda texts: pytest.fail("counted"))
+        assert [e.name for e in profile.phases] == ["cache.lookup"]
+
+    def test_format_lists_stages_under_their_phase(self):
+        profiler = Profiler()
+        start = time.perf_counter()
+        profiler.record("stage", "trim", start, ("a b",), ("a",))
+        profiler.record("phase", "strategy", start, ("a b",), ("a",))
+        lines = profiler.finish(lambda texts: [1] * len(texts)).format().splitlines()
+        assert lines[1].startswith("strategy")
+        assert lines[2].startswith("  trim")
+        assert lines[-1].startswith("total")
+
+
+class TestTelemetry:
+    def test_counters_sum_increments(self):
+        telemetry = Telemetry()
+        telemetry.inc("prompts", ("gpt-4o",))
+        telemetry.inc("prompts", ("gpt-4o",), 2)
+        telemetry.inc("prompts", ("claude",))
+        counters = telemetry.counters()
+        assert counters["prompts", ("gpt-4o",)] == 3
+        assert counters["prompts", ("claude",)] == 1
+
+    def test_histogram_buckets(self):
+        telemetry = Telemetry(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            telemetry.observe("optimize_seconds", ("m",), value)
+        assert telemetry.histograms()["optimize_seconds", ("m",)] == [
+            2, 1, 1, pytest.approx(3.65)
+        ]
+
+    def test_rejects_unsorted_buckets(self):
+        with pytest.raises(ValueError):
+            Telemetry(buckets=(1.0, 0.1))
+
+    def test_sums_across_threads_including_exited_ones(self):
+        telemetry = Telemetry()
+
+        def record():
+            for _ in range(1000):
+                telemetry.inc("prompts", ("m",))
+                telemetry.observe("optimize_seconds", ("m",), 0.001)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert telemetry.counters()["prompts", ("m",)] == 8000
+        assert sum(telemetry.histograms()["optimize_seconds", ("m",)][:-1]) == 8000
+        # Exited threads' shards were folded together.
+        assert telemetry._shards == []
+
+    def test_reset(self):
+        telemetry = Telemetry()
+        telemetry.inc("prompts", ("m",))
+        telemetry.reset()
+        assert telemetry.counters() == {}
+
+    def test_prometheus_exposition(self):
+        telemetry = Telemetry(buckets=(0.1, 1.0))
+        telemetry.inc("fallbacks", ("gpt-4o", "conservative"))
+        telemetry.inc("cost_saved_dollars", ('a"b',), 0.25)
+        telemetry.observe("optimize_seconds", ("gpt-4o",), 0.5)
+        lines = telemetry.exposition().splitlines()
+        assert "# TYPE token_optimizer_fallbacks_total counter" in lines
+        assert (
+            'token_optimizer_fallbacks_total{model="gpt-4o",kind="conservative"} 1'
+            in lines
+        )
+        assert 'token_optimizer_cost_saved_dollars_total{model="a\\"b"} 0.25' in lines
+        assert "# TYPE token_optimizer_optimize_seconds histogram" in lines
+        buckets = [line for line in lines if "optimize_seconds_bucket" in line]
+        assert buckets == [
+            'token_optimizer_optimize_seconds_bucket{model="gpt-4o",le="0.1"} 0',
+            'token_optimizer_optimize_seconds_bucket{model="gpt-4o",le="1"} 1',
+            'token_optimizer_optimize_seconds_bucket{model="gpt-4o",le="+Inf"} 1',
+        ]
+        assert 'token_optimizer_optimize_seconds_count{model="gpt-4o"} 1' in lines
+        assert lines[-1] != "# EOF"
+
+    def test_openmetrics_exposition(self):
+        telemetry = Telemetry()
+        telemetry.inc("prompts", ("m",))
+        lines = telemetry.exposition(openmetrics=True).splitlines()
+        assert "# TYPE token_optimizer_prompts counter" in lines
+        assert 'token_optimizer_prompts_total{model="m"} 1' in lines
+        assert lines[-1] == "# EOF"
+
+    def test_serve_metrics(self):
+        from urllib.request import Request, urlopen
+
+        telemetry = Telemetry()
+        telemetry.inc("prompts", ("m",))
+        server = serve_metrics(port=0, telemetry=telemetry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+                assert 'token_optimizer_prompts_total{model="m"} 1' in (
+                    response.read().decode()
+                )
+            request = Request(url, headers={"Accept": "application/openmetrics-text"})
+            with urlopen(request, timeout=5) as response:
+                assert response.headers["Content-Type"] == OPENMETRICS_CONTENT_TYPE
+                assert response.read().decode().endswith("# EOF\n")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
 class TestSimilarityScorer:
     def test_identical_texts(self):
         scorer = SimilarityScorer()
@@ -80,10 +407,177 @@ class TestSimilarityScorer:
         )
         assert score < 0.5
 
+    def test_score_batch_matches_score(self):
+        scorer = SimilarityScorer()
+        originals = ["", "hello", "same text", "Write a Python function", "the a"]
+        optimizeds = ["", "", "same text", "Write function", "is"]
+        assert scorer.score_batch(originals, optimizeds) == [
+            scorer.score(a, b) for a, b in zip(originals, optimizeds)
+        ]
+
+    def test_score_batch_length_mismatch(self):
+        with pytest.raises(ValueError):
+            SimilarityScorer().score_batch(["a"], [])
+
+    def test_vectorized_score_batch_matches_score(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(5)
+        vocabulary = [f"word{i}" for i in range(300)] + ["the", "please", "x"]
+        originals = [
+            " ".join(rng.choices(vocabulary, k=rng.randint(0, 40)))
+            for _ in range(600)
+        ]
+        optimizeds = [
+            " ".join(w for w in text.split() if rng.random() < 0.7)
+            for text in originals
+        ]
+        originals[:2] = ["The a an", "Python"]
+        optimizeds[:2] = ["is are", "the"]
+        scorer = SimilarityScorer()
+        expected = [scorer.score(a, b) for a, b in zip(originals, optimizeds)]
+        assert scorer.score_batch(originals, optimizeds) == expected
+        # Texts containing the batch separator take the per-pair path.
+        originals[2] += "\x00 word1"
+        expected[2] = scorer.score(originals[2], optimizeds[2])
+        assert scorer.score_batch(originals, optimizeds) == expected
+
+    def test_embedding_batch_encodes_once(self):
+        np = pytest.importorskip("numpy")
+
+        class FakeModel:
+            calls = 0
+
+            def encode(self, texts):
+                FakeModel.calls += 1
+                return np.array([[len(t), 1.0] for t in texts])
+
+        scorer = SimilarityScorer(backend=EmbeddingBackend(model=FakeModel()))
+        scores = scorer.score_batch(["aa", "bbbb", "c"], ["a", "bbbb", "cc"])
+        assert FakeModel.calls == 1
+        assert scores[1] == 1.0
+        assert scores[0] == pytest.approx((2 * 1 + 1) / (5**0.5 * 2**0.5))
+
+    def test_backend_by_name(self):
+        assert SimilarityScorer().backend.name == "keyword"
+        assert SimilarityScorer(backend="hashing").backend.name == "hashing"
+        with pytest.raises(ValueError):
+            SimilarityScorer(backend="bogus")  # type: ignore[arg-type]
+
+    def test_missing_embeddings_warn_on_fallback(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+        with pytest.warns(RuntimeWarning, match="keyword"):
+            scorer = SimilarityScorer(use_embeddings=True)
+        assert scorer.backend.name == "keyword"
+        with pytest.raises(ImportError):
+            SimilarityScorer(backend="embedding")
+
+
+class TestHashingBackend:
+    def test_inflections_overlap(self):
+        hashing = SimilarityScorer(backend="hashing")
+        keyword = SimilarityScorer()
+        original = "Refactor the parsing functions and add failing tests"
+        optimized = "Refactor parser function, add failing test"
+        assert hashing.score(original, optimized) > keyword.score(original, optimized)
+        assert hashing.score(original, optimized) > 0.5
+
+    def test_unrelated_texts_score_low(self):
+        scorer = SimilarityScorer(backend="hashing")
+        assert scorer.score(
+            "Write a Python function", "Deploy Kubernetes cluster on AWS"
+        ) < 0.2
+
+    def test_scores_in_range_and_symmetric(self):
+        backend = HashingBackend()
+        a, b = "sum the numbers in a list", "add up list numbers"
+        assert 0.0 <= backend.score(a, b) <= 1.0
+        assert backend.score(a, b) == pytest.approx(backend.score(b, a))
+        assert backend.score("please", "the") == 1.0  # no keywords on either side
+        assert backend.score("python", "the") == 0.0
+
+    def test_fit_downweights_shared_boilerplate(self):
+        boilerplate = "You are a careful assistant answering support tickets. "
+        documents = [boilerplate + f"Ticket about topic{i} failure" for i in range(50)]
+        original = boilerplate + "Ticket about billing failure"
+        optimized = boilerplate + "Ticket about login"
+        unfitted = HashingBackend().score(original, optimized)
+        fitted = HashingBackend().fit(documents).score(original, optimized)
+        assert fitted < unfitted
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            HashingBackend(n_features=0)
+        with pytest.raises(ValueError):
+            HashingBackend(char_ngrams=(4, 2))
+
+    def test_vectorized_batch_matches_per_pair(self):
+        pytest.importorskip("numpy")
+        rng = random.Random(9)
+        vocabulary = [f"term{i}" for i in range(200)] + ["the", "please", "x"]
+        originals = [
+            " ".join(rng.choices(vocabulary, k=rng.randint(0, 30)))
+            for _ in range(400)
+        ]
+        optimizeds = [
+            " ".join(w for w in text.split() if rng.random() < 0.7)
+            for text in originals
+        ]
+        backend = HashingBackend(n_features=1 << 12).fit(originals[:100])
+        expected = [backend.score(a, b) for a, b in zip(originals, optimizeds)]
+        assert backend.score_batch(originals, optimizeds) == pytest.approx(expected)
+
 
 # ── Provider Registry ────────────────────────────────────────────────────
 
 
+class TestSegmentGuard:
+    ORIGINAL = (
+        "Write a parser for JSON files. It must handle nested arrays and objects.\n"
+        "Validate the schema carefully. Write a parser for JSON files."
+    )
+
+    def test_split_segments_keeps_spans(self):
+        text = "First one. Second one!\n  Third line"
+        segments = split_segments(text)
+        assert [s.text for s in segments] == ["First one.", "Second one!", "Third line"]
+        assert all(text[s.start : s.end] == s.text for s in segments)
+        lines = split_segments(text, lines=True)
+        assert [s.text for s in lines] == ["First one. Second one!", "Third line"]
+
+    def test_align_skips_deleted_segments(self):
+        original = split_segments("Parse the input. Log every error. Print results.")
+        optimized = split_segments("Parse input. Print results.")
+        assert align_segments(original, optimized) == [(0, 0), (2, 1)]
+
+    def test_reverts_only_low_similarity_segments(self):
+        guard = SegmentGuard(SimilarityScorer(), threshold=0.6)
+        optimized = "Write parser for JSON files. It must handle.\nValidate schema."
+        repaired, reverted = guard.repair(self.ORIGINAL, optimized)
+        assert reverted == 1
+        assert repaired == (
+            "Write parser for JSON files. It must handle nested arrays and "
+            "objects.\nValidate schema."
+        )
+
+    def test_restores_deleted_segment_with_lost_keywords(self):
+        guard = SegmentGuard(SimilarityScorer(), threshold=0.6)
+        optimized = "Write parser for JSON files.\nValidate schema."
+        repaired, reverted = guard.repair(self.ORIGINAL, optimized)
+        assert reverted == 1
+        assert "It must handle nested arrays and objects." in repaired
+        # The duplicate request stays deleted: its keywords survive.
+        assert repaired.count("parser") == 1
+
+    def test_nothing_to_repair(self):
+        guard = SegmentGuard(SimilarityScorer(), threshold=0.4)
+        assert guard.repair("Write a parser.", "Write parser.") == ("Write parser.", 0)
+
+    def test_batch_length_mismatch(self):
+        guard = SegmentGuard(SimilarityScorer(), threshold=0.4)
+        with pytest.raises(ValueError):
+            guard.repair_batch(["a"], [])
+
+
 class TestProviderRegistry:
     def test_lookup_openai(self):
         registry = ProviderRegistry()
@@ -134,6 +628,65 @@ class TestProviderRegistry:
         tokenizer = registry.get_tokenizer("gemini-2.0-flash")
         assert tokenizer.name == "gemini"
 
+    def test_combined_pattern_matches_sequential_search(self):
+        import re
+
+        from token_optimizer.providers.registry import _MODEL_PATTERNS
+
+        names = [
+            "gpt-4o-mini-2024-07-18", "GPT-4o", "gpt-4-turbo-preview", "gpt-4",
+            "gpt-3.5-turbo-16k", "o1-mini", "o1-preview", "o3-mini-high",
+            "claude-3-5-sonnet-latest", "Claude-Opus-4-1", "claude-instant",
+            "gemini-1.5-pro-002", "gemini-exp", "mistral-large-latest",
+            "open-mistral-nemo", "command-r-plus-08-2024", "command-light",
+            "llama-3-70b", "", "azure/gpt-4o",
+        ]
+        for name in names:
+            matches = [
+                info
+                for pattern, info in _MODEL_PATTERNS
+                if re.search(pattern, name, re.IGNORECASE)
+            ]
+            expected = matches[0] if matches else None
+            info = ProviderRegistry().lookup(name)
+            if expected is None:
+                assert info.provider == "unknown"
+            else:
+                assert info is expected
+
+    def test_tokenizers_are_pooled(self):
+        first = ProviderRegistry().get_tokenizer("claude-sonnet-4-5-20250929")
+        second = ProviderRegistry().get_tokenizer("claude-3-haiku")
+        assert first is second
+
+    def test_missing_exact_tokenizer_warns(self, monkeypatch):
+        def unavailable(model):
+            raise ImportError("tiktoken missing")
+
+        monkeypatch.setattr(
+            ProviderRegistry, "_openai_tokenizer", staticmethod(unavailable)
+        )
+        with pytest.warns(RuntimeWarning, match="word-count estimate"):
+            tokenizer = ProviderRegistry().get_tokenizer("gpt-4o-warning-test")
+        assert tokenizer.name == "generic"
+
+    def test_strict_raises_instead_of_falling_back(self, monkeypatch):
+        def unavailable(model):
+            raise ImportError("tiktoken missing")
+
+        monkeypatch.setattr(
+            ProviderRegistry, "_openai_tokenizer", staticmethod(unavailable)
+        )
+        with pytest.raises(ImportError):
+            ProviderRegistry(strict=True).get_tokenizer("gpt-4o")
+
+    def test_preload_sets_tiktoken_cache_dir(self, monkeypatch, tmp_path):
+        from token_optimizer.providers.registry import preload_encodings
+
+        monkeypatch.delenv("TIKTOKEN_CACHE_DIR", raising=False)
+        preload_encodings(names=(), cache_dir=tmp_path)
+        assert os.environ["TIKTOKEN_CACHE_DIR"] == str(tmp_path)
+
 
 # ── Prompt Cache ─────────────────────────────────────────────────────────
 
@@ -178,5 +731,281 @@ class TestPromptCache:
         cache.put("a", "s", "1")
         assert cache.size == 1
 
-
-import pytest
+    def test_stats_counts_hits_misses_and_evictions(self):
+        cache = PromptCache(maxsize=2)
+        cache.put("a", "s", "1")
+        cache.put("b", "s", "2")
+        cache.get("a", "s")
+        cache.get("zzz", "s")
+        cache.put("c", "s", "3")  # evicts "b"
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 1)
+        assert stats.entries == 2
+        assert stats.bytes > 0
+        assert stats.hit_ratio == 0.5
+
+    def test_bytes_track_replacement_and_clear(self):
+        cache = PromptCache(maxsize=10)
+        cache.put("a", "s", "short")
+        small = cache.stats().bytes
+        cache.put("a", "s", "a much longer replacement value")
+        assert cache.stats().bytes > small
+        assert cache.size == 1
+        cache.clear()
+        assert cache.stats().bytes == 0
+
+    def test_sharded_capacity(self):
+        cache = PromptCache(maxsize=1024)
+        assert len(cache._shards) == 16
+        assert sum(shard.main.max_entries for shard in cache._shards) == 1024
+        for i in range(2000):
+            cache.put(f"prompt {i}", "s", str(i))
+        assert cache.size <= 1024
+        assert cache.stats().evictions == 2000 - cache.size
+
+    def test_invalid_shards(self):
+        with pytest.raises(ValueError):
+            PromptCache(maxsize=4, shards=8)
+
+    def test_concurrent_access(self):
+        cache = PromptCache(maxsize=256, shards=4)
+        errors = []
+
+        def worker(seed):
+            try:
+                for i in range(2000):
+                    key = f"prompt {(seed * 7 + i) % 400}"
+                    if cache.get(key, "s") is None:
+                        cache.put(key, "s", key.upper())
+                    elif cache.get(key, "s") not in (None, key.upper()):
+                        errors.append(key)
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stats = cache.stats()
+        assert stats.entries == cache.size <= 256
+        assert stats.hits + stats.misses >= 8 * 2000
+
+    def test_byte_budget_evicts_large_entries(self):
+        cache = PromptCache(maxsize=100, max_bytes=10_000)
+        for i in range(5):
+            cache.put(f"small {i}", "s", "x" * 100)
+        cache.put("big", "s", "y" * 8_000)
+        assert cache.stats().bytes <= 10_000
+        assert cache.get("big", "s") is not None
+        cache.put("bigger", "s", "z" * 9_000)
+        assert cache.get("big", "s") is None
+        assert cache.stats().bytes <= 10_000
+
+    def test_oversized_entry_rejected(self):
+        cache = PromptCache(maxsize=10, max_bytes=1_000)
+        cache.put("a", "s", "ok")
+        cache.put("huge", "s", "x" * 5_000)
+        assert cache.get("huge", "s") is None
+        assert cache.get("a", "s") == "ok"
+        assert cache.stats().rejections == 1
+
+    @staticmethod
+    def _hot_hits_during_scans(cache):
+        hot = [f"hot {i}" for i in range(50)]
+        one_off = (f"one-off {i}" for i in range(10_000))
+        hot_hits = 0
+        for round_ in range(20):
+            for key in hot:
+                if cache.get(key, "s") is None:
+                    cache.put(key, "s", key)
+                elif round_ >= 10:
+                    hot_hits += 1
+            for _ in range(200):
+                key = next(one_off)
+                if cache.get(key, "s") is None:
+                    cache.put(key, "s", key)
+        return hot_hits / (10 * len(hot))
+
+    def test_tinylfu_resists_scans(self):
+        cache = PromptCache(maxsize=100, shards=1, admission="tinylfu")
+        assert self._hot_hits_during_scans(cache) > 0.9
+        assert cache.stats().rejections > 0
+
+    def test_lru_flushed_by_scans(self):
+        cache = PromptCache(maxsize=100, shards=1)
+        assert self._hot_hits_during_scans(cache) == 0
+
+    def test_ttl_expires_entries(self):
+        cache = PromptCache(maxsize=10, ttl=60)
+        cache.put("short", "s", "1", ttl=0.01)
+        cache.put("long", "s", "2")
+        time.sleep(0.02)
+        assert cache.get("short", "s") is None
+        assert cache.get("long", "s") == "2"
+        assert cache.stats().expirations == 1
+
+    def test_variant_and_fingerprint(self):
+        cache = PromptCache(maxsize=10)
+        cache.put("hello", "s", "v1", variant="a")
+        assert cache.get("hello", "s", variant="b") is None
+        assert cache.get("hello", "s", variant="a") == "v1"
+        fingerprint = Fingerprint.of("hello")
+        assert cache.get("ignored", "s", fingerprint=fingerprint, variant="a") == "v1"
+
+    def test_invalid_admission(self):
+        with pytest.raises(ValueError):
+            PromptCache(admission="lfu")
+
+
+class TestFingerprints:
+    def test_fingerprint_is_stable_and_distinct(self):
+        assert Fingerprint.of("abc") == Fingerprint.of("abc")
+        assert Fingerprint.of("abc") != Fingerprint.of("abd")
+        assert len(Fingerprint.of("abc").hex) == 32
+
+    def test_config_fingerprint_depends_on_every_part(self):
+        base = config_fingerprint("gpt-4o", ["x"])
+        assert base == config_fingerprint("gpt-4o", ["x"])
+        assert base != config_fingerprint("gpt-4o", ["y"])
+        assert base != config_fingerprint("gpt-4", ["x"])
+
+
+class TestFrequencySketch:
+    def test_counts_and_saturates(self):
+        sketch = FrequencySketch(capacity=16)
+        for _ in range(3):
+            sketch.increment(12345)
+        assert sketch.estimate(12345) == 3
+        assert sketch.estimate(99999) == 0
+        for _ in range(40):
+            sketch.increment(777)
+        assert sketch.estimate(777) == 15
+
+    def test_ages_counters(self):
+        sketch = FrequencySketch(capacity=16)
+        for _ in range(8):
+            sketch.increment(1)
+        for _ in range(160):
+            sketch.increment(2 << 32 | 2)
+        assert sketch.estimate(1) == 4
+
+
+
+# ── Disk Cache ───────────────────────────────────────────────────────────
+
+
+def _result(text="optimized"):
+    return OptimizationResult(
+        original_text="original",
+        optimized_text=text,
+        original_tokens=10,
+        optimized_tokens=4,
+        savings_percent=60.0,
+        estimated_cost_savings=0.001,
+        similarity_score=0.8,
+        strategy_used="moderate->conservative",
+    )
+
+
+class TestDiskCache:
+    def test_shared_between_instances(self, tmp_path):
+        writer = DiskCache(tmp_path)
+        reader = DiskCache(tmp_path)
+        writer.put("k", _result())
+        assert reader.get("k") == (_result(), None)
+        assert reader.get("missing") is None
+
+    def test_namespace_invalidates_entries(self, tmp_path):
+        DiskCache(tmp_path, namespace="v1").put("k", "old")
+        upgraded = DiskCache(tmp_path, namespace="v2")
+        assert upgraded.get("k") is None
+        assert upgraded.size == 0
+
+    def test_namespaces_share_a_directory(self, tmp_path):
+        old = DiskCache(tmp_path, namespace="v1")
+        old.put("k", "old")
+        new = DiskCache(tmp_path, namespace="v2")
+        new.put("k", "new")
+        old.close()
+        reopened = DiskCache(tmp_path, namespace="v1")
+        assert reopened.get("k") == ("old", None)
+        assert [key for key, _, _ in new.recent(10)] == ["k"]
+        new.clear()
+        assert reopened.size == 1
+        new.put("k", "new")
+        assert new.purge_stale() == 1
+        assert reopened.get("k") is None
+        assert new.get("k") == ("new", None)
+
+    def test_evicts_oldest_when_over_budget(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=200)
+        for i in range(10):
+            cache.put(f"k{i}", "x" * 30)
+        assert cache.total_bytes <= 200
+        assert cache.get("k0") is None
+        assert cache.get("k9") == ("x" * 30, None)
+
+    def test_prompt_cache_falls_through_and_promotes(self, tmp_path):
+        PromptCache(maxsize=10, disk=DiskCache(tmp_path)).put("hello", "s", "hi")
+        cold = PromptCache(maxsize=10, disk=DiskCache(tmp_path))
+        assert cold.size == 0
+        assert cold.get("hello", "s") == "hi"
+        assert cold.size == 1
+
+    def test_promote_strategy_name_with_colon(self, tmp_path):
+        PromptCache(maxsize=10, disk=DiskCache(tmp_path)).put("hello", "my:strat", "hi")
+        cold = PromptCache(maxsize=10, disk=DiskCache(tmp_path))
+        assert cold.promote() == 1
+        assert cold.get("hello", "my:strat") == "hi"
+        assert cold.stats().disk_hits == 0
+
+    def test_disk_hits_counted_across_threads(self, tmp_path):
+        warm = PromptCache(maxsize=200, disk=DiskCache(tmp_path))
+        for i in range(80):
+            warm.put(f"prompt {i}", "s", str(i))
+        cold = PromptCache(maxsize=200, disk=DiskCache(tmp_path))
+
+        def worker(n):
+            for i in range(n, 80, 4):
+                assert cold.get(f"prompt {i}", "s") == str(i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cold.stats()
+        assert stats.disk_hits == stats.hits == 80
+
+    def test_promote_loads_recent_entries(self, tmp_path):
+        warm = PromptCache(maxsize=10, disk=DiskCache(tmp_path))
+        for text in ("a", "b", "c"):
+            warm.put(text, "s", text.upper())
+        cold = PromptCache(maxsize=10, disk=DiskCache(tmp_path))
+        assert cold.promote(limit=2) == 2
+        assert cold.size == 2
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        disk.put("gone", "value", ttl=0.01)
+        disk.put("kept", "value")
+        time.sleep(0.02)
+        assert disk.get("gone") is None
+        assert disk.size == 1
+        assert [key for key, _, _ in disk.recent(10)] == ["kept"]
+
+    def test_promoted_entries_keep_their_expiry(self, tmp_path):
+        writer = PromptCache(maxsize=10, disk=DiskCache(tmp_path), ttl=3600)
+        writer.put("short", "s", "gone soon", ttl=0.05)
+        writer.put("long", "s", "kept")
+        hit = PromptCache(maxsize=10, disk=DiskCache(tmp_path), ttl=3600)
+        assert hit.get("short", "s") == "gone soon"
+        warm = PromptCache(maxsize=10, disk=DiskCache(tmp_path), ttl=3600)
+        assert warm.promote() == 2
+        time.sleep(0.06)
+        for cache in (hit, warm):
+            assert cache.get("short", "s") is None
+        assert warm.get("long", "s") == "kept"
@@ -4,8 +4,20 @@ from token_optimizer.strategies.conservative import ConservativeStrategy
 from token_optimizer.strategies.moderate import ModerateStrategy
 from token_optimizer.strategies.aggressive import AggressiveStrategy
 from token_optimizer.strategies.custom import CustomStrategy
+from token_optimizer.strategies.best import BestOfStrategy
 from token_optimizer.analyzers.filler import FillerAnalyzer
+from token_optimizer.analyzers.stages import Stage, StageMemo
 from token_optimizer.analyzers.structural import StructuralAnalyzer
+from token_optimizer.metrics.profiling import Profiler
+
+import pytest
+
+MIXED = (
+    "## Task\n\n**Please** just write a function.  Make sure to validate it.\n"
+    "- In order to do this, you should basically handle errors.\n"
+    "- In order to do this, you should basically handle errors.\n\n\n"
+    "I would like you to write tests. I would like you to write tests."
+)
 
 
 class TestConservativeStrategy:
@@ -32,6 +44,11 @@ class TestModerateStrategy:
         s = ModerateStrategy()
         assert s.name == "moderate"
 
+    def test_lsh_redundancy_mode(self):
+        s = ModerateStrategy(redundancy_mode="lsh", cross_paragraph=True)
+        text = "Write a parser.\nWrite a parser."
+        assert s.optimize(text).count("parser") == 1
+
     def test_more_aggressive_than_conservative(self):
         conservative = ConservativeStrategy()
         moderate = ModerateStrategy()
@@ -86,3 +103,82 @@ class TestCustomStrategy:
         s = CustomStrategy(analyzers=[])
         text = "Hello world"
         assert s.optimize(text) == text
+
+
+class TestStageMemo:
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            ConservativeStrategy(),
+            ModerateStrategy(),
+            AggressiveStrategy(redundancy_mode="lsh", cross_paragraph=True),
+        ],
+    )
+    def test_memoized_matches_optimize(self, strategy):
+        for keywords in (None, ["basically"]):
+            expected = strategy.optimize(MIXED, preserve_keywords=keywords)
+            memoized = strategy.optimize_memoized(MIXED, StageMemo(), keywords)
+            assert memoized == expected
+
+    def test_profiled_memo_records_each_stage(self):
+        profiler = Profiler()
+        strategy = ModerateStrategy()
+        result = strategy.optimize_memoized(MIXED, StageMemo(profiler))
+        assert result == strategy.optimize(MIXED)
+        profile = profiler.finish(lambda texts: [len(t.split()) for t in texts])
+        assert [e.name for e in profile.entries] == [s.key for s in strategy.stages()]
+        assert profile.entries[0].input_chars == len(MIXED)
+        assert profile.entries[-1].output_chars == len(result)
+        assert sum(e.tokens_removed for e in profile.entries) == (
+            len(MIXED.split()) - len(result.split())
+        )
+
+    def test_stage_groups_flatten_to_stages(self):
+        strategy = ModerateStrategy()
+        groups = strategy.stage_groups()
+        assert len(groups) == 4
+        assert [s.key for g in groups for s in g] == [s.key for s in strategy.stages()]
+
+    def test_strategies_share_stages(self):
+        memo = StageMemo()
+        ModerateStrategy().optimize_memoized(MIXED, memo)
+        hits = memo.hits
+        result = AggressiveStrategy().optimize_memoized(MIXED, memo)
+        assert result == AggressiveStrategy().optimize(MIXED)
+        assert memo.hits > hits
+
+    def test_per_line_stage_reuses_repeated_lines(self):
+        calls = []
+        stage = Stage("upper", lambda line: calls.append(line) or line.upper(), True)
+        memo = StageMemo()
+        assert memo.run([stage], "ab\ncd\nab") == "AB\nCD\nAB"
+        assert calls == ["ab", "cd"]
+        assert memo.hits == 1
+
+    def test_custom_analyzer_without_stages(self):
+        class Shout:
+            def analyze(self, text, preserve_keywords=None):
+                return text.upper()
+
+        s = CustomStrategy(analyzers=[StructuralAnalyzer(aggressiveness=1), Shout()])
+        text = "hello   world"
+        assert s.optimize_memoized(text, StageMemo()) == s.optimize(text)
+
+
+class TestBestOfStrategy:
+    def test_evaluate_runs_every_candidate(self):
+        candidates = [ConservativeStrategy(), ModerateStrategy(), AggressiveStrategy()]
+        best = BestOfStrategy(candidates)
+        memo = StageMemo()
+        outcomes = best.evaluate(MIXED, memo=memo)
+        assert outcomes == [(c.name, c.optimize(MIXED)) for c in candidates]
+        assert memo.hits > 0
+
+    def test_optimize_uses_least_aggressive(self):
+        best = BestOfStrategy([ConservativeStrategy(), AggressiveStrategy()])
+        assert best.name == "best"
+        assert best.optimize(MIXED) == ConservativeStrategy().optimize(MIXED)
+
+    def test_requires_candidates(self):
+        with pytest.raises(ValueError):
+            BestOfStrategy([])
@@ -1,7 +1,30 @@
 """Token Optimizer — Reduce LLM API costs by compressing prompts."""
 
-from token_optimizer.engine import TokenOptimizer
-from token_optimizer.config import OptimizerConfig, OptimizationResult
+from typing import TYPE_CHECKING
 
-__all__ = ["TokenOptimizer", "OptimizerConfig", "OptimizationResult"]
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.engine import TokenOptimizer
+    from token_optimizer.async_engine import AsyncTokenOptimizer
+    from token_optimizer.config import OptimizerConfig, OptimizationResult
+
+# Resolved on first access, so ``import token_optimizer`` (and the CLI's
+# ``--help``) does not pay for the engine, registry, metrics and cache.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TokenOptimizer": "token_optimizer.engine",
+        "AsyncTokenOptimizer": "token_optimizer.async_engine",
+        "OptimizerConfig": "token_optimizer.config",
+        "OptimizationResult": "token_optimizer.config",
+    },
+)
+
+__all__ = [
+    "TokenOptimizer",
+    "AsyncTokenOptimizer",
+    "OptimizerConfig",
+    "OptimizationResult",
+]
 __version__ = "0.1.0"
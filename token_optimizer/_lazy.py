@@ -0,0 +1,38 @@
+"""Lazy attribute exports for package ``__init__`` modules."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` for ``package``.
+
+    ``exports`` maps each public name to the submodule defining it.  The
+    submodule is imported on first access to the name, so importing the
+    package itself only costs what its ``__init__`` imports eagerly.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Public name to absolute submodule name.
+
+    Returns:
+        The ``(__getattr__, __dir__)`` pair to assign in the package.
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
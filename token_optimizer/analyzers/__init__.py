@@ -1,13 +1,31 @@
 """Analyzers for detecting and removing different types of token waste."""
 
-from token_optimizer.analyzers.filler import FillerAnalyzer
-from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
-from token_optimizer.analyzers.verbosity import VerbosityAnalyzer
-from token_optimizer.analyzers.structural import StructuralAnalyzer
+from typing import TYPE_CHECKING
+
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.analyzers.filler import FillerAnalyzer
+    from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+    from token_optimizer.analyzers.verbosity import VerbosityAnalyzer
+    from token_optimizer.analyzers.structural import StructuralAnalyzer
+    from token_optimizer.analyzers.pruning import SentencePruner
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "FillerAnalyzer": "token_optimizer.analyzers.filler",
+        "RedundancyAnalyzer": "token_optimizer.analyzers.redundancy",
+        "VerbosityAnalyzer": "token_optimizer.analyzers.verbosity",
+        "StructuralAnalyzer": "token_optimizer.analyzers.structural",
+        "SentencePruner": "token_optimizer.analyzers.pruning",
+    },
+)
 
 __all__ = [
     "FillerAnalyzer",
     "RedundancyAnalyzer",
     "VerbosityAnalyzer",
     "StructuralAnalyzer",
+    "SentencePruner",
 ]
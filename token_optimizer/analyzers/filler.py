@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import re
+from functools import partial
+
+from token_optimizer.analyzers.matcher import compile_phrases, filter_preserved
+from token_optimizer.analyzers.stages import Stage
 
 
 class FillerAnalyzer:
@@ -78,6 +82,42 @@ class FillerAnalyzer:
             raise ValueError("aggressiveness must be 1, 2, or 3")
         self.aggressiveness = aggressiveness
 
+    def stages(self, preserve_keywords: list[str] | None = None) -> list[Stage]:
+        """Return the analyzer's steps for the configured aggressiveness."""
+        preserved: set[str] = set()
+        if preserve_keywords:
+            preserved = {kw.lower() for kw in preserve_keywords}
+
+        stages: list[Stage] = []
+
+        # All levels: remove filler phrases; level 2+ also removes filler
+        # words on word boundaries.  Both run as a single precompiled scan
+        # that prefers the longest phrase at each position.
+        phrases = filter_preserved(self.FILLER_PHRASES, preserved)
+        words: tuple[str, ...] = ()
+        if self.aggressiveness >= 2:
+            words = tuple(
+                sorted(w for w in self.FILLER_WORDS if w.lower() not in preserved)
+            )
+        pattern = compile_phrases(phrases, words)
+        if pattern is not None:
+            scan = "words" if self.aggressiveness >= 2 else "phrases"
+            stages.append(Stage(f"filler.scan:{scan}", partial(pattern.sub, "")))
+
+        # Level 3: strip polite openers.
+        if self.aggressiveness >= 3:
+            stages.append(Stage("filler.openers", self._strip_opener))
+
+        stages.append(Stage("filler.cleanup", _cleanup))
+        return stages
+
+    def _strip_opener(self, text: str) -> str:
+        stripped = text.lstrip()
+        for opener in self.POLITE_OPENERS:
+            if stripped.lower().startswith(opener.lower()):
+                return stripped[len(opener) :].lstrip()
+        return stripped
+
     def analyze(
         self, text: str, preserve_keywords: list[str] | None = None
     ) -> str:
@@ -93,43 +133,15 @@ class FillerAnalyzer:
         if not text:
             return text
 
-        preserved: set[str] = set()
-        if preserve_keywords:
-            preserved = {kw.lower() for kw in preserve_keywords}
-
         result = text
+        for stage in self.stages(preserve_keywords):
+            result = stage.run(result)
+        return result
 
-        # All levels: remove filler phrases (longest first for greedy match).
-        for phrase in self.FILLER_PHRASES:
-            if preserved and any(
-                word.lower() in preserved for word in phrase.split()
-            ):
-                continue
-            pattern = re.compile(re.escape(phrase), re.IGNORECASE)
-            result = pattern.sub("", result)
-
-        # Level 2+: remove filler words using word boundaries.
-        if self.aggressiveness >= 2:
-            for word in self.FILLER_WORDS:
-                if word.lower() in preserved:
-                    continue
-                pattern = re.compile(
-                    r"\b" + re.escape(word) + r"\b", re.IGNORECASE
-                )
-                result = pattern.sub("", result)
 
-        # Level 3: strip polite openers.
-        if self.aggressiveness >= 3:
-            stripped = result.lstrip()
-            for opener in self.POLITE_OPENERS:
-                if stripped.lower().startswith(opener.lower()):
-                    stripped = stripped[len(opener) :].lstrip()
-                    break
-            result = stripped
-
-        # Clean up extra whitespace.
-        result = re.sub(r"  +", " ", result)
-        result = re.sub(r" ([.,;:!?])", r"\1", result)
-        result = re.sub(r"^\s+", "", result, flags=re.MULTILINE)
-
-        return result.strip()
+def _cleanup(text: str) -> str:
+    """Clean up whitespace left behind by removals."""
+    text = re.sub(r"  +", " ", text)
+    text = re.sub(r" ([.,;:!?])", r"\1", text)
+    text = re.sub(r"^\s+", "", text, flags=re.MULTILINE)
+    return text.strip()
@@ -0,0 +1,77 @@
+"""MinHash signatures with LSH banding for near-duplicate detection."""
+
+from __future__ import annotations
+
+import random
+import zlib
+from collections import defaultdict
+
+# Mersenne prime used for the universal hash family.
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHashLSH:
+    """Index of word-set MinHash signatures bucketed by LSH bands.
+
+    Each set is summarised by ``num_perm`` min-hash values, split into
+    ``bands`` bands of equal width.  Two sets become candidates when any
+    band matches exactly, which happens with probability
+    ``1 - (1 - J**rows)**bands`` for Jaccard similarity ``J``.  The defaults
+    (16 bands of 4 rows) catch pairs above ~0.7 similarity with >98%
+    probability while keeping the candidate lists short.
+
+    The index only proposes candidates; callers confirm them with an exact
+    Jaccard check.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1) -> None:
+        if num_perm <= 0 or bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self._rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: list[defaultdict[tuple[int, ...], list[int]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        # Empty sets have no signature; they are all identical to each other.
+        self._empty: list[int] = []
+
+    def signature(self, words: set[str]) -> tuple[int, ...]:
+        """Compute the MinHash signature of a word set (empty for no words)."""
+        if not words:
+            return ()
+        hashes = [zlib.crc32(w.encode()) for w in words]
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+            for a, b in self._perms
+        )
+
+    def _bands(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        rows = self._rows
+        return [signature[i * rows : (i + 1) * rows] for i in range(self.bands)]
+
+    def add(self, item_id: int, signature: tuple[int, ...]) -> None:
+        """Index a signature under ``item_id``."""
+        if not signature:
+            self._empty.append(item_id)
+            return
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            bucket[band].append(item_id)
+
+    def query(self, signature: tuple[int, ...]) -> list[int]:
+        """Return ids sharing at least one band with ``signature``, in
+        insertion order."""
+        if not signature:
+            return list(self._empty)
+        candidates: set[int] = set()
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            found = bucket.get(band)
+            if found:
+                candidates.update(found)
+        return sorted(candidates)
@@ -0,0 +1,84 @@
+"""Precompiled multi-pattern matching for the rule-based analyzers."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+# Marks the end of a phrase inside a trie node.
+_END = ""
+
+
+def _build_trie(phrases: tuple[str, ...]) -> dict[str, Any]:
+    """Build a character trie from lowercased phrases."""
+    root: dict[str, Any] = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    return root
+
+
+def _trie_to_pattern(node: dict[str, Any]) -> str:
+    """Render a trie node as a regex fragment.
+
+    Phrases sharing a prefix are factored into nested groups, so the regex
+    engine inspects each input character at most once per trie level instead
+    of once per phrase.  A terminal node is emitted as an optional group,
+    which makes the greedy engine prefer the longest phrase at a position.
+    """
+    branches = [
+        re.escape(char) + _trie_to_pattern(child)
+        for char, child in sorted(node.items())
+        if char != _END
+    ]
+    if not branches:
+        return ""
+    terminal = _END in node
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if terminal else group
+
+
+@lru_cache(maxsize=128)
+def compile_phrases(
+    phrases: tuple[str, ...], words: tuple[str, ...] = ()
+) -> re.Pattern[str] | None:
+    """Compile literal phrases and whole words into one case-insensitive regex.
+
+    ``phrases`` match anywhere in the text, ``words`` only on word boundaries.
+    At any position the longest phrase wins, and phrases take priority over
+    words, so a single left-to-right ``sub`` gives the same removals as
+    applying each rule longest-first.  Compiled patterns are cached per
+    rule set, so callers can pass filtered tuples on every call.
+
+    Args:
+        phrases: Literal phrases to match.
+        words: Literal words to match on word boundaries.
+
+    Returns:
+        The compiled pattern, or ``None`` if there is nothing to match.
+    """
+    alternatives: list[str] = []
+    if phrases:
+        alternatives.append(_trie_to_pattern(_build_trie(phrases)))
+    if words:
+        alternatives.append(r"\b(?:" + _trie_to_pattern(_build_trie(words)) + r")\b")
+    if not alternatives:
+        return None
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def filter_preserved(
+    phrases: list[str], preserved: set[str]
+) -> tuple[str, ...]:
+    """Drop phrases that contain any preserved keyword."""
+    if not preserved:
+        return tuple(phrases)
+    return tuple(
+        phrase for phrase in phrases
+        if not any(word.lower() in preserved for word in phrase.split())
+    )
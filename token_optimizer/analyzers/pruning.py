@@ -0,0 +1,275 @@
+"""Extractive pruning: drop the least central sentences to meet a token budget."""
+
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from typing import Any, Callable, Sequence
+
+from token_optimizer.metrics.similarity import (
+    _SEPARATOR,
+    _STOP_WORDS,
+    _WORD_OR_SEPARATOR,
+    extract_keywords,
+)
+
+# A sentence: from a non-space character to a terminator followed by
+# whitespace, or to the end of the line.  Sentences never span lines.  The
+# same rule as the segment guard's, with the lazy scan unrolled for speed.
+_SENTENCE = re.compile(r"\S[^.!?\n]*(?:[.!?](?!\s)[^.!?\n]*)*[.!?]?")
+_WORD_CHAR = re.compile(r"\w")
+
+# Below this many sentences, numpy's import and conversion cost outweighs its gain.
+_NUMPY_MIN_SENTENCES = 256
+
+CountTokensBatch = Callable[[Sequence[str]], Sequence[int]]
+
+
+def split_sentences(text: str) -> list[tuple[int, int]]:
+    """Return the ``(start, end)`` span of every sentence in ``text``."""
+    spans = []
+    for match in _SENTENCE.finditer(text):
+        start = match.start()
+        spans.append((start, start + len(match.group().rstrip())))
+    return spans
+
+
+def centrality(sentences: Sequence[str]) -> list[float]:
+    """Score each sentence by how much of the document it represents.
+
+    A sentence's score is the sum of its TF-IDF cosine similarity to every
+    other sentence (degree centrality in the sentence similarity graph).
+    Summed against the centroid of all unit sentence vectors this needs
+    only per-term sums, O(total keywords) rather than O(sentences**2).
+    Sentences without keywords score 0.
+    """
+    if len(sentences) >= _NUMPY_MIN_SENTENCES:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            scores = _centrality_numpy(np, sentences)
+            if scores is not None:
+                return scores
+
+    n = len(sentences)
+    bags = [Counter(extract_keywords(sentence)) for sentence in sentences]
+    df = Counter(word for bag in bags for word in bag)
+    idf = {word: math.log((1 + n) / (1 + count)) + 1 for word, count in df.items()}
+    units = []
+    centroid: defaultdict[str, float] = defaultdict(float)
+    for bag in bags:
+        weights = {w: (1 + math.log(c)) * idf[w] for w, c in bag.items()}
+        norm = math.sqrt(sum(v * v for v in weights.values()))
+        unit = {w: v / norm for w, v in weights.items()}
+        for word, value in unit.items():
+            centroid[word] += value
+        units.append(unit)
+    return [
+        sum(value * (centroid[word] - value) for word, value in unit.items())
+        for unit in units
+    ]
+
+
+def _centrality_numpy(np: Any, sentences: Sequence[str]) -> list[float] | None:
+    n = len(sentences)
+    joined = _SEPARATOR.join(sentences).lower()
+    if joined.count(_SEPARATOR) != n - 1:
+        return None  # a sentence contains the separator itself
+
+    # One findall over every sentence; separator matches mark sentence bounds.
+    tokens = _WORD_OR_SEPARATOR.findall(joined)
+    vocabulary = {w: i for i, w in enumerate(dict.fromkeys(tokens))}
+    width = len(vocabulary)
+    ids = np.fromiter(
+        map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens)
+    )
+    owners = np.cumsum(ids == vocabulary.get(_SEPARATOR, -1))
+    is_keyword = np.fromiter(
+        (w not in _STOP_WORDS and len(w) > 1 for w in vocabulary),
+        dtype=bool,
+        count=width,
+    )
+    keep = is_keyword[ids]
+
+    # Unique (sentence, word) keys are the nonzeros of the term matrix.
+    keys, counts = np.unique(owners[keep] * width + ids[keep], return_counts=True)
+    rows, words = keys // width, keys % width
+    idf = np.log((1 + n) / (1 + np.bincount(words, minlength=width))) + 1
+    weights = (1 + np.log(counts)) * idf[words]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+    unit = weights / norms[rows]
+    centroid = np.bincount(words, weights=unit, minlength=width)
+    return np.bincount(
+        rows, weights=unit * (centroid[words] - unit), minlength=n
+    ).tolist()
+
+
+class SentencePruner:
+    """Drops the lowest-value sentences until a text fits a token budget.
+
+    Unlike the other analyzers this one removes content, so it is meant as
+    a last resort once rewriting is not enough.  Sentences are ranked by
+    :func:`centrality`; the least central are dropped first, later ones
+    before earlier ones on ties, until the text's token count is within
+    ``max_tokens``.  The whole text is counted once and each dropped
+    sentence's count, scaled so the counts add up to the whole, is
+    subtracted from it; the result is then counted, and if the estimate
+    fell short, dropping resumes.  Sentences containing a preserved keyword are never
+    dropped, and at least one sentence is always kept, so the result can
+    still exceed the budget.  Remaining sentences keep their order and
+    lines; lines left empty are removed.
+
+    Args:
+        max_tokens: Token budget for the pruned text.
+        count_tokens_batch: Counts tokens for many texts at once, e.g. a
+            tokenizer's or TokenCalculator's ``count_tokens_batch``.
+            Defaults to the generic estimate.
+    """
+
+    def __init__(
+        self, max_tokens: int, count_tokens_batch: CountTokensBatch | None = None
+    ) -> None:
+        if max_tokens < 0:
+            raise ValueError("max_tokens must be non-negative")
+        if count_tokens_batch is None:
+            from token_optimizer.tokenizers.generic import GenericTokenizer
+
+            count_tokens_batch = GenericTokenizer().count_tokens_batch
+        self.max_tokens = max_tokens
+        self._count = count_tokens_batch
+
+    def analyze(self, text: str, preserve_keywords: list[str] | None = None) -> str:
+        """Prune ``text`` to the budget.
+
+        Args:
+            text: The input text.
+            preserve_keywords: Sentences containing any of these words or
+                phrases (case-insensitive) are always kept.
+
+        Returns:
+            The text with the dropped sentences removed, or ``text``
+            unchanged if it already fits.
+        """
+        spans = split_sentences(text)
+        if len(spans) < 2:
+            return text
+        sentences = [text[start:end] for start, end in spans]
+        total, *tokens = self._count([text, *sentences])
+        excess = total - self.max_tokens
+        if excess <= 0:
+            return text
+        # Per-sentence counts miss line breaks and differ from the whole
+        # text's at sentence boundaries; spread the difference pro rata.
+        scale = total / max(sum(tokens), 1)
+
+        preserved = _preserved(text, spans, preserve_keywords or [])
+        scores = centrality(sentences)
+        candidates = sorted(
+            (i for i in range(len(spans)) if i not in preserved),
+            key=lambda i: (scores[i], -i),
+        )
+        if not preserved and candidates:
+            candidates.pop()  # keep the most central sentence
+        dropped: list[int] = []
+        remaining = iter(candidates)
+        while True:
+            for i in remaining:
+                dropped.append(i)
+                excess -= tokens[i] * scale
+                if excess <= 0:
+                    break
+            if not dropped:
+                return text
+            pruned = _remove(text, spans, sorted(dropped))
+            # The estimate can fall a little short; recount and go on
+            # dropping from where it stopped.
+            excess = self._count([pruned])[0] - self.max_tokens
+            if excess <= 0 or len(dropped) == len(candidates):
+                return pruned
+
+
+def _preserved(
+    text: str, spans: list[tuple[int, int]], keywords: list[str]
+) -> set[int]:
+    """Indices of the sentences that contain a preserved keyword."""
+    keywords = [kw.lower() for kw in keywords if kw.strip()]
+    if not keywords:
+        return set()
+    lowered = text.lower()
+    if len(lowered) != len(text):  # lowercasing moved offsets
+        return _preserved_ignorecase(text, spans, keywords)
+    # Without a lookbehind the pattern gets a literal-prefix scan, several
+    # times faster; the preceding character is checked here instead.
+    pattern = re.compile("|".join(rf"{re.escape(kw)}(?!\w)" for kw in keywords))
+    starts = [start for start, _ in spans]
+    preserved = set()
+    position = 0
+    while match := pattern.search(lowered, position):
+        start = match.start()
+        if start and _WORD_CHAR.match(lowered, start - 1):
+            position = start + 1
+            continue
+        i = bisect_right(starts, start) - 1
+        if i >= 0 and start < spans[i][1]:
+            preserved.add(i)
+            position = max(match.end(), spans[i][1])
+        else:
+            position = match.end()
+    return preserved
+
+
+def _preserved_ignorecase(
+    text: str, spans: list[tuple[int, int]], keywords: list[str]
+) -> set[int]:
+    pattern = re.compile(
+        "|".join(rf"(?<!\w){re.escape(kw)}(?!\w)" for kw in keywords), re.IGNORECASE
+    )
+    starts = [start for start, _ in spans]
+    preserved = set()
+    for match in pattern.finditer(text):
+        i = bisect_right(starts, match.start()) - 1
+        if i >= 0 and match.start() < spans[i][1]:
+            preserved.add(i)
+    return preserved
+
+
+def _remove(text: str, spans: list[tuple[int, int]], dropped: list[int]) -> str:
+    """Cut the ``dropped`` sentences (sorted indices) out of ``text``."""
+    parts = []
+    position = 0
+    length = len(text)
+    line_kept = False  # whether the current output line has content
+    empty = True  # whether the output has no content at all yet
+    tail = ""  # last two characters of the output
+    for i in dropped:
+        start, end = spans[i]
+        stop = end
+        while stop < length and text[stop] in " \t":
+            stop += 1
+        if stop == length or text[stop] == "\n":
+            # Last on its line: take the space before it rather than after.
+            while start > position and text[start - 1] in " \t":
+                start -= 1
+        kept = text[position:start]
+        newline = kept.rfind("\n")
+        if newline >= 0:
+            line_kept = bool(kept[newline + 1:].strip())
+        elif kept.strip():
+            line_kept = True
+        empty = empty and not line_kept and not kept.strip()
+        parts.append(kept)
+        tail = (tail + kept)[-2:]
+        if not line_kept and stop < length and text[stop] == "\n":
+            # The whole line went; drop its break, and any blank lines after
+            # it when the output already ends a paragraph.
+            stop += 1
+            if empty or tail == "\n\n":
+                while stop < length and text[stop] == "\n":
+                    stop += 1
+        position = stop
+    parts.append(text[position:])
+    return "".join(parts).strip()
@@ -3,15 +3,53 @@
 from __future__ import annotations
 
 import re
+from functools import partial
+from typing import Literal
+
+from token_optimizer.analyzers.lsh import MinHashLSH
+from token_optimizer.analyzers.stages import Stage
+
+DedupMode = Literal["exact", "lsh"]
+
+# Rolling-hash parameters for repeated-phrase detection.
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+class _SentenceIndex:
+    """Kept sentences plus the lookup structure used to find duplicates."""
+
+    def __init__(self, use_lsh: bool) -> None:
+        self.sentences: list[str] = []
+        self.word_sets: list[set[str]] = []
+        self.lsh = MinHashLSH() if use_lsh else None
 
 
 class RedundancyAnalyzer:
-    """Detects near-duplicate sentences and repeated phrases."""
+    """Detects near-duplicate sentences and repeated phrases.
+
+    With ``mode="exact"`` every sentence is compared against every kept
+    sentence, which is quadratic in the number of sentences.  With
+    ``mode="lsh"`` a MinHash/LSH index proposes candidate duplicates in
+    roughly linear time and only those are checked with exact Jaccard
+    similarity; pairs just above the threshold may occasionally be missed.
+    ``cross_paragraph=True`` deduplicates sentences across the whole text
+    instead of within each paragraph.
+    """
 
-    def __init__(self, similarity_threshold: float = 0.7) -> None:
+    def __init__(
+        self,
+        similarity_threshold: float = 0.7,
+        mode: DedupMode = "exact",
+        cross_paragraph: bool = False,
+    ) -> None:
         if not 0.0 < similarity_threshold <= 1.0:
             raise ValueError("similarity_threshold must be between 0 and 1")
+        if mode not in ("exact", "lsh"):
+            raise ValueError("mode must be 'exact' or 'lsh'")
         self.similarity_threshold = similarity_threshold
+        self.mode = mode
+        self.cross_paragraph = cross_paragraph
 
     @staticmethod
     def _tokenize(text: str) -> list[str]:
@@ -35,64 +73,157 @@ class RedundancyAnalyzer:
         sentences = re.split(r"(?<=[.!?])\s+", text)
         return [s.strip() for s in sentences if s.strip()]
 
-    def _deduplicate_sentences(self, sentences: list[str]) -> list[str]:
-        """Remove near-duplicate sentences, keeping the first (longer) one."""
-        kept: list[str] = []
-        kept_word_sets: list[set[str]] = []
+    def _deduplicate_sentences(
+        self, sentences: list[str], index: _SentenceIndex | None = None
+    ) -> list[int]:
+        """Remove near-duplicate sentences, keeping the first (longer) one.
+
+        Returns the positions of the surviving sentences in ``index``.  A
+        duplicate of a kept sentence replaces it in place when longer, so
+        callers must read the final text from ``index.sentences``.
+        """
+        if index is None:
+            index = _SentenceIndex(self.mode == "lsh")
+        kept: list[int] = []
 
         for sentence in sentences:
             word_set = set(self._tokenize(sentence))
-            is_duplicate = False
-            for i, existing_set in enumerate(kept_word_sets):
-                similarity = self._jaccard_similarity(word_set, existing_set)
+            signature: tuple[int, ...] = ()
+            if index.lsh is not None:
+                signature = index.lsh.signature(word_set)
+                candidates = index.lsh.query(signature)
+            else:
+                candidates = range(len(index.sentences))
+
+            duplicate_of = None
+            for i in candidates:
+                similarity = self._jaccard_similarity(word_set, index.word_sets[i])
                 if similarity > self.similarity_threshold:
-                    # Keep the longer sentence.
-                    if len(sentence) > len(kept[i]):
-                        kept[i] = sentence
-                        kept_word_sets[i] = word_set
-                    is_duplicate = True
+                    duplicate_of = i
                     break
-            if not is_duplicate:
-                kept.append(sentence)
-                kept_word_sets.append(word_set)
+
+            if duplicate_of is None:
+                duplicate_of = len(index.sentences)
+                index.sentences.append(sentence)
+                index.word_sets.append(word_set)
+                kept.append(duplicate_of)
+            elif len(sentence) > len(index.sentences[duplicate_of]):
+                # Keep the longer sentence.
+                index.sentences[duplicate_of] = sentence
+                index.word_sets[duplicate_of] = word_set
+            else:
+                continue
+
+            if index.lsh is not None:
+                index.lsh.add(duplicate_of, signature)
 
         return kept
 
     @staticmethod
-    def _get_ngrams(words: list[str], n: int) -> list[tuple[str, ...]]:
-        """Extract n-grams from a word list."""
-        return [tuple(words[i : i + n]) for i in range(len(words) - n + 1)]
+    def _repeated_windows(ids: list[int], n: int) -> bytearray | None:
+        """Mark every word covered by a repeat of an earlier n-word window.
+
+        Windows are compared through a polynomial rolling hash over the
+        interned word ids, so each call is a single linear scan with O(1)
+        work per window.  Hash hits are verified against the first
+        occurrence; genuine collisions fall back to an exact tuple key.
+
+        Returns:
+            A mask with 1 for each word to remove, or ``None`` if no window
+            repeats.
+        """
+        count = len(ids) - n + 1
+        if count < 2:
+            return None
+
+        top = pow(_HASH_BASE, n - 1, _HASH_MOD)
+        h = 0
+        for word_id in ids[:n]:
+            h = (h * _HASH_BASE + word_id) % _HASH_MOD
+
+        seen: dict[int, int] = {}
+        collisions: dict[tuple[int, ...], int] = {}
+        mask: bytearray | None = None
+        ones = b"\x01" * n
+
+        for i in range(count):
+            if i:
+                h = ((h - ids[i - 1] * top) * _HASH_BASE + ids[i + n - 1]) % _HASH_MOD
+            first = seen.get(h)
+            if first is None:
+                seen[h] = i
+                continue
+            if ids[first : first + n] != ids[i : i + n]:
+                key = tuple(ids[i : i + n])
+                if key not in collisions:
+                    collisions[key] = i
+                    continue
+            if mask is None:
+                mask = bytearray(len(ids))
+            mask[i : i + n] = ones
+
+        return mask
 
     def _deduplicate_phrases(self, text: str) -> str:
-        """Find 3+ word n-grams that repeat and remove duplicate occurrences."""
+        """Find 3+ word n-grams that repeat and remove duplicate occurrences.
+
+        Longer repeats are removed first, from 10 words down to 3, each
+        size scanning the words left by the previous one.
+        """
         words = text.split()
         if len(words) < 6:
             return text
 
+        # Intern lowercased words once; ids start at 1 so no word hashes
+        # to zero.
+        vocabulary: dict[str, int] = {}
+        ids = [vocabulary.setdefault(w.lower(), len(vocabulary) + 1) for w in words]
+
         # Check n-gram sizes from 3 up to half the text length.
         max_n = min(len(words) // 2, 10)
         for n in range(max_n, 2, -1):
-            ngrams = self._get_ngrams(words, n)
-            seen: dict[tuple[str, ...], int] = {}
-            indices_to_remove: set[int] = set()
-
-            for i, ngram in enumerate(ngrams):
-                key = tuple(w.lower() for w in ngram)
-                if key in seen:
-                    # Mark duplicate occurrence indices for removal.
-                    for j in range(n):
-                        indices_to_remove.add(i + j)
-                else:
-                    seen[key] = i
-
-            if indices_to_remove:
-                words = [
-                    w for idx, w in enumerate(words)
-                    if idx not in indices_to_remove
-                ]
+            mask = self._repeated_windows(ids, n)
+            if mask is not None:
+                keep = [idx for idx, removed in enumerate(mask) if not removed]
+                words = [words[idx] for idx in keep]
+                ids = [ids[idx] for idx in keep]
 
         return " ".join(words)
 
+    def _deduplicate_paragraph(self, paragraph: str) -> str:
+        """Deduplicate one paragraph on its own (``cross_paragraph=False``)."""
+        if not paragraph.strip():
+            return re.sub(r"  +", " ", paragraph)
+        sentences = self._split_sentences(paragraph)
+        if len(sentences) > 1:
+            index = _SentenceIndex(self.mode == "lsh")
+            kept = self._deduplicate_sentences(sentences, index)
+            paragraph = " ".join(index.sentences[i] for i in kept)
+        else:
+            paragraph = " ".join(sentences)
+        if paragraph.strip():
+            paragraph = self._deduplicate_phrases(paragraph)
+        return re.sub(r"  +", " ", paragraph)
+
+    def stages(self, preserve_keywords: list[str] | None = None) -> list[Stage]:
+        """Return the analyzer's steps, keyed by its settings.
+
+        Without ``cross_paragraph`` each paragraph is deduplicated on its
+        own, so that step is a per-line stage.
+        """
+        key = f"redundancy:{self.mode}:{self.similarity_threshold}"
+        if self.cross_paragraph:
+            return [
+                Stage(
+                    f"{key}:cross",
+                    partial(self.analyze, preserve_keywords=preserve_keywords),
+                )
+            ]
+        return [
+            Stage(key, self._deduplicate_paragraph, per_line=True),
+            Stage("redundancy.strip", str.strip),
+        ]
+
     def analyze(
         self, text: str, preserve_keywords: list[str] | None = None
     ) -> str:
@@ -111,22 +242,36 @@ class RedundancyAnalyzer:
 
         # Split into paragraphs to preserve structure.
         paragraphs = text.split("\n")
-        result_paragraphs: list[str] = []
+        if not self.cross_paragraph:
+            return "\n".join(map(self._deduplicate_paragraph, paragraphs)).strip()
+
+        # Sentences are resolved through the shared index after all
+        # paragraphs are processed, since a later duplicate may replace an
+        # earlier, shorter sentence.
+        shared = _SentenceIndex(self.mode == "lsh")
+        deduplicated: list[tuple[_SentenceIndex, list[int]] | str] = []
 
         for paragraph in paragraphs:
             if not paragraph.strip():
-                result_paragraphs.append(paragraph)
+                deduplicated.append(paragraph)
                 continue
 
-            # Deduplicate sentences within each paragraph.
+            # Deduplicate sentences across all paragraphs.
             sentences = self._split_sentences(paragraph)
-            if len(sentences) > 1:
-                sentences = self._deduplicate_sentences(sentences)
-            paragraph = " ".join(sentences)
-
-            # Deduplicate repeated phrases.
-            paragraph = self._deduplicate_phrases(paragraph)
+            deduplicated.append(
+                (shared, self._deduplicate_sentences(sentences, shared))
+            )
 
+        result_paragraphs: list[str] = []
+        for entry in deduplicated:
+            if isinstance(entry, str):
+                paragraph = entry
+            else:
+                index, kept = entry
+                paragraph = " ".join(index.sentences[i] for i in kept)
+            if paragraph.strip():
+                # Deduplicate repeated phrases.
+                paragraph = self._deduplicate_phrases(paragraph)
             result_paragraphs.append(paragraph)
 
         result = "\n".join(result_paragraphs)
@@ -0,0 +1,109 @@
+"""Analyzer pipelines as memoizable stages."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+if TYPE_CHECKING:
+    from token_optimizer.metrics.profiling import Profiler
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One text-to-text step of an analyzer.
+
+    ``key`` names the transformation and every setting that changes its
+    output (for example ``"filler.scan:words"``), so two stages with the
+    same key give the same output for the same input.  A ``per_line``
+    stage maps each newline-separated line independently, so its output is
+    the lines' outputs joined with newlines; a memo can then reuse work for
+    single lines that recur within a text or across candidates.
+    """
+
+    key: str
+    run: Callable[[str], str]
+    per_line: bool = False
+
+
+def analyzer_stages(
+    analyzer: Any, preserve_keywords: list[str] | None = None
+) -> list[Stage]:
+    """Return ``analyzer``'s stages, or one opaque stage wrapping ``analyze``.
+
+    Analyzers without a ``stages`` method (such as user-supplied ones) are
+    keyed by identity, so their output is only reused for the same instance.
+    """
+    stages = getattr(analyzer, "stages", None)
+    if stages is not None:
+        return stages(preserve_keywords)
+    return [
+        Stage(
+            f"{type(analyzer).__qualname__}@{id(analyzer):x}",
+            partial(analyzer.analyze, preserve_keywords=preserve_keywords),
+        )
+    ]
+
+
+class StageMemo:
+    """Stage outputs keyed by (stage key, input text), for one optimization.
+
+    Strategies evaluated on the same text share every stage whose key and
+    input match: the structural whitespace pass, a filler scan common to
+    two aggressiveness levels, and everything downstream of the point
+    where their intermediate texts coincide.  The input text itself is the
+    fingerprint; Python caches a string's hash, so each intermediate text
+    is hashed once.
+
+    A memo assumes one set of preserved keywords; use a new memo per
+    optimization call.  With a ``profiler``, each stage run is recorded
+    (memo hits included, which is where reuse shows up as saved time).
+    """
+
+    def __init__(self, profiler: Profiler | None = None) -> None:
+        self._outputs: dict[tuple[str, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.profiler = profiler
+
+    def run(self, stages: Iterable[Stage], text: str) -> str:
+        """Run ``stages`` in order on ``text``, reusing memoized outputs."""
+        if self.profiler is not None:
+            return self._run_profiled(self.profiler, stages, text)
+        return self._run(stages, text)
+
+    def _run_profiled(
+        self, profiler: Profiler, stages: Iterable[Stage], text: str
+    ) -> str:
+        for stage in stages:
+            if not text:
+                return text
+            start = perf_counter()
+            output = self._run((stage,), text)
+            profiler.record("stage", stage.key, start, (text,), (output,))
+            text = output
+        return text
+
+    def _run(self, stages: Iterable[Stage], text: str) -> str:
+        for stage in stages:
+            if not text:
+                return text
+            if stage.per_line and "\n" in text:
+                text = "\n".join(
+                    [self._lookup(stage, line) for line in text.split("\n")]
+                )
+            else:
+                text = self._lookup(stage, text)
+        return text
+
+    def _lookup(self, stage: Stage, text: str) -> str:
+        key = (stage.key, text)
+        output = self._outputs.get(key)
+        if output is None:
+            output = self._outputs[key] = stage.run(text)
+            self.misses += 1
+        else:
+            self.hits += 1
+        return output
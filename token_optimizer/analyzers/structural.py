@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import re
 
+from token_optimizer.analyzers.stages import Stage
+
 
 class StructuralAnalyzer:
     """Normalizes whitespace, collapses blank lines, and optionally
@@ -89,6 +91,24 @@ class StructuralAnalyzer:
 
         return text
 
+    @classmethod
+    def _finish(cls, text: str) -> str:
+        """Final whitespace cleanup after transformations."""
+        return cls._normalize_whitespace(text).strip()
+
+    def stages(self, preserve_keywords: list[str] | None = None) -> list[Stage]:
+        """Return the analyzer's steps for the configured aggressiveness."""
+        # Level 1+: whitespace normalization.
+        stages = [Stage("structural.whitespace", self._normalize_whitespace)]
+        # Level 2+: compress markdown formatting.
+        if self.aggressiveness >= 2:
+            stages.append(Stage("structural.markdown", self._compress_markdown))
+        # Level 3: strip all markdown formatting.
+        if self.aggressiveness >= 3:
+            stages.append(Stage("structural.strip_markdown", self._strip_markdown))
+        stages.append(Stage("structural.finish", self._finish))
+        return stages
+
     def analyze(
         self, text: str, preserve_keywords: list[str] | None = None
     ) -> str:
@@ -105,19 +125,6 @@ class StructuralAnalyzer:
             return text
 
         result = text
-
-        # Level 1+: whitespace normalization.
-        result = self._normalize_whitespace(result)
-
-        # Level 2+: compress markdown formatting.
-        if self.aggressiveness >= 2:
-            result = self._compress_markdown(result)
-
-        # Level 3: strip all markdown formatting.
-        if self.aggressiveness >= 3:
-            result = self._strip_markdown(result)
-
-        # Final whitespace cleanup after transformations.
-        result = self._normalize_whitespace(result)
-
-        return result.strip()
+        for stage in self.stages(preserve_keywords):
+            result = stage.run(result)
+        return result
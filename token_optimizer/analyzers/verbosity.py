@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import re
+from functools import partial
+
+from token_optimizer.analyzers.matcher import compile_phrases, filter_preserved
+from token_optimizer.analyzers.stages import Stage
 
 
 class VerbosityAnalyzer:
@@ -65,79 +69,106 @@ class VerbosityAnalyzer:
         self.aggressiveness = aggressiveness
 
     @staticmethod
-    def _apply_rule(
+    def _apply_rules(
         text: str,
-        pattern_str: str,
-        replacement: str,
+        rules: list[tuple[str, str]],
         preserve: set[str],
     ) -> str:
-        """Apply a single rewrite rule case-insensitively."""
-        if preserve:
-            pattern_words = pattern_str.lower().split()
-            if any(w in preserve for w in pattern_words):
-                return text
-
-        pattern = re.compile(re.escape(pattern_str), re.IGNORECASE)
+        """Apply a set of rewrite rules in one case-insensitive scan."""
+        replacements = {pattern.lower(): repl for pattern, repl in rules}
+        pattern = compile_phrases(
+            filter_preserved([p for p, _ in rules], preserve)
+        )
+        if pattern is None:
+            return text
 
         def _replacer(match: re.Match[str]) -> str:
             # Preserve capitalisation of the first character when replacing
             # with a non-empty string.
+            matched = match.group(0)
+            replacement = replacements.get(matched.lower())
+            if replacement is None:
+                # Case-insensitive matching also accepts Unicode variants
+                # such as "ſ" for "s", which lowercasing does not undo.
+                replacement = next(
+                    repl
+                    for phrase, repl in rules
+                    if re.fullmatch(re.escape(phrase), matched, re.IGNORECASE)
+                )
             if not replacement:
                 return ""
-            matched = match.group(0)
             if matched[0].isupper():
                 return replacement[0].upper() + replacement[1:]
             return replacement
 
         return pattern.sub(_replacer, text)
 
-    def analyze(
-        self, text: str, preserve_keywords: list[str] | None = None
-    ) -> str:
-        """Reduce verbosity in text by rewriting wordy phrases.
-
-        Args:
-            text: The input text to optimize.
-            preserve_keywords: Words that should never be removed.
-
-        Returns:
-            The optimized text with verbose phrases rewritten.
-        """
-        if not text:
-            return text
-
+    def stages(self, preserve_keywords: list[str] | None = None) -> list[Stage]:
+        """Return the analyzer's steps for the configured aggressiveness."""
         preserved: set[str] = set()
         if preserve_keywords:
             preserved = {kw.lower() for kw in preserve_keywords}
 
-        result = text
-
         # Level 1+: apply rewrite rules.
-        for pattern_str, replacement in self.REWRITE_RULES:
-            result = self._apply_rule(result, pattern_str, replacement, preserved)
+        stages = [
+            Stage(
+                "verbosity.rules",
+                partial(self._apply_rules, rules=self.REWRITE_RULES, preserve=preserved),
+            )
+        ]
 
         # Level 2+: prune articles after instruction verbs.
         if self.aggressiveness >= 2:
-            for verb in self._INSTRUCTION_VERBS:
-                if verb in preserved:
-                    continue
+            verbs = tuple(v for v in self._INSTRUCTION_VERBS if v not in preserved)
+            if verbs:
                 # Match: verb + article + word, replace article.
                 pattern = re.compile(
-                    r"(\b" + re.escape(verb) + r"\b)\s+\b(a|an|the)\b",
+                    r"(\b(?:" + "|".join(map(re.escape, verbs)) + r")\b)"
+                    r"\s+\b(a|an|the)\b",
                     re.IGNORECASE,
                 )
-                result = pattern.sub(r"\1", result)
+                stages.append(
+                    Stage("verbosity.articles", partial(pattern.sub, r"\1"))
+                )
 
         # Level 3+: pronoun compression.
         if self.aggressiveness >= 3:
-            for pattern_str, replacement in self._PRONOUN_RULES:
-                result = self._apply_rule(
-                    result, pattern_str, replacement, preserved
+            stages.append(
+                Stage(
+                    "verbosity.pronouns",
+                    partial(
+                        self._apply_rules, rules=self._PRONOUN_RULES, preserve=preserved
+                    ),
                 )
+            )
+
+        stages.append(Stage("verbosity.cleanup", _cleanup))
+        return stages
+
+    def analyze(
+        self, text: str, preserve_keywords: list[str] | None = None
+    ) -> str:
+        """Reduce verbosity in text by rewriting wordy phrases.
+
+        Args:
+            text: The input text to optimize.
+            preserve_keywords: Words that should never be removed.
+
+        Returns:
+            The optimized text with verbose phrases rewritten.
+        """
+        if not text:
+            return text
+
+        result = text
+        for stage in self.stages(preserve_keywords):
+            result = stage.run(result)
+        return result
 
-        # Clean up extra whitespace.
-        result = re.sub(r"  +", " ", result)
-        result = re.sub(r" ([.,;:!?])", r"\1", result)
-        result = re.sub(r"^\s+", "", result, flags=re.MULTILINE)
 
-        return result.strip()
+def _cleanup(text: str) -> str:
+    """Clean up extra whitespace left behind by rewrites."""
+    text = re.sub(r"  +", " ", text)
+    text = re.sub(r" ([.,;:!?])", r"\1", text)
+    text = re.sub(r"^\s+", "", text, flags=re.MULTILINE)
+    return text.strip()
@@ -0,0 +1,180 @@
+"""Asyncio front end for the optimizer with micro-batching."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from token_optimizer.config import OptimizationResult
+from token_optimizer.engine import TokenOptimizer
+
+# (prompt, system_prompt, preserve_keywords, future)
+_Request = tuple[
+    str, "str | None", "list[str] | None", "asyncio.Future[OptimizationResult]"
+]
+
+
+class AsyncTokenOptimizer:
+    """Runs optimizations off the event loop in small batches.
+
+    Requests are queued on a bounded queue; a dispatcher task collects up to
+    ``max_batch_size`` of them (waiting at most ``max_batch_delay`` seconds
+    for a batch to fill) and hands each batch to a bounded thread pool.
+    When all workers are busy the queue fills up and ``optimize`` waits for
+    space, so load is pushed back to callers instead of piling up.
+
+    Usage:
+        async with AsyncTokenOptimizer(model="gpt-4o") as optimizer:
+            result = await optimizer.optimize("Your verbose prompt here...")
+
+    The wrapped optimizer (including its cache) is safe to share between
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        optimizer: TokenOptimizer | None = None,
+        *,
+        max_workers: int = 2,
+        max_batch_size: int = 16,
+        max_batch_delay: float = 0.002,
+        max_queue_size: int = 256,
+        **optimizer_kwargs: Any,
+    ) -> None:
+        if max_workers < 1 or max_batch_size < 1 or max_queue_size < 1:
+            raise ValueError(
+                "max_workers, max_batch_size and max_queue_size must be at least 1"
+            )
+        if optimizer is not None and optimizer_kwargs:
+            raise ValueError("pass either an optimizer or optimizer options, not both")
+        self.optimizer = optimizer or TokenOptimizer(**optimizer_kwargs)
+        self._max_workers = max_workers
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        self._max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="token-optimizer"
+        )
+        self._queue: asyncio.Queue[_Request | None] | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._in_flight: set[asyncio.Future[Any]] = set()
+        self._closed = False
+
+    async def __aenter__(self) -> AsyncTokenOptimizer:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def optimize(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        preserve_keywords: list[str] | None = None,
+    ) -> OptimizationResult:
+        """Optimize a prompt without blocking the event loop.
+
+        Args:
+            prompt: The user prompt to optimize.
+            system_prompt: Optional system prompt to also optimize.
+            preserve_keywords: Additional keywords to preserve.
+
+        Returns:
+            OptimizationResult with original/optimized text and metrics.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncTokenOptimizer is closed")
+        queue = self._start()
+        future: asyncio.Future[OptimizationResult] = (
+            asyncio.get_running_loop().create_future()
+        )
+        await queue.put((prompt, system_prompt, preserve_keywords, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Finish queued requests, then stop the dispatcher and executor."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._dispatcher is not None and self._queue is not None:
+            await self._queue.put(None)
+            await self._dispatcher
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    def _start(self) -> asyncio.Queue[_Request | None]:
+        """Create the queue and dispatcher on first use in the running loop."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            self._slots = asyncio.Semaphore(self._max_workers)
+            loop = asyncio.get_running_loop()
+            self._dispatcher = loop.create_task(self._dispatch())
+        return self._queue
+
+    async def _dispatch(self) -> None:
+        """Collect queued requests into batches and submit them."""
+        assert self._queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            queued = self._queue.qsize()
+            if self._max_batch_delay > 0 and queued < self._max_batch_size:
+                await asyncio.sleep(self._max_batch_delay)
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._slots.acquire()
+            task = loop.run_in_executor(self._executor, self._run_batch, batch)
+            self._in_flight.add(task)
+            task.add_done_callback(partial(self._finish, batch=batch))
+
+    def _run_batch(
+        self, batch: list[_Request]
+    ) -> list[OptimizationResult | BaseException]:
+        """Optimize a batch in a worker thread, capturing per-item errors."""
+        outcomes: list[OptimizationResult | BaseException] = []
+        for prompt, system_prompt, preserve_keywords, future in batch:
+            if future.cancelled():
+                outcomes.append(asyncio.CancelledError())
+                continue
+            try:
+                outcomes.append(
+                    self.optimizer.optimize(
+                        prompt,
+                        system_prompt=system_prompt,
+                        preserve_keywords=preserve_keywords,
+                    )
+                )
+            except Exception as exc:  # delivered to the awaiting caller
+                outcomes.append(exc)
+        return outcomes
+
+    def _finish(self, done: asyncio.Future[Any], batch: list[_Request]) -> None:
+        """Resolve the callers' futures once a batch completes."""
+        assert self._slots is not None
+        self._in_flight.discard(done)
+        self._slots.release()
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        outcomes = [error] * len(batch) if error is not None else done.result()
+        for (_, _, _, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -0,0 +1,46 @@
+"""Benchmark suite: synthetic corpora, timed runs and baseline comparison."""
+
+from typing import TYPE_CHECKING
+
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.bench.corpus import CORPORA, CorpusSpec, generate_corpus
+    from token_optimizer.bench.report import regenerate_document
+    from token_optimizer.bench.runner import (
+        TARGETS,
+        BenchReport,
+        BenchResult,
+        Regression,
+        compare,
+        run_benchmarks,
+    )
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "CorpusSpec": "token_optimizer.bench.corpus",
+        "CORPORA": "token_optimizer.bench.corpus",
+        "generate_corpus": "token_optimizer.bench.corpus",
+        "TARGETS": "token_optimizer.bench.runner",
+        "BenchReport": "token_optimizer.bench.runner",
+        "BenchResult": "token_optimizer.bench.runner",
+        "Regression": "token_optimizer.bench.runner",
+        "compare": "token_optimizer.bench.runner",
+        "run_benchmarks": "token_optimizer.bench.runner",
+        "regenerate_document": "token_optimizer.bench.report",
+    },
+)
+
+__all__ = [
+    "CorpusSpec",
+    "CORPORA",
+    "generate_corpus",
+    "TARGETS",
+    "BenchReport",
+    "BenchResult",
+    "Regression",
+    "compare",
+    "run_benchmarks",
+    "regenerate_document",
+]
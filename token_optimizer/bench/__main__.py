@@ -0,0 +1,7 @@
+"""Run the benchmark suite with ``python -m token_optimizer.bench``."""
+
+from token_optimizer.cli import bench_main
+
+# Guarded: isolated runs spawn workers, which re-import the main module.
+if __name__ == "__main__":
+    bench_main()
@@ -0,0 +1,181 @@
+"""Reproducible synthetic corpora, from short chat prompts to large documents."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass
+
+_NOUNS = [
+    "cache", "parser", "schema", "session", "invoice", "report", "queue",
+    "request", "customer", "order", "payment", "token", "index", "client",
+    "server", "migration", "dashboard", "webhook", "scheduler", "template",
+]
+_VERBS = [
+    "validate", "store", "summarize", "retry", "log", "archive", "render",
+    "export", "compare", "rebuild", "notify", "review",
+]
+_ADJECTIVES = [
+    "stale", "nightly", "primary", "pending", "large", "legacy", "shared",
+    "optional", "monthly", "failed",
+]
+_TEMPLATES = [
+    "The {a} {n} must {v} every {m} before it is sent to the {o} team.",
+    "Write a function that can {v} the {a} {n} records for each {m}.",
+    "Log each {n} error together with the {m} and the {o} identifier.",
+    "Return a short summary of the {a} {n} warnings from the last {m} run.",
+    "Old {n} entries are moved to the {a} {m} archive after the {o} job.",
+    "Explain why the {n} service stopped to {v} {a} {m} updates.",
+    "Make sure that the {m} handler does not {v} the {a} {n} twice.",
+    "List the {a} {n} fields that the {o} report still depends on.",
+]
+# Phrases the filler and verbosity analyzers target.
+_FILLER_OPENERS = [
+    "Could you please", "I would like you to", "It would be great if you could",
+    "Basically,", "It is important to note that", "In order to be clear,",
+    "As a matter of fact,", "I was wondering if you could", "Honestly,",
+]
+_FILLER_WORDS = ["really", "very", "basically", "actually", "just", "quite"]
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Parameters of a generated corpus.
+
+    Attributes:
+        name: Name used in results.
+        prompts: Number of texts.
+        chars: Approximate length of each text, in characters.
+        filler: Fraction of sentences padded with filler words or phrases.
+        redundancy: Fraction of sentences repeating an earlier sentence of
+            their paragraph, exactly or with one word changed.
+        markdown: Fraction of blocks that are markdown (lists, tables, code)
+            rather than prose paragraphs.
+        seed: Seed; the same spec always generates the same corpus.
+    """
+
+    name: str
+    prompts: int
+    chars: int
+    filler: float = 0.3
+    redundancy: float = 0.1
+    markdown: float = 0.2
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.prompts < 1 or self.chars < 1:
+            raise ValueError("prompts and chars must be positive")
+        for knob in (self.filler, self.redundancy, self.markdown):
+            if not 0.0 <= knob <= 1.0:
+                raise ValueError("filler, redundancy and markdown must be in [0, 1]")
+
+
+# The standard corpora run by ``token-optimizer-bench``.
+CORPORA = {
+    spec.name: spec
+    for spec in (
+        CorpusSpec("chat", prompts=1000, chars=300, filler=0.5, markdown=0.0),
+        CorpusSpec("system-prompt", prompts=100, chars=5_000, markdown=0.3),
+        CorpusSpec("document-1mb", prompts=1, chars=1_000_000),
+        CorpusSpec("document-10mb", prompts=1, chars=10_000_000),
+    )
+}
+
+
+def generate_corpus(spec: CorpusSpec) -> list[str]:
+    """Generate the texts of ``spec``; identical for identical specs."""
+    return [
+        _text(random.Random(spec.seed * 1_000_003 + index), spec)
+        for index in range(spec.prompts)
+    ]
+
+
+def corpus_digest(texts: list[str]) -> str:
+    """Short content hash, to tell whether two runs used the same corpus."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _text(rng: random.Random, spec: CorpusSpec) -> str:
+    blocks: list[str] = []
+    size = 0
+    while size < spec.chars:
+        if rng.random() < spec.markdown:
+            block = _markdown_block(rng)
+        else:
+            block = _paragraph(rng, spec, spec.chars - size)
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def _paragraph(rng: random.Random, spec: CorpusSpec, remaining: int) -> str:
+    sentences: list[str] = []
+    size = 0
+    for _ in range(rng.randint(3, 6)):
+        if sentences and rng.random() < spec.redundancy:
+            sentence = rng.choice(sentences)
+            if rng.random() < 0.5:
+                words = sentence.split()
+                i = rng.randrange(1, len(words) - 1)
+                words[i] = rng.choice(_NOUNS)
+                sentence = " ".join(words)
+        else:
+            sentence = _sentence(rng, spec.filler)
+        sentences.append(sentence)
+        size += len(sentence) + 1
+        if size >= remaining:
+            break
+    return " ".join(sentences)
+
+
+def _sentence(rng: random.Random, filler: float) -> str:
+    sentence = rng.choice(_TEMPLATES).format(
+        a=rng.choice(_ADJECTIVES),
+        n=rng.choice(_NOUNS),
+        v=rng.choice(_VERBS),
+        m=rng.choice(_NOUNS),
+        o=f"{rng.choice(_NOUNS)}{rng.randrange(100)}",
+    )
+    if rng.random() < filler:
+        if rng.random() < 0.5:
+            opener = rng.choice(_FILLER_OPENERS)
+            sentence = f"{opener} {sentence[0].lower()}{sentence[1:]}"
+        else:
+            words = sentence.split()
+            words.insert(rng.randrange(1, len(words)), rng.choice(_FILLER_WORDS))
+            sentence = " ".join(words)
+    return sentence
+
+
+def _markdown_block(rng: random.Random) -> str:
+    kind = rng.randrange(4)
+    noun = rng.choice(_NOUNS)
+    if kind == 0:
+        items = [f"- {_sentence(rng, 0.2)}" for _ in range(rng.randint(3, 5))]
+        return "\n".join([f"## {noun.title()} {rng.choice(_VERBS)}", "", *items])
+    if kind == 1:
+        items = [
+            f"{i}. {rng.choice(_VERBS).title()} the {rng.choice(_ADJECTIVES)} {noun}."
+            for i in range(1, rng.randint(3, 6))
+        ]
+        return "\n".join(items)
+    if kind == 2:
+        verb = rng.choice(_VERBS)
+        return "\n".join([
+            "```python",
+            f"def {verb}_{noun}({noun}, retries=3):",
+            "    for attempt in range(retries):",
+            f"        if {noun}.{verb}():",
+            f"            return {noun}",
+            f"    raise RuntimeError('could not {verb} {noun}')",
+            "```",
+        ])
+    rows = [
+        f"| {rng.choice(_NOUNS)} | {rng.choice(_ADJECTIVES)} | {rng.randrange(1000)} |"
+        for _ in range(rng.randint(2, 4))
+    ]
+    return "\n".join([f"| {noun} | state | count |", "|---|---|---|", *rows])
@@ -0,0 +1,211 @@
+"""Regenerate the generated sections of the example results document.
+
+Generated sections sit between ``<!-- bench:NAME -->`` and
+``<!-- /bench:NAME -->`` markers; everything outside them (hand-written
+analysis, live A/B results) is left untouched.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+from token_optimizer.bench.runner import BenchReport
+
+_STRATEGIES = ("conservative", "moderate", "aggressive")
+
+
+class ExamplePrompt(NamedTuple):
+    title: str
+    short_title: str
+    text: str
+
+
+EXAMPLE_PROMPTS = [
+    ExamplePrompt(
+        "AI History Summary Request",
+        "AI History Summary",
+        "Please, could you kindly help me write a summary of the following text? "
+        "I would really appreciate it if you could make it concise and to the "
+        "point. The text is about the history of artificial intelligence, which "
+        "is basically a field of computer science that focuses on creating "
+        "intelligent machines that can think and learn like humans. Artificial "
+        "intelligence has been around for quite a long time, actually since the "
+        "1950s, when researchers first began exploring the idea of machine "
+        "intelligence. Over the years, AI has evolved significantly, going "
+        "through various stages of development. In the early days, AI research "
+        "focused on symbolic reasoning and problem-solving. Then, in the 1980s "
+        "and 1990s, machine learning became more prominent. More recently, deep "
+        "learning has revolutionized the field, enabling breakthroughs in areas "
+        "like natural language processing, computer vision, and robotics.",
+    ),
+    ExamplePrompt(
+        "Translation Task",
+        "Translation Task",
+        "I want you to act as a professional translator. I would really "
+        "appreciate it if you could please translate the following paragraph "
+        "from English to a more formal and professional tone. Please make sure "
+        "to keep the original meaning intact. Please do not add any additional "
+        "information. Here is the text: Our team has been working very hard on "
+        "this project for the past few months. We have made significant "
+        "progress and we are very excited about the results. We believe that "
+        "this project will have a major impact on the industry.",
+    ),
+    ExamplePrompt(
+        "Cooking Assistant System Prompt",
+        "Cooking Assistant",
+        "You are a helpful assistant that helps people with cooking. You should "
+        "always be polite and friendly. You should provide detailed "
+        "step-by-step instructions. You should also mention any potential "
+        "allergens. You should suggest substitutions for common ingredients "
+        "when possible. Now, please tell me how to make a simple pasta dish "
+        "with tomato sauce. I would like it to be vegetarian. Please include "
+        "the list of ingredients and the cooking time.",
+    ),
+]
+
+
+def _optimized() -> list[dict[str, str]]:
+    """Each example prompt's output under each strategy."""
+    from token_optimizer.engine import TokenOptimizer
+
+    optimizers = {
+        name: TokenOptimizer(strategy=name, cache_enabled=False)
+        for name in _STRATEGIES
+    }
+    return [
+        {
+            name: optimizer.optimize(prompt.text).optimized_text
+            for name, optimizer in optimizers.items()
+        }
+        for prompt in EXAMPLE_PROMPTS
+    ]
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def _saved(original: str, optimized: str) -> int:
+    """Percentage of words removed."""
+    return round(100 * (1 - _words(optimized) / _words(original)))
+
+
+def render_examples(outputs: list[dict[str, str]] | None = None) -> str:
+    """Markdown for every example prompt and its output per strategy."""
+    outputs = _optimized() if outputs is None else outputs
+    blocks = []
+    for number, (prompt, optimized) in enumerate(
+        zip(EXAMPLE_PROMPTS, outputs), start=1
+    ):
+        lines = [
+            f"## Prompt {number}: {prompt.title}",
+            "",
+            f"### Original ({_words(prompt.text)} words)",
+            "",
+            f"> {prompt.text}",
+        ]
+        for name in _STRATEGIES:
+            text = optimized[name]
+            lines += [
+                "",
+                f"### {name.title()} ({_words(text)} words, "
+                f"{_saved(prompt.text, text)}% saved)",
+                "",
+                f"> {text}",
+            ]
+        blocks.append("\n".join(lines))
+    return "\n\n---\n\n".join(blocks)
+
+
+def render_savings(outputs: list[dict[str, str]] | None = None) -> str:
+    """Markdown table of words saved per example prompt and strategy."""
+    outputs = _optimized() if outputs is None else outputs
+    lines = [
+        "| Prompt | Original | Conservative | Moderate | Aggressive |",
+        "|--------|----------|--------------|----------|------------|",
+    ]
+    for prompt, optimized in zip(EXAMPLE_PROMPTS, outputs):
+        cells = []
+        for name in _STRATEGIES:
+            saved = _saved(prompt.text, optimized[name])
+            change = f"-{saved}%" if saved else "0%"
+            cells.append(f"{_words(optimized[name])} words ({change})")
+        lines.append(
+            f"| {prompt.short_title} | {_words(prompt.text)} words | "
+            + " | ".join(cells)
+            + " |"
+        )
+    return "\n".join(lines)
+
+
+def render_performance(report: BenchReport) -> str:
+    """Markdown tables of a benchmark run, one per corpus."""
+    env = report.environment
+    lines = [
+        f"Measured with `token-optimizer-bench` on {env.get('implementation', '')} "
+        f"{env.get('python', '')} ({env.get('platform', '')} "
+        f"{env.get('machine', '')}); tiktoken: "
+        f"{env.get('tiktoken', '?')}, numpy: {env.get('numpy', '?')}. Latency is "
+        "per prompt; peak memory is the growth of peak resident memory while "
+        "the target ran.",
+    ]
+    for corpus, spec in report.corpora.items():
+        results = [r for r in report.results if r.corpus == corpus]
+        if not results:
+            continue
+        lines += [
+            "",
+            f"#### {corpus}: {spec['prompts']:,} × ~{spec['chars']:,} characters "
+            f"(filler {spec['filler']}, redundancy {spec['redundancy']}, "
+            f"markdown {spec['markdown']})",
+            "",
+            "| Target | Kind | MB/s | Prompts/s | p50 ms | p99 ms | Peak MiB "
+            "| Removed |",
+            "|--------|------|-----:|----------:|-------:|-------:|---------:"
+            "|--------:|",
+        ]
+        for r in results:
+            peak = "–" if r.peak_mib is None else f"{r.peak_mib:.1f}"
+            lines.append(
+                f"| {r.target} | {r.kind} | {r.mb_per_s:.2f} | "
+                f"{r.prompts_per_s:,.1f} | {r.p50_ms:.3f} | {r.p99_ms:.3f} | "
+                f"{peak} | {r.reduction:.1%} |"
+            )
+    return "\n".join(lines)
+
+
+def update_document(document: str, sections: dict[str, str]) -> str:
+    """Replace the body of each named generated section in ``document``.
+
+    Raises:
+        ValueError: If a section's markers are missing.
+    """
+    for name, body in sections.items():
+        marker = re.escape(name)
+        pattern = re.compile(
+            rf"(<!-- bench:{marker} -->\n).*?(<!-- /bench:{marker} -->)", re.DOTALL
+        )
+        document, found = pattern.subn(
+            lambda match: f"{match.group(1)}{body}\n{match.group(2)}", document
+        )
+        if not found:
+            raise ValueError(f"no generated section {name!r} in the document")
+    return document
+
+
+def regenerate_document(path: str, report: BenchReport) -> None:
+    """Rewrite the generated sections of the results document at ``path``."""
+    outputs = _optimized()
+    with open(path, encoding="utf-8") as handle:
+        document = handle.read()
+    document = update_document(
+        document,
+        {
+            "examples": render_examples(outputs),
+            "savings": render_savings(outputs),
+            "performance": render_performance(report),
+        },
+    )
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(document)
@@ -0,0 +1,390 @@
+"""Run analyzers and strategies over corpora; compare results to a baseline."""
+
+from __future__ import annotations
+
+import gc
+import json
+import math
+import platform
+import sys
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from importlib.util import find_spec
+from time import perf_counter
+from typing import Callable, Iterable, Literal
+
+from token_optimizer.bench.corpus import (
+    CORPORA,
+    CorpusSpec,
+    corpus_digest,
+    generate_corpus,
+)
+
+TargetKind = Literal["analyzer", "strategy"]
+
+# Run before measuring, so one-time costs (pattern compilation, tokenizer
+# loading) stay out of the results.
+_WARMUP = "Hi, could you please basically write a function in order to sort a list."
+
+
+@dataclass(frozen=True)
+class BenchTarget:
+    """A benchmarked callable: an analyzer or a full optimizer strategy.
+
+    Attributes:
+        name: Name used in results.
+        kind: ``"analyzer"`` for a single analyzer's ``analyze``,
+            ``"strategy"`` for ``TokenOptimizer.optimize`` (similarity guard
+            and token counting included, cache off).
+        build: Returns the text-to-text callable to time.
+    """
+
+    name: str
+    kind: TargetKind
+    build: Callable[[], Callable[[str], str]]
+
+
+def _analyzer(module: str, cls: str, **kwargs: object) -> Callable[[str], str]:
+    from importlib import import_module
+
+    return getattr(import_module(module), cls)(**kwargs).analyze
+
+
+def _pruner() -> Callable[[str], str]:
+    from token_optimizer.analyzers.pruning import SentencePruner
+    from token_optimizer.tokenizers.generic import GenericTokenizer
+
+    count = GenericTokenizer().count_tokens_batch
+    return lambda text: SentencePruner(count([text])[0] // 2, count).analyze(text)
+
+
+def _strategy(name: str) -> Callable[[str], str]:
+    from token_optimizer.engine import TokenOptimizer
+
+    optimizer = TokenOptimizer(strategy=name, cache_enabled=False, token_memo=False)
+    return lambda text: optimizer.optimize(text).optimized_text
+
+
+_ANALYZERS = "token_optimizer.analyzers."
+
+TARGETS = {
+    target.name: target
+    for target in (
+        BenchTarget("structural", "analyzer", partial(
+            _analyzer, _ANALYZERS + "structural", "StructuralAnalyzer", aggressiveness=2
+        )),
+        BenchTarget("filler", "analyzer", partial(
+            _analyzer, _ANALYZERS + "filler", "FillerAnalyzer", aggressiveness=2
+        )),
+        BenchTarget("verbosity", "analyzer", partial(
+            _analyzer, _ANALYZERS + "verbosity", "VerbosityAnalyzer", aggressiveness=2
+        )),
+        BenchTarget("redundancy", "analyzer", partial(
+            _analyzer, _ANALYZERS + "redundancy", "RedundancyAnalyzer"
+        )),
+        BenchTarget("redundancy-lsh", "analyzer", partial(
+            _analyzer, _ANALYZERS + "redundancy", "RedundancyAnalyzer", mode="lsh"
+        )),
+        # Pruning each text to half its generic token estimate.
+        BenchTarget("pruning", "analyzer", _pruner),
+        *(
+            BenchTarget(name, "strategy", partial(_strategy, name))
+            for name in ("conservative", "moderate", "aggressive", "best")
+        ),
+    )
+}
+
+
+@dataclass
+class BenchResult:
+    """Measurements of one target on one corpus.
+
+    Attributes:
+        corpus: Corpus name.
+        target: Target name.
+        kind: Target kind.
+        prompts: Texts in the corpus.
+        chars: Characters in the corpus.
+        passes: Times the whole corpus was processed.
+        seconds: Total time of all passes.
+        mb_per_s: Throughput in megabytes (10**6 bytes of UTF-8) per second.
+        prompts_per_s: Throughput in texts per second.
+        p50_ms: Median latency of one text.
+        p99_ms: 99th-percentile latency of one text.
+        peak_mib: Growth of the process's peak resident memory while the
+            target ran, above its peak after setup; None if not measured.
+        reduction: Fraction of characters removed in the first pass.
+    """
+
+    corpus: str
+    target: str
+    kind: TargetKind
+    prompts: int
+    chars: int
+    passes: int
+    seconds: float
+    mb_per_s: float
+    prompts_per_s: float
+    p50_ms: float
+    p99_ms: float
+    peak_mib: float | None
+    reduction: float
+
+    def format(self) -> str:
+        """Render as one row of a table headed by :data:`TABLE_HEADER`."""
+        peak = "-" if self.peak_mib is None else f"{self.peak_mib:.1f}"
+        return (
+            f"{self.corpus:<14} {self.target:<15} {self.mb_per_s:>8.2f} "
+            f"{self.prompts_per_s:>10,.1f} {self.p50_ms:>9.3f} "
+            f"{self.p99_ms:>9.3f} {peak:>9} {self.reduction:>8.1%}"
+        )
+
+
+TABLE_HEADER = (
+    f"{'corpus':<14} {'target':<15} {'MB/s':>8} {'prompts/s':>10} "
+    f"{'p50 ms':>9} {'p99 ms':>9} {'peak MiB':>9} {'removed':>8}"
+)
+
+
+@dataclass
+class BenchReport:
+    """Results of a benchmark run, with what is needed to compare runs.
+
+    Attributes:
+        results: One entry per corpus and target.
+        corpora: Per corpus: its spec and content digest.
+        environment: Interpreter, platform and optional-dependency details.
+    """
+
+    results: list[BenchResult]
+    corpora: dict[str, dict[str, object]] = field(default_factory=dict)
+    environment: dict[str, str] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2) + "\n"
+
+    @classmethod
+    def from_json(cls, text: str) -> BenchReport:
+        data = json.loads(text)
+        return cls(
+            results=[BenchResult(**entry) for entry in data["results"]],
+            corpora=data.get("corpora", {}),
+            environment=data.get("environment", {}),
+        )
+
+    def format(self) -> str:
+        """Render the results as a plain-text table."""
+        return "\n".join([TABLE_HEADER, *(r.format() for r in self.results)])
+
+
+def run_benchmarks(
+    corpora: Iterable[CorpusSpec] | None = None,
+    targets: Iterable[str] | None = None,
+    min_seconds: float = 1.0,
+    isolate: bool = True,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> BenchReport:
+    """Benchmark every target on every corpus.
+
+    Each corpus is processed whole, one text at a time, for at least one
+    pass and then until ``min_seconds`` have been spent (at most 100
+    passes); latency percentiles are over every text in every pass.
+
+    Args:
+        corpora: Corpora to run. Defaults to all of :data:`CORPORA`.
+        targets: Names from :data:`TARGETS`. Defaults to all.
+        min_seconds: Minimum time spent per corpus and target.
+        isolate: Run each corpus and target in a fresh process, one after
+            another.  Results then do not depend on what ran before, and
+            peak memory is measured (where the ``resource`` module
+            exists).  Without it everything runs in this process and
+            ``peak_mib`` is None.
+        progress: Called with each result as soon as it is measured.
+    """
+    specs = list(CORPORA.values() if corpora is None else corpora)
+    names = list(TARGETS if targets is None else targets)
+    unknown = [name for name in names if name not in TARGETS]
+    if unknown:
+        raise ValueError(f"unknown targets: {', '.join(unknown)}")
+
+    report = BenchReport(results=[], environment=environment())
+    for spec in specs:
+        report.corpora[spec.name] = {
+            **asdict(spec),
+            "digest": corpus_digest(generate_corpus(spec)),
+        }
+        for name in names:
+            if isolate:
+                result = _measure_isolated(spec, name, min_seconds)
+            else:
+                result = _measure(spec, name, min_seconds, memory=False)
+            report.results.append(result)
+            if progress is not None:
+                progress(result)
+    return report
+
+
+def _measure_isolated(spec: CorpusSpec, name: str, min_seconds: float) -> BenchResult:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Spawned rather than forked so the child starts without this
+    # process's memory, caches or corpora.
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_quiet,
+    ) as pool:
+        return pool.submit(_measure, spec, name, min_seconds).result()
+
+
+def _quiet() -> None:
+    import warnings
+
+    # A missing tokenizer is reported once, in the environment, rather
+    # than by every child.
+    warnings.simplefilter("ignore")
+
+
+def _measure(
+    spec: CorpusSpec, name: str, min_seconds: float, memory: bool = True
+) -> BenchResult:
+    texts = generate_corpus(spec)
+    target = TARGETS[name]
+    run = target.build()
+    run(_WARMUP)
+    gc.collect()
+    base = _peak_rss() if memory else None
+
+    samples: list[float] = []
+    removed = 0
+    passes = 0
+    while True:
+        for text in texts:
+            start = perf_counter()
+            output = run(text)
+            samples.append(perf_counter() - start)
+            if not passes:
+                removed += len(text) - len(output)
+        passes += 1
+        if passes >= 100 or math.fsum(samples) >= min_seconds:
+            break
+
+    peak = None
+    if base is not None:
+        peak = max(0, _peak_rss() - base) / 2**20
+    seconds = math.fsum(samples)
+    chars = sum(map(len, texts))
+    size = sum(len(text.encode()) for text in texts)
+    samples.sort()
+    return BenchResult(
+        corpus=spec.name,
+        target=name,
+        kind=target.kind,
+        prompts=len(texts),
+        chars=chars,
+        passes=passes,
+        seconds=seconds,
+        mb_per_s=size * passes / seconds / 1e6,
+        prompts_per_s=len(texts) * passes / seconds,
+        p50_ms=_percentile(samples, 50) * 1000,
+        p99_ms=_percentile(samples, 99) * 1000,
+        peak_mib=peak,
+        reduction=removed / chars,
+    )
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted ``ordered``."""
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _peak_rss() -> int | None:
+    """This process's peak resident set size in bytes, if measurable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def environment() -> dict[str, str]:
+    """Details that affect results, recorded with every report."""
+    from token_optimizer import __version__
+
+    return {
+        "token_optimizer": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.system(),
+        "machine": platform.machine(),
+        "tiktoken": "yes" if find_spec("tiktoken") else "no",
+        "numpy": "yes" if find_spec("numpy") else "no",
+    }
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A metric that got worse than the baseline by more than the tolerance."""
+
+    corpus: str
+    target: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, positive when worse."""
+        if self.baseline == 0:
+            return math.inf
+        change = (self.current - self.baseline) / self.baseline
+        return -change if self.metric in _HIGHER_IS_BETTER else change
+
+    def __str__(self) -> str:
+        return (
+            f"{self.corpus}/{self.target}: {self.metric} {self.baseline:.3f} -> "
+            f"{self.current:.3f} ({self.change:.0%} worse)"
+        )
+
+
+_HIGHER_IS_BETTER = {"mb_per_s"}
+# Below these absolute differences a change is noise, whatever its ratio.
+_NOISE_FLOOR = {"mb_per_s": 0.0, "p50_ms": 0.05, "p99_ms": 0.05, "peak_mib": 1.0}
+
+
+def compare(
+    current: BenchReport, baseline: BenchReport, tolerance: float = 0.2
+) -> list[Regression]:
+    """Find results that are worse than the baseline.
+
+    Throughput, p50 and p99 latency and peak memory are compared for each
+    corpus and target present in both reports.  Corpora whose content
+    digest differs are skipped: their numbers are not comparable.
+
+    Args:
+        current: The new results.
+        baseline: Stored results to compare against.
+        tolerance: Relative worsening allowed, e.g. 0.2 for 20%.
+    """
+    previous = {(r.corpus, r.target): r for r in baseline.results}
+    regressions = []
+    for result in current.results:
+        before = previous.get((result.corpus, result.target))
+        if before is None or _digest(current, result.corpus) != _digest(
+            baseline, result.corpus
+        ):
+            continue
+        for metric, floor in _NOISE_FLOOR.items():
+            old, new = getattr(before, metric), getattr(result, metric)
+            if old is None or new is None:
+                continue
+            regression = Regression(result.corpus, result.target, metric, old, new)
+            if regression.change > tolerance and abs(new - old) > floor:
+                regressions.append(regression)
+    return regressions
+
+
+def _digest(report: BenchReport, corpus: str) -> object:
+    return report.corpora.get(corpus, {}).get("digest")
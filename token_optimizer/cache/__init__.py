@@ -1,5 +1,20 @@
 """Caching for optimized prompts."""
 
-from token_optimizer.cache.prompt_cache import PromptCache
+from typing import TYPE_CHECKING
 
-__all__ = ["PromptCache"]
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.cache.disk_cache import DiskCache
+    from token_optimizer.cache.prompt_cache import CacheStats, PromptCache
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "PromptCache": "token_optimizer.cache.prompt_cache",
+        "CacheStats": "token_optimizer.cache.prompt_cache",
+        "DiskCache": "token_optimizer.cache.disk_cache",
+    },
+)
+
+__all__ = ["PromptCache", "CacheStats", "DiskCache"]
@@ -0,0 +1,257 @@
+"""Persistent, multi-process cache tier backed by sqlite."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from token_optimizer.cache.keys import ruleset_fingerprint
+from token_optimizer.config import OptimizationResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (id, total_bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET total_bytes = total_bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET total_bytes = total_bytes - OLD.size WHERE id = 0;
+END;
+"""
+
+# After exceeding max_bytes, evict down to this fraction of it.
+_EVICT_TO = 0.9
+
+
+class DiskCache:
+    """sqlite cache tier shared by every process that points at one directory.
+
+    The database runs in WAL mode, so any number of processes can read
+    concurrently while one writes.  Keys are namespaced by the rule-set
+    fingerprint; entries written by another package version or rule set are
+    never returned, so several versions can share one directory.  Their
+    entries stop being refreshed and age out through eviction: when the
+    stored size exceeds ``max_bytes``, the oldest-written entries of any
+    namespace are evicted.  :meth:`purge_stale` deletes them at once.
+    Entries written with a ``ttl`` are deleted once they are found expired.
+    """
+
+    FILENAME = "prompt_cache.sqlite3"
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = 256 * 1024 * 1024,
+        namespace: str | None = None,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.path = Path(directory) / self.FILENAME
+        self._max_bytes = max_bytes
+        self._namespace = namespace or ruleset_fingerprint()
+        # Keys of this namespace sort between these bounds (";" follows ":").
+        self._range = (f"{self._namespace}:", f"{self._namespace};")
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open (or reopen after a fork) this process's connection."""
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _key(self, key: str) -> str:
+        return f"{self._namespace}:{key}"
+
+    def get(self, key: str) -> tuple[Any, float | None] | None:
+        """Return the stored value for ``key`` and its expiry, or None.
+
+        Returns:
+            (value, expires), where ``expires`` is the wall-clock
+            (``time.time()``) expiry, or None if the entry never expires.
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires = _loads(row[0])
+            if _expired(expires):
+                conn.execute("DELETE FROM entries WHERE key = ?", (self._key(key),))
+                return None
+        return value, expires
+
+    def put(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value, evicting the oldest entries if over budget.
+
+        Args:
+            key: Cache key.
+            value: An ``OptimizationResult`` or string.
+            ttl: Seconds until the entry expires, or None to keep it until
+                it is evicted.
+        """
+        payload = _dumps(value, None if ttl is None else time.time() + ttl)
+        size = len(payload.encode())
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, stored) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET value = excluded.value,"
+                    " size = excluded.size, stored = excluded.stored",
+                    (self._key(key), payload, size, time.time()),
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete oldest entries until the total is back under budget."""
+        (total,) = conn.execute("SELECT total_bytes FROM meta WHERE id = 0").fetchone()
+        if total <= self._max_bytes:
+            return
+        target = int(self._max_bytes * _EVICT_TO)
+        cutoff = None
+        rows = conn.execute("SELECT stored, size FROM entries ORDER BY stored")
+        for stored, size in rows:
+            total -= size
+            cutoff = stored
+            if total <= target:
+                break
+        if cutoff is not None:
+            conn.execute("DELETE FROM entries WHERE stored <= ?", (cutoff,))
+
+    def recent(self, limit: int) -> list[tuple[str, Any, float | None]]:
+        """Return up to ``limit`` most recently stored entries.
+
+        Returns:
+            (key, value, expires) tuples, newest first, with ``expires`` as
+            in :meth:`get`.
+        """
+        prefix = len(self._namespace) + 1
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, value FROM entries WHERE key > ? AND key < ?"
+                " ORDER BY stored DESC LIMIT ?",
+                (*self._range, limit),
+            ).fetchall()
+        entries = []
+        for key, payload in rows:
+            value, expires = _loads(payload)
+            if not _expired(expires):
+                entries.append((key[prefix:], value, expires))
+        return entries
+
+    def clear(self) -> None:
+        """Delete all entries of this namespace."""
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM entries WHERE key > ? AND key < ?", self._range
+            )
+
+    def purge_stale(self) -> int:
+        """Delete the entries of every other namespace.
+
+        Only call this once no other package version or rule set uses the
+        directory; their caches are deleted too.
+
+        Returns:
+            The number of entries deleted.
+        """
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM entries WHERE key <= ? OR key >= ?", self._range
+            )
+        return cursor.rowcount
+
+    @property
+    def size(self) -> int:
+        """Number of entries in this namespace."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM entries WHERE key > ? AND key < ?", self._range
+            ).fetchone()
+        return row[0]
+
+    @property
+    def total_bytes(self) -> int:
+        """Stored size of all namespaces, which ``max_bytes`` bounds."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT total_bytes FROM meta WHERE id = 0"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def _dumps(value: Any, expires: float | None = None) -> str:
+    """Serialize a cache value (and optional wall-clock expiry) to JSON."""
+    if isinstance(value, OptimizationResult):
+        data = asdict(value)
+        data["from_cache"] = False
+        data.pop("profile", None)  # describes one call; never cached
+        record: dict[str, Any] = {"result": data}
+    elif isinstance(value, str):
+        record = {"text": value}
+    else:
+        raise TypeError(f"cannot store {type(value).__name__} in DiskCache")
+    if expires is not None:
+        record["expires"] = expires
+    return json.dumps(record)
+
+
+def _loads(payload: str) -> tuple[Any, float | None]:
+    """Deserialize a value written by :func:`_dumps`.
+
+    Returns:
+        (value, expires)
+    """
+    data = json.loads(payload)
+    expires = data.get("expires")
+    if "result" in data:
+        return OptimizationResult(**data["result"]), expires
+    return data["text"], expires
+
+
+def _expired(expires: float | None) -> bool:
+    return expires is not None and expires <= time.time()
@@ -0,0 +1,66 @@
+"""Fingerprints used to key and version cache entries."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+# Bump when the stored entry format changes.
+CACHE_FORMAT_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Content hash of one text, computed once and reused for every lookup.
+
+    Uses a 16-byte blake2b digest, which is faster than SHA-256 and wide
+    enough that collisions are not a practical concern.
+    """
+
+    digest: bytes
+
+    @classmethod
+    def of(cls, text: str) -> Fingerprint:
+        return cls(hashlib.blake2b(text.encode(), digest_size=16).digest())
+
+    @property
+    def hex(self) -> str:
+        return self.digest.hex()
+
+
+@lru_cache(maxsize=1)
+def ruleset_fingerprint() -> str:
+    """Return a short hash of the package version and the analyzer rule tables.
+
+    Persistent cache entries are namespaced by this value, so upgrading the
+    package or editing a rule table invalidates entries produced by the old
+    rules.
+    """
+    from token_optimizer import __version__
+    from token_optimizer.analyzers.filler import FillerAnalyzer
+    from token_optimizer.analyzers.verbosity import VerbosityAnalyzer
+
+    parts = [
+        str(CACHE_FORMAT_VERSION),
+        __version__,
+        repr(sorted(FillerAnalyzer.FILLER_WORDS)),
+        repr(FillerAnalyzer.FILLER_PHRASES),
+        repr(FillerAnalyzer.POLITE_OPENERS),
+        repr(VerbosityAnalyzer.REWRITE_RULES),
+        repr(VerbosityAnalyzer._INSTRUCTION_VERBS),
+        repr(VerbosityAnalyzer._PRONOUN_RULES),
+    ]
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """Return a short hash of everything besides the text that shapes a result.
+
+    Callers pass the settings that affect optimization output (model,
+    strategy, keywords, thresholds, ...); the rule-set fingerprint is mixed
+    in so results computed under other rule tables never match.
+    """
+    joined = "\0".join([ruleset_fingerprint(), *map(repr, parts)])
+    return hashlib.blake2b(joined.encode(), digest_size=8).hexdigest()
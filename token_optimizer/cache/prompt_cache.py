@@ -2,52 +2,463 @@
 
 from __future__ import annotations
 
-import hashlib
+import math
+import sys
+import threading
+import time
+import zlib
 from collections import OrderedDict
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from token_optimizer.cache.keys import Fingerprint
+from token_optimizer.cache.sketch import FrequencySketch
+from token_optimizer.config import CacheAdmission
+
+if TYPE_CHECKING:
+    from token_optimizer.cache.disk_cache import DiskCache
+
+# Share of each shard given to the admission window under "tinylfu".
+_WINDOW_FRACTION = 0.01
 
 
 @dataclass(frozen=True)
 class CacheKey:
-    """Cache key combining prompt hash and strategy."""
+    """Cache key combining prompt hash, strategy and configuration variant."""
 
     prompt_hash: str
     strategy: str
+    variant: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.strategy}:{self.variant}:{self.prompt_hash}"
+
+    @classmethod
+    def parse(cls, raw: str) -> CacheKey:
+        """Inverse of ``str(key)``.
+
+        The variant and hash never contain ":", so they are split off the
+        right; the strategy name may contain it.
+        """
+        strategy, variant, prompt_hash = raw.rsplit(":", 2)
+        return cls(prompt_hash=prompt_hash, strategy=strategy, variant=variant)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    disk_hits: int = 0
+    rejections: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+    __slots__ = ("value", "size", "key_hash", "expires")
+
+    def __init__(
+        self, value: Any, size: int, key_hash: int, expires: float | None
+    ) -> None:
+        self.value = value
+        self.size = size
+        self.key_hash = key_hash
+        self.expires = expires
+
+
+class _Segment:
+    """An LRU list bounded by entry count and total size."""
+
+    __slots__ = ("entries", "bytes", "max_entries", "max_bytes")
+
+    def __init__(self, max_entries: int, max_bytes: float) -> None:
+        self.entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self.bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def add(self, key: CacheKey, entry: _Entry) -> None:
+        self.entries[key] = entry
+        self.bytes += entry.size
+
+    def remove(self, key: CacheKey) -> _Entry | None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+        return entry
+
+    def overflowing(self) -> bool:
+        return len(self.entries) > self.max_entries or self.bytes > self.max_bytes
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+
+class _Shard:
+    """One lock-protected shard of the cache.
+
+    Under plain LRU every entry lives in ``main``.  Under TinyLFU new
+    entries first land in a small ``window`` LRU; entries leaving the window
+    only enter ``main`` if the frequency sketch rates them above the entries
+    they would push out.
+    """
+
+    __slots__ = (
+        "lock",
+        "window",
+        "main",
+        "sketch",
+        "hits",
+        "misses",
+        "disk_hits",
+        "evictions",
+        "rejections",
+        "expirations",
+    )
+
+    def __init__(
+        self, max_entries: int, max_bytes: float, admission: CacheAdmission
+    ) -> None:
+        self.lock = threading.Lock()
+        self.window: _Segment | None = None
+        self.sketch: FrequencySketch | None = None
+        if admission == "tinylfu":
+            window_entries = max(1, int(max_entries * _WINDOW_FRACTION))
+            window_bytes = max_bytes * _WINDOW_FRACTION
+            self.window = _Segment(window_entries, window_bytes)
+            self.sketch = FrequencySketch(max_entries)
+            max_entries = max(1, max_entries - window_entries)
+            if max_bytes != math.inf:
+                max_bytes -= window_bytes
+        self.main = _Segment(max_entries, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.expirations = 0
+
+    def segments(self) -> tuple[_Segment, ...]:
+        return (self.main,) if self.window is None else (self.window, self.main)
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory held by a cached value's text."""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    original = getattr(value, "original_text", None)
+    optimized = getattr(value, "optimized_text", None)
+    if isinstance(original, str) and isinstance(optimized, str):
+        return sys.getsizeof(value) + sys.getsizeof(original) + sys.getsizeof(optimized)
+    return sys.getsizeof(value)
 
 
 class PromptCache:
-    """LRU cache for optimization results keyed by prompt + strategy."""
+    """Thread-safe cache for optimization results keyed by prompt + strategy.
+
+    Values are stored as given; the engine stores complete
+    ``OptimizationResult`` objects so that a hit needs no recomputation.
+
+    Entries are spread over ``shards`` independent shards, each with its
+    own lock, so threads sharing one optimizer rarely contend.  Prompts are
+    hashed before any lock is taken.  By default small caches use a single
+    shard (exact global LRU order) and larger ones up to 16.
+
+    The cache holds at most ``maxsize`` entries and, if ``max_bytes`` is
+    set, at most that many bytes of stored text.  With ``admission="lru"``
+    the least recently used entries make room for new ones.  With
+    ``admission="tinylfu"`` (W-TinyLFU) new entries pass through a small
+    LRU window and then only displace older entries that a frequency sketch
+    rates as less popular, so bursts of one-off prompts cannot flush
+    frequently reused ones.  Entries can carry a time-to-live; expired
+    entries are dropped when next looked up.
+
+    Prompts are keyed by a :class:`Fingerprint` of their text plus the
+    strategy name and an optional ``variant`` string identifying the rest
+    of the configuration (model, keywords, rule tables, ...).  Callers that
+    already hold the fingerprint can pass it to skip rehashing.
+
+    An optional :class:`DiskCache` acts as a second, persistent tier: misses
+    in memory fall through to it, hits there are promoted into memory, and
+    every ``put`` is written through to it.
+    """
 
-    def __init__(self, maxsize: int = 1024) -> None:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        disk: DiskCache | None = None,
+        shards: int | None = None,
+        max_bytes: int | None = None,
+        admission: CacheAdmission = "lru",
+        ttl: float | None = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        if admission not in ("lru", "tinylfu"):
+            raise ValueError(f"unknown admission policy: {admission!r}")
+        if shards is None:
+            shards = max(1, min(16, maxsize // 64))
+        if not 1 <= shards <= maxsize:
+            raise ValueError("shards must be between 1 and maxsize")
         self._maxsize = maxsize
-        self._cache: OrderedDict[CacheKey, str] = OrderedDict()
-
-    def _make_key(self, text: str, strategy: str) -> CacheKey:
-        prompt_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        return CacheKey(prompt_hash=prompt_hash, strategy=strategy)
-
-    def get(self, text: str, strategy: str) -> str | None:
-        """Look up a cached optimization result."""
-        key = self._make_key(text, strategy)
-        if key in self._cache:
-            self._cache.move_to_end(key)
-            return self._cache[key]
+        self._ttl = ttl
+        base, extra = divmod(maxsize, shards)
+        shard_bytes = math.inf if max_bytes is None else max_bytes / shards
+        self._shards = [
+            _Shard(base + (i < extra), shard_bytes, admission) for i in range(shards)
+        ]
+        self._disk = disk
+
+    def _make_key(
+        self,
+        text: str,
+        strategy: str,
+        fingerprint: Fingerprint | None,
+        variant: str,
+    ) -> CacheKey:
+        if fingerprint is None:
+            fingerprint = Fingerprint.of(text)
+        return CacheKey(prompt_hash=fingerprint.hex, strategy=strategy, variant=variant)
+
+    @staticmethod
+    def _hash(key: CacheKey) -> int:
+        """64-bit integer hash of a key, stable across processes."""
+        suffix = f"{key.strategy}:{key.variant}".encode()
+        return int(key.prompt_hash[:16], 16) ^ zlib.crc32(suffix)
+
+    def _shard(self, key_hash: int) -> _Shard:
+        return self._shards[(key_hash >> 32) % len(self._shards)]
+
+    def get(
+        self,
+        text: str,
+        strategy: str,
+        *,
+        fingerprint: Fingerprint | None = None,
+        variant: str = "",
+    ) -> Any | None:
+        """Look up a cached optimization result.
+
+        Args:
+            text: The prompt.
+            strategy: Name of the strategy.
+            fingerprint: Precomputed ``Fingerprint.of(text)``, if available.
+            variant: Identifier of the remaining configuration.
+        """
+        key = self._make_key(text, strategy, fingerprint, variant)
+        key_hash = self._hash(key)
+        shard = self._shard(key_hash)
+        with shard.lock:
+            if shard.sketch is not None:
+                shard.sketch.increment(key_hash)
+            for segment in shard.segments():
+                entry = segment.entries.get(key)
+                if entry is None:
+                    continue
+                if entry.expires is not None and entry.expires <= time.monotonic():
+                    segment.remove(key)
+                    shard.expirations += 1
+                    break
+                segment.entries.move_to_end(key)
+                shard.hits += 1
+                return entry.value
+            shard.misses += 1
+
+        if self._disk is not None:
+            stored = self._disk.get(str(key))
+            if stored is not None:
+                value, expires = stored
+                with shard.lock:
+                    # Reclassify the miss recorded above as a (disk) hit.
+                    shard.misses -= 1
+                    shard.hits += 1
+                    shard.disk_hits += 1
+                    self._store(shard, key, key_hash, value, self._remaining(expires))
+                return value
         return None
 
-    def put(self, text: str, strategy: str, optimized: str) -> None:
-        """Store an optimization result."""
-        key = self._make_key(text, strategy)
-        if key in self._cache:
-            self._cache.move_to_end(key)
-        else:
-            if len(self._cache) >= self._maxsize:
-                self._cache.popitem(last=False)
-        self._cache[key] = optimized
+    def _remaining(self, expires: float | None) -> float | None:
+        """TTL for a disk entry promoted to memory.
+
+        An entry keeps what is left of the expiry it was written with; one
+        written without an expiry gets this cache's ``ttl``.
+        """
+        if expires is None:
+            return self._ttl
+        return expires - time.time()
+
+    def put(
+        self,
+        text: str,
+        strategy: str,
+        optimized: Any,
+        ttl: float | None = None,
+        *,
+        fingerprint: Fingerprint | None = None,
+        variant: str = "",
+    ) -> None:
+        """Store an optimization result.
+
+        Args:
+            text: The prompt the result was computed for.
+            strategy: Name of the strategy that produced it.
+            optimized: The value to cache.
+            ttl: Seconds until the entry expires. Defaults to the cache's
+                ``ttl``; ``None`` for both means the entry never expires.
+            fingerprint: Precomputed ``Fingerprint.of(text)``, if available.
+            variant: Identifier of the remaining configuration.
+        """
+        if ttl is None:
+            ttl = self._ttl
+        key = self._make_key(text, strategy, fingerprint, variant)
+        key_hash = self._hash(key)
+        shard = self._shard(key_hash)
+        with shard.lock:
+            self._store(shard, key, key_hash, optimized, ttl)
+        if self._disk is not None:
+            self._disk.put(str(key), optimized, ttl=ttl)
+
+    def _store(
+        self,
+        shard: _Shard,
+        key: CacheKey,
+        key_hash: int,
+        value: Any,
+        ttl: float | None,
+    ) -> None:
+        """Insert or replace an entry.  The caller must hold ``shard.lock``."""
+        expires = None if ttl is None else time.monotonic() + ttl
+        entry = _Entry(value, _sizeof(value), key_hash, expires)
+
+        if shard.main.remove(key) is not None:
+            # Already admitted: replace in place without another admission check.
+            self._admit(shard, key, entry, check_frequency=False)
+            return
+        if shard.window is None:
+            self._admit(shard, key, entry, check_frequency=False)
+            return
+
+        shard.window.remove(key)
+        shard.window.add(key, entry)
+        while shard.window.overflowing():
+            candidate_key, candidate = shard.window.entries.popitem(last=False)
+            shard.window.bytes -= candidate.size
+            self._admit(shard, candidate_key, candidate, check_frequency=True)
+
+    @staticmethod
+    def _admit(
+        shard: _Shard, key: CacheKey, entry: _Entry, check_frequency: bool
+    ) -> None:
+        """Add ``entry`` to the main segment, evicting entries to make room.
+
+        With ``check_frequency`` the entry is rejected instead if it is not
+        more popular than the most popular entry it would evict.
+        """
+        main = shard.main
+        if entry.size > main.max_bytes:
+            shard.rejections += 1
+            return
+
+        victims: list[CacheKey] = []
+        count = len(main.entries) + 1
+        size = main.bytes + entry.size
+        hottest = 0
+        for victim_key, victim in main.entries.items():
+            if count <= main.max_entries and size <= main.max_bytes:
+                break
+            victims.append(victim_key)
+            count -= 1
+            size -= victim.size
+            if check_frequency and shard.sketch is not None:
+                hottest = max(hottest, shard.sketch.estimate(victim.key_hash))
+
+        if (
+            victims
+            and check_frequency
+            and shard.sketch is not None
+            and shard.sketch.estimate(entry.key_hash) <= hottest
+        ):
+            shard.rejections += 1
+            return
+
+        for victim_key in victims:
+            main.remove(victim_key)
+        shard.evictions += len(victims)
+        main.add(key, entry)
+
+    def promote(self, limit: int | None = None) -> int:
+        """Load the most recently stored disk entries into memory.
+
+        Args:
+            limit: Maximum number of entries to load. Defaults to the
+                in-memory capacity.
+
+        Returns:
+            The number of entries promoted.
+        """
+        if self._disk is None:
+            return 0
+        entries = self._disk.recent(self._maxsize if limit is None else limit)
+        # Insert oldest first so the newest end up most recently used.
+        for raw_key, value, expires in reversed(entries):
+            key = CacheKey.parse(raw_key)
+            key_hash = self._hash(key)
+            shard = self._shard(key_hash)
+            with shard.lock:
+                self._store(shard, key, key_hash, value, self._remaining(expires))
+        return len(entries)
 
     def clear(self) -> None:
-        """Clear all cached entries."""
-        self._cache.clear()
+        """Clear all in-memory entries (the disk tier is left untouched)."""
+        for shard in self._shards:
+            with shard.lock:
+                for segment in shard.segments():
+                    segment.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of hit, miss, eviction and size counters."""
+        totals = dict.fromkeys(
+            (
+                "hits",
+                "misses",
+                "disk_hits",
+                "evictions",
+                "rejections",
+                "expirations",
+                "entries",
+            ),
+            0,
+        )
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["disk_hits"] += shard.disk_hits
+                totals["evictions"] += shard.evictions
+                totals["rejections"] += shard.rejections
+                totals["expirations"] += shard.expirations
+                for segment in shard.segments():
+                    totals["entries"] += len(segment.entries)
+                    size += segment.bytes
+        return CacheStats(bytes=size, **totals)
 
     @property
     def size(self) -> int:
-        return len(self._cache)
+        return sum(
+            len(segment.entries)
+            for shard in self._shards
+            for segment in shard.segments()
+        )
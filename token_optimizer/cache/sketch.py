@@ -0,0 +1,59 @@
+"""Count-min frequency sketch used for cache admission."""
+
+from __future__ import annotations
+
+# Translation table that halves every counter in one pass.
+_HALVE = bytes(i >> 1 for i in range(256))
+
+_MAX_COUNT = 15
+
+
+class FrequencySketch:
+    """Approximate, aging access-frequency counter (TinyLFU style).
+
+    Keeps ``depth`` rows of small saturating counters in one bytearray and
+    estimates a key's frequency as the minimum of its counters.  Each row
+    has about four counters per cached entry.  After ``10 * capacity``
+    increments every counter is halved, so the sketch tracks recent
+    popularity instead of all-time totals.
+
+    Keys are 64-bit integer hashes supplied by the caller.
+
+    Args:
+        capacity: Number of entries the owning cache holds.
+        depth: Number of counter rows.
+    """
+
+    def __init__(self, capacity: int, depth: int = 4) -> None:
+        if capacity < 1 or depth < 1:
+            raise ValueError("capacity and depth must be at least 1")
+        self._width = 1 << (4 * capacity - 1).bit_length()
+        self._mask = self._width - 1
+        self._depth = depth
+        self._table = bytearray(self._width * depth)
+        self._additions = 0
+        self._sample_size = 10 * capacity
+
+    def _indexes(self, key_hash: int) -> list[int]:
+        low = key_hash & 0xFFFFFFFF
+        step = (key_hash >> 32) | 1
+        return [
+            row * self._width + ((low + row * step) & self._mask)
+            for row in range(self._depth)
+        ]
+
+    def increment(self, key_hash: int) -> None:
+        """Record one access of ``key_hash``."""
+        table = self._table
+        for index in self._indexes(key_hash):
+            if table[index] < _MAX_COUNT:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = table.translate(_HALVE)
+            self._additions //= 2
+
+    def estimate(self, key_hash: int) -> int:
+        """Return the estimated recent access count of ``key_hash``."""
+        table = self._table
+        return min(table[index] for index in self._indexes(key_hash))
@@ -4,6 +4,10 @@ from __future__ import annotations
 
 import argparse
 import sys
+from typing import Iterable
+
+# Characters read from stdin at a time in --stream mode.
+_STREAM_READ_SIZE = 64 * 1024
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -11,6 +15,7 @@ def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         prog="token-optimizer",
         description="Optimize LLM prompts to reduce token usage and cost.",
+        epilog="Run 'token-optimizer-bench --help' for the benchmark suite.",
     )
     parser.add_argument(
         "prompt",
@@ -24,9 +29,12 @@ def main(argv: list[str] | None = None) -> None:
     )
     parser.add_argument(
         "--strategy", "-s",
-        choices=["conservative", "moderate", "aggressive"],
+        choices=["conservative", "moderate", "aggressive", "best"],
         default="moderate",
-        help="Optimization strategy (default: moderate).",
+        help=(
+            "Optimization strategy (default: moderate). 'best' picks the most "
+            "compressed of the three that meets the similarity threshold."
+        ),
     )
     parser.add_argument(
         "--preserve", "-p",
@@ -44,8 +52,55 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Show before/after comparison.",
     )
+    parser.add_argument(
+        "--similarity",
+        choices=["keyword", "hashing", "embedding"],
+        default="keyword",
+        help="Similarity check used to guard meaning (default: keyword). "
+        "'hashing' needs no model download; 'embedding' needs "
+        "sentence-transformers.",
+    )
+    parser.add_argument(
+        "--guard",
+        choices=["document", "segment"],
+        default="document",
+        help="What happens when similarity falls below the threshold "
+        "(default: document). 'document' reruns conservatively; 'segment' "
+        "reverts only the sentences that lost meaning.",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Token budget: optimize only until the prompt fits, escalating "
+        "from conservative to aggressive (ignores --strategy).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="With --max-tokens: if aggressive optimization still does not "
+        "fit, drop the least important sentences until it does.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for a persistent result cache shared across runs "
+        "and processes.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read stdin incrementally and write optimized output as it is "
+        "produced (for inputs too large to hold in memory).",
+    )
 
     args = parser.parse_args(argv)
+    if args.prune and args.max_tokens is None:
+        parser.error("--prune requires --max-tokens.")
+
+    if args.stream:
+        _run_stream(args, parser)
+        return
 
     # Read prompt from argument or stdin
     prompt = args.prompt
@@ -63,9 +118,14 @@ def main(argv: list[str] | None = None) -> None:
         model=args.model,
         strategy=args.strategy,
         preserve_keywords=args.preserve,
+        similarity_backend=args.similarity,
+        similarity_guard=args.guard,
+        budget_pruning=args.prune,
+        cache_dir=args.cache_dir,
+        profile=args.verbose,
     )
 
-    result = optimizer.optimize(prompt)
+    result = optimizer.optimize(prompt, max_tokens=args.max_tokens)
 
     if args.show_diff:
         print("=== ORIGINAL ===")
@@ -86,6 +146,156 @@ def main(argv: list[str] | None = None) -> None:
         print(f"Savings:          {result.savings_percent:.1f}%")
         print(f"Cost savings:     ${result.estimated_cost_savings:.6f}")
         print(f"Similarity:       {result.similarity_score:.3f}")
+        if result.profile is not None:
+            print()
+            print("--- Profile ---")
+            print(result.profile.format())
+
+
+def _run_stream(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """Optimize stdin (or the prompt argument) window by window."""
+    if args.show_diff:
+        parser.error("--show-diff cannot be combined with --stream.")
+    if args.max_tokens is not None:
+        parser.error("--max-tokens cannot be combined with --stream.")
+
+    if args.prompt is not None:
+        chunks: Iterable[str] = [args.prompt]
+    elif sys.stdin.isatty():
+        parser.error("No prompt provided. Pass a prompt or pipe from stdin.")
+    else:
+        chunks = iter(lambda: sys.stdin.read(_STREAM_READ_SIZE), "")
+
+    from token_optimizer import TokenOptimizer
+
+    optimizer = TokenOptimizer(
+        model=args.model,
+        strategy=args.strategy,
+        preserve_keywords=args.preserve,
+        similarity_backend=args.similarity,
+        similarity_guard=args.guard,
+    )
+
+    stream = optimizer.optimize_stream(chunks)
+    for chunk in stream:
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    print()
+
+    if args.verbose:
+        print()
+        print("--- Metrics ---")
+        print(f"Model:            {args.model}")
+        print(f"Strategy:         {args.strategy}")
+        print(f"Windows:          {stream.windows}")
+        print(f"Original tokens:  {stream.original_tokens}")
+        print(f"Optimized tokens: {stream.optimized_tokens}")
+        print(f"Tokens saved:     {stream.tokens_saved}")
+        print(f"Savings:          {stream.savings_percent:.1f}%")
+
+
+def bench_main(argv: list[str] | None = None) -> None:
+    """Entry point for the token-optimizer-bench CLI."""
+    from token_optimizer.bench.corpus import CORPORA
+    from token_optimizer.bench.runner import TARGETS
+
+    parser = argparse.ArgumentParser(
+        prog="token-optimizer-bench",
+        description="Benchmark analyzers and strategies on synthetic corpora. "
+        "Exits with status 1 if --baseline finds a regression.",
+    )
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=list(CORPORA),
+        help="Corpus to run; repeat for several (default: all).",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        choices=list(TARGETS),
+        help="Analyzer or strategy to run; repeat for several (default: all).",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="Minimum seconds per corpus and target (default: 1.0); the "
+        "corpus is processed at least once.",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write the results as JSON to this file (use it as a later "
+        "--baseline).",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="JSON results of an earlier run to compare against.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative worsening tolerated by --baseline (default: 0.2).",
+    )
+    parser.add_argument(
+        "--update-doc",
+        default=None,
+        metavar="PATH",
+        help="Regenerate the generated sections of this results document, "
+        "e.g. examples/optimization-results.md.",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run everything in this process instead of a fresh process per "
+        "corpus and target (faster to start; peak memory is not measured).",
+    )
+    args = parser.parse_args(argv)
+    if args.min_time < 0:
+        parser.error("--min-time must be non-negative.")
+
+    from token_optimizer.bench.runner import (
+        TABLE_HEADER,
+        BenchReport,
+        compare,
+        run_benchmarks,
+    )
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = BenchReport.from_json(handle.read())
+
+    print(TABLE_HEADER, flush=True)
+    report = run_benchmarks(
+        corpora=[CORPORA[name] for name in args.corpus or CORPORA],
+        targets=args.target,
+        min_seconds=args.min_time,
+        isolate=not args.in_process,
+        progress=lambda result: print(result.format(), flush=True),
+    )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(report.to_json())
+    if args.update_doc is not None:
+        from token_optimizer.bench.report import regenerate_document
+
+        regenerate_document(args.update_doc, report)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        print()
+        if not regressions:
+            print(f"No regressions against {args.baseline}.")
+            return
+        print(f"{len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Literal
 
-StrategyName = Literal["conservative", "moderate", "aggressive", "custom"]
+StrategyName = Literal["conservative", "moderate", "aggressive", "custom", "best"]
+RedundancyMode = Literal["exact", "lsh"]
+CacheAdmission = Literal["lru", "tinylfu"]
+SimilarityBackendName = Literal["keyword", "hashing", "embedding"]
+SimilarityGuard = Literal["document", "segment"]
+ProfileKind = Literal["phase", "stage"]
 
 
 @dataclass
@@ -18,8 +23,92 @@ class OptimizerConfig:
     cost_per_1k_output: float | None = None
     preserve_keywords: list[str] = field(default_factory=list)
     similarity_threshold: float = 0.4
+    similarity_backend: SimilarityBackendName = "keyword"
+    similarity_guard: SimilarityGuard = "document"
+    budget_pruning: bool = False
     cache_enabled: bool = True
     cache_maxsize: int = 1024
+    cache_max_bytes: int | None = None
+    cache_admission: CacheAdmission = "lru"
+    cache_ttl: float | None = None
+    cache_dir: str | None = None
+    cache_dir_max_bytes: int = 256 * 1024 * 1024
+    redundancy_mode: RedundancyMode = "exact"
+    cross_paragraph_dedup: bool = False
+    token_memo: bool = True
+    token_memo_maxsize: int = 65_536
+    strict_tokenizer: bool = False
+    profile: bool = False
+    telemetry: bool = False
+
+
+@dataclass(frozen=True)
+class ProfileEntry:
+    """Wall time and effect of one engine phase or analyzer stage.
+
+    Sizes and ``tokens_removed`` are None for phases that do not rewrite
+    text, such as the similarity check or token counting.
+    """
+
+    kind: ProfileKind
+    name: str
+    seconds: float
+    input_chars: int | None = None
+    output_chars: int | None = None
+    tokens_removed: int | None = None
+
+
+@dataclass
+class OptimizationProfile:
+    """Where the time of one ``optimize`` call went.
+
+    ``entries`` holds engine phases and analyzer stages in the order they
+    finished; the stages run inside a phase are listed just before it.
+    """
+
+    entries: list[ProfileEntry] = field(default_factory=list)
+
+    @property
+    def phases(self) -> list[ProfileEntry]:
+        return [entry for entry in self.entries if entry.kind == "phase"]
+
+    @property
+    def stages(self) -> list[ProfileEntry]:
+        return [entry for entry in self.entries if entry.kind == "stage"]
+
+    @property
+    def total_seconds(self) -> float:
+        """Time spent in phases; stage time is part of its phase's."""
+        return sum(entry.seconds for entry in self.phases)
+
+    def format(self) -> str:
+        """Render the profile as a table, each phase followed by its stages."""
+        rows = []
+        pending: list[ProfileEntry] = []
+        for entry in self.entries:
+            if entry.kind == "stage":
+                pending.append(entry)
+                continue
+            rows.append(_profile_row(entry.name, entry))
+            rows.extend(_profile_row(f"  {stage.name}", stage) for stage in pending)
+            pending = []
+        header = (
+            f"{'phase / stage':<32} {'ms':>9} {'chars in':>10} "
+            f"{'chars out':>10} {'tokens -':>9}"
+        )
+        total = f"{'total':<32} {self.total_seconds * 1000:>9.3f}"
+        return "\n".join([header, *rows, total])
+
+
+def _profile_row(label: str, entry: ProfileEntry) -> str:
+    def number(value: int | None) -> str:
+        return "" if value is None else f"{value:,}"
+
+    return (
+        f"{label[:32]:<32} {entry.seconds * 1000:>9.3f} "
+        f"{number(entry.input_chars):>10} {number(entry.output_chars):>10} "
+        f"{number(entry.tokens_removed):>9}"
+    )
 
 
 @dataclass
@@ -35,6 +124,7 @@ class OptimizationResult:
     similarity_score: float
     strategy_used: str
     from_cache: bool = False
+    profile: OptimizationProfile | None = None
 
     @property
     def tokens_saved(self) -> int:
@@ -2,12 +2,45 @@
 
 from __future__ import annotations
 
-from token_optimizer.config import OptimizerConfig, OptimizationResult, StrategyName
+import os
+from dataclasses import asdict, replace
+from functools import cached_property
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from token_optimizer.config import (
+    CacheAdmission,
+    OptimizerConfig,
+    OptimizationResult,
+    RedundancyMode,
+    SimilarityBackendName,
+    SimilarityGuard,
+    StrategyName,
+)
 from token_optimizer.providers.registry import ProviderRegistry
-from token_optimizer.metrics.calculator import TokenCalculator
+from token_optimizer.metrics.calculator import IncrementalCounter, TokenCalculator
+from token_optimizer.metrics.profiling import Profiler
 from token_optimizer.metrics.similarity import SimilarityScorer
-from token_optimizer.cache.prompt_cache import PromptCache
+from token_optimizer.metrics.token_memo import TokenMemoStats, shared_token_memo
+from token_optimizer.cache.keys import Fingerprint, config_fingerprint
+from token_optimizer.cache.prompt_cache import CacheStats, PromptCache
+from token_optimizer.analyzers.pruning import SentencePruner
+from token_optimizer.analyzers.stages import StageMemo
 from token_optimizer.strategies.base import BaseStrategy
+from token_optimizer.strategies.best import BestOfStrategy
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from token_optimizer.metrics.segments import SegmentGuard
+    from token_optimizer.metrics.telemetry import Telemetry
+    from token_optimizer.streaming import OptimizationStream
+    from token_optimizer.tokenizers.base import BaseTokenizer
+
+# Budget checks are skipped while the length-scaled token estimate exceeds
+# the budget by more than this factor; token density rarely moves that much
+# within one optimization.
+_BUDGET_SLACK = 1.25
 
 
 class TokenOptimizer:
@@ -28,8 +61,23 @@ class TokenOptimizer:
         cost_per_1k_output: float | None = None,
         preserve_keywords: list[str] | None = None,
         similarity_threshold: float = 0.4,
+        similarity_backend: SimilarityBackendName = "keyword",
+        similarity_guard: SimilarityGuard = "document",
+        budget_pruning: bool = False,
         cache_enabled: bool = True,
         cache_maxsize: int = 1024,
+        cache_max_bytes: int | None = None,
+        cache_admission: CacheAdmission = "lru",
+        cache_ttl: float | None = None,
+        cache_dir: str | None = None,
+        cache_dir_max_bytes: int = 256 * 1024 * 1024,
+        redundancy_mode: RedundancyMode = "exact",
+        cross_paragraph_dedup: bool = False,
+        token_memo: bool = True,
+        token_memo_maxsize: int = 65_536,
+        strict_tokenizer: bool = False,
+        profile: bool = False,
+        telemetry: bool = False,
     ) -> None:
         self.config = OptimizerConfig(
             model=model,
@@ -38,48 +86,407 @@ class TokenOptimizer:
             cost_per_1k_output=cost_per_1k_output,
             preserve_keywords=preserve_keywords or [],
             similarity_threshold=similarity_threshold,
+            similarity_backend=similarity_backend,
+            similarity_guard=similarity_guard,
+            budget_pruning=budget_pruning,
             cache_enabled=cache_enabled,
             cache_maxsize=cache_maxsize,
+            cache_max_bytes=cache_max_bytes,
+            cache_admission=cache_admission,
+            cache_ttl=cache_ttl,
+            cache_dir=cache_dir,
+            cache_dir_max_bytes=cache_dir_max_bytes,
+            redundancy_mode=redundancy_mode,
+            cross_paragraph_dedup=cross_paragraph_dedup,
+            token_memo=token_memo,
+            token_memo_maxsize=token_memo_maxsize,
+            strict_tokenizer=strict_tokenizer,
+            profile=profile,
+            telemetry=telemetry,
         )
 
-        self._registry = ProviderRegistry()
+        self._registry = ProviderRegistry(strict=strict_tokenizer)
         self._model_info = self._registry.lookup(model)
 
-        # Override pricing if provided
+        # Override pricing if provided (on a copy; lookups return shared info)
         if cost_per_1k_input is not None:
-            self._model_info.cost_per_1k_input = cost_per_1k_input
+            self._model_info = replace(
+                self._model_info, cost_per_1k_input=cost_per_1k_input
+            )
         if cost_per_1k_output is not None:
-            self._model_info.cost_per_1k_output = cost_per_1k_output
+            self._model_info = replace(
+                self._model_info, cost_per_1k_output=cost_per_1k_output
+            )
 
-        self._tokenizer = self._registry.get_tokenizer(model)
-        self._calculator = TokenCalculator(self._tokenizer, self._model_info)
-        self._similarity = SimilarityScorer()
-        self._cache = PromptCache(maxsize=cache_maxsize) if cache_enabled else None
+        self._cache = self._build_cache() if cache_enabled else None
         self._strategy = self._build_strategy(strategy)
+        self._telemetry: Telemetry | None = None
+        if telemetry:
+            from token_optimizer.metrics.telemetry import shared_telemetry
+
+            self._telemetry = shared_telemetry()
+        if strict_tokenizer:
+            # Surface a missing tokenizer now rather than on first count.
+            self._tokenizer
+
+    # The tokenizer (which may load a tiktoken encoding), calculator and
+    # similarity scorer are built on first use, so a run answered entirely
+    # from the cache never pays for them.
+
+    @cached_property
+    def _tokenizer(self) -> BaseTokenizer:
+        return self._registry.get_tokenizer(self.config.model)
+
+    @cached_property
+    def _calculator(self) -> TokenCalculator:
+        memo = None
+        if self.config.token_memo and not self._tokenizer.is_estimate:
+            memo = shared_token_memo(
+                self._tokenizer.identity, self.config.token_memo_maxsize
+            )
+        return TokenCalculator(self._tokenizer, self._model_info, memo)
+
+    @cached_property
+    def _similarity(self) -> SimilarityScorer:
+        return SimilarityScorer(backend=self.config.similarity_backend)
+
+    @cached_property
+    def _segment_guard(self) -> SegmentGuard:
+        from token_optimizer.metrics.segments import SegmentGuard
+        return SegmentGuard(self._similarity, self.config.similarity_threshold)
+
+    @classmethod
+    def from_config(cls, config: OptimizerConfig) -> TokenOptimizer:
+        """Create an optimizer from an existing configuration."""
+        return cls(**asdict(config))
+
+    def _build_cache(self) -> PromptCache:
+        """Create the in-memory cache, backed by a disk tier if configured."""
+        disk = None
+        if self.config.cache_dir is not None:
+            from token_optimizer.cache.disk_cache import DiskCache
+            disk = DiskCache(
+                self.config.cache_dir, max_bytes=self.config.cache_dir_max_bytes
+            )
+        return PromptCache(
+            maxsize=self.config.cache_maxsize,
+            disk=disk,
+            max_bytes=self.config.cache_max_bytes,
+            admission=self.config.cache_admission,
+            ttl=self.config.cache_ttl,
+        )
+
+    def cache_stats(self) -> CacheStats | None:
+        """Return the cache's hit/miss/eviction counters, or None if disabled."""
+        return None if self._cache is None else self._cache.stats()
+
+    def token_memo_stats(self) -> TokenMemoStats | None:
+        """Return the token-count memo's counters, or None if not in use."""
+        memo = self._calculator.memo
+        return None if memo is None else memo.stats()
+
+    @property
+    def strategy(self) -> BaseStrategy:
+        """The strategy instance this optimizer runs."""
+        return self._strategy
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens in ``text`` with the model's tokenizer."""
+        return self._calculator.count_tokens(text)
 
     def _build_strategy(self, strategy: StrategyName) -> BaseStrategy:
         """Create the appropriate strategy instance."""
+        dedup = {
+            "redundancy_mode": self.config.redundancy_mode,
+            "cross_paragraph": self.config.cross_paragraph_dedup,
+        }
         if strategy == "conservative":
             from token_optimizer.strategies.conservative import ConservativeStrategy
-            return ConservativeStrategy()
+            return ConservativeStrategy(**dedup)
         elif strategy == "aggressive":
             from token_optimizer.strategies.aggressive import AggressiveStrategy
-            return AggressiveStrategy()
+            return AggressiveStrategy(**dedup)
         elif strategy == "moderate":
             from token_optimizer.strategies.moderate import ModerateStrategy
-            return ModerateStrategy()
+            return ModerateStrategy(**dedup)
+        elif strategy == "best":
+            from token_optimizer.strategies.aggressive import AggressiveStrategy
+            from token_optimizer.strategies.conservative import ConservativeStrategy
+            from token_optimizer.strategies.moderate import ModerateStrategy
+            return BestOfStrategy([
+                ConservativeStrategy(**dedup),
+                ModerateStrategy(**dedup),
+                AggressiveStrategy(**dedup),
+            ])
         elif strategy == "custom":
             from token_optimizer.strategies.custom import CustomStrategy
             return CustomStrategy(analyzers=[])
         else:
             from token_optimizer.strategies.moderate import ModerateStrategy
-            return ModerateStrategy()
+            return ModerateStrategy(**dedup)
+
+    @cached_property
+    def _budget_ladder(self) -> list[BaseStrategy]:
+        """Strategies tried in order by ``optimize(..., max_tokens=...)``."""
+        return [
+            self._build_strategy("conservative"),
+            self._build_strategy("moderate"),
+            self._build_strategy("aggressive"),
+        ]
+
+    def _cache_variant(
+        self, keywords: list[str], max_tokens: int | None = None
+    ) -> str:
+        """Fingerprint of the settings, besides the text, that shape a result."""
+        config = self.config
+        budget = (
+            ()
+            if max_tokens is None
+            else (("max_tokens", max_tokens, config.budget_pruning),)
+        )
+        return config_fingerprint(
+            *budget,
+            config.model,
+            self._model_info.cost_per_1k_input,
+            self._model_info.cost_per_1k_output,
+            config.similarity_threshold,
+            config.similarity_backend,
+            config.similarity_guard,
+            config.redundancy_mode,
+            config.cross_paragraph_dedup,
+            sorted(set(keywords)),
+        )
+
+    def _from_cache(
+        self, full_text: str, fingerprint: Fingerprint, variant: str
+    ) -> OptimizationResult | None:
+        """Return the cached result for ``full_text``, or None on a miss."""
+        if self._cache is None:
+            return None
+        cached = self._cache.get(
+            full_text, self._strategy.name, fingerprint=fingerprint, variant=variant
+        )
+        if cached is None:
+            return None
+        return replace(cached, from_cache=True)
+
+    def _to_cache(
+        self,
+        full_text: str,
+        fingerprint: Fingerprint,
+        variant: str,
+        result: OptimizationResult,
+    ) -> None:
+        if self._cache is not None:
+            self._cache.put(
+                full_text,
+                self._strategy.name,
+                result,
+                fingerprint=fingerprint,
+                variant=variant,
+            )
+
+    def _run_strategy(
+        self, text: str, keywords: list[str], profiler: Profiler | None = None
+    ) -> tuple[str, float, str]:
+        """Run the strategy and similarity check on ``text``.
+
+        Returns:
+            (optimized_text, similarity_score, strategy_used)
+        """
+        return self._run_strategy_batch([text], keywords, profiler)[0]
+
+    def _run_strategy_batch(
+        self,
+        texts: Sequence[str],
+        keywords: list[str],
+        profiler: Profiler | None = None,
+    ) -> list[tuple[str, float, str]]:
+        """Run the strategy on many texts, scoring similarity in one batch.
+
+        Each text gets a StageMemo, so a conservative fallback reuses the
+        stages it shares with the first attempt.
+
+        Returns:
+            One (optimized_text, similarity_score, strategy_used) per text.
+        """
+        if isinstance(self._strategy, BestOfStrategy):
+            return self._select_best(self._strategy, texts, keywords, profiler)
+
+        strategy_name = self._strategy.name
+        start = perf_counter()
+        memos = [StageMemo(profiler) for _ in texts]
+        optimized = [
+            self._strategy.optimize_memoized(text, memo, keywords)
+            for text, memo in zip(texts, memos)
+        ]
+        if profiler is not None:
+            profiler.record("phase", "strategy", start, texts, optimized)
+        start = perf_counter()
+        similarity = self._similarity.score_batch(texts, optimized)
+        if profiler is not None:
+            profiler.record("phase", "similarity", start)
+        outcomes = [
+            (text, score, strategy_name) for text, score in zip(optimized, similarity)
+        ]
+
+        threshold = self.config.similarity_threshold
+        low = [i for i, score in enumerate(similarity) if score < threshold]
+        if not low:
+            return outcomes
+        if self.config.similarity_guard == "segment":
+            # Revert only the sentences that fell below the threshold.
+            start = perf_counter()
+            repaired = self._repair_segments(
+                [texts[i] for i in low], [optimized[i] for i in low]
+            )
+            for i, outcome in zip(low, repaired):
+                if outcome is not None:
+                    text, score = outcome
+                    outcomes[i] = (text, score, f"{strategy_name}->repaired")
+            self._count_fallbacks("repaired", sum(o is not None for o in repaired))
+            if profiler is not None:
+                profiler.record(
+                    "phase",
+                    "repair",
+                    start,
+                    [optimized[i] for i in low],
+                    [outcomes[i][0] for i in low],
+                )
+            return outcomes
+
+        # If similarity is too low, fall back to conservative
+        if strategy_name == "conservative":
+            return outcomes
+        start = perf_counter()
+        fallback = self._build_strategy("conservative")
+        retried = [
+            fallback.optimize_memoized(texts[i], memos[i], keywords) for i in low
+        ]
+        if profiler is not None:
+            profiler.record(
+                "phase", "fallback", start, [texts[i] for i in low], retried
+            )
+        start = perf_counter()
+        rescored = self._similarity.score_batch([texts[i] for i in low], retried)
+        if profiler is not None:
+            profiler.record("phase", "similarity", start)
+        for i, text, score in zip(low, retried, rescored):
+            outcomes[i] = (text, score, f"{strategy_name}->conservative")
+        self._count_fallbacks("conservative", len(low))
+        return outcomes
+
+    def _count_fallbacks(self, kind: str, count: int) -> None:
+        """Count ``count`` fallbacks of ``kind`` in the telemetry registry."""
+        if self._telemetry is not None and count:
+            self._telemetry.inc("fallbacks", (self.config.model, kind), count)
+
+    def _repair_segments(
+        self, originals: list[str], optimizeds: list[str]
+    ) -> list[tuple[str, float] | None]:
+        """Segment-level repair of texts that failed the similarity check.
+
+        Returns:
+            Per text, the repaired text and its new similarity, or None if
+            no segment needed reverting.
+        """
+        repaired = self._segment_guard.repair_batch(originals, optimizeds)
+        changed = [i for i, (_, reverted) in enumerate(repaired) if reverted]
+        rescored = self._similarity.score_batch(
+            [originals[i] for i in changed], [repaired[i][0] for i in changed]
+        )
+        outcomes: list[tuple[str, float] | None] = [None] * len(originals)
+        for i, score in zip(changed, rescored):
+            outcomes[i] = (repaired[i][0], score)
+        return outcomes
+
+    def _select_best(
+        self,
+        strategy: BestOfStrategy,
+        texts: Sequence[str],
+        keywords: list[str],
+        profiler: Profiler | None = None,
+    ) -> list[tuple[str, float, str]]:
+        """Pick, per text, the most compressed candidate meeting the threshold.
+
+        Ties go to the less aggressive candidate.  If no candidate meets the
+        threshold, the least aggressive one is used, as with fallback; with
+        the segment guard, the most compressed one is repaired instead.
+        Only those two cases count as fallbacks: a least aggressive
+        candidate chosen on its merits does not.
+        """
+        start = perf_counter()
+        evaluated = [
+            strategy.evaluate(text, keywords, StageMemo(profiler)) for text in texts
+        ]
+        if profiler is not None:
+            # No sizes: each text has several candidate outputs.
+            profiler.record("phase", "strategy", start)
+        width = len(strategy.candidates)
+        candidates = [optimized for outcomes in evaluated for _, optimized in outcomes]
+        start = perf_counter()
+        similarity = self._similarity.score_batch(
+            [text for text in texts for _ in range(width)], candidates
+        )
+        if profiler is not None:
+            profiler.record("phase", "similarity", start)
+        start = perf_counter()
+        distinct = list(dict.fromkeys(candidates))
+        tokens = dict(zip(distinct, self._calculator.count_tokens_batch(distinct)))
+        if profiler is not None:
+            profiler.record("phase", "counting", start)
+
+        threshold = self.config.similarity_threshold
+        segment_guard = self.config.similarity_guard == "segment"
+        selected = []
+        unresolved = []
+        for row, outcomes in enumerate(evaluated):
+            scores = similarity[row * width : (row + 1) * width]
+            passing = [
+                (tokens[optimized], i)
+                for i, (_, optimized) in enumerate(outcomes)
+                if scores[i] >= threshold
+            ]
+            if passing:
+                choice = min(passing)[1]
+            elif segment_guard:
+                choice = min(
+                    (tokens[optimized], i) for i, (_, optimized) in enumerate(outcomes)
+                )[1]
+                unresolved.append(row)
+            else:
+                choice = 0
+                self._count_fallbacks("conservative", 1)
+            name, optimized = outcomes[choice]
+            selected.append((optimized, scores[choice], f"best->{name}"))
+
+        if unresolved:
+            start = perf_counter()
+            before = [selected[row][0] for row in unresolved]
+            repaired = self._repair_segments(
+                [texts[row] for row in unresolved], before
+            )
+            for row, outcome in zip(unresolved, repaired):
+                if outcome is not None:
+                    text, score = outcome
+                    selected[row] = (text, score, f"{selected[row][2]}->repaired")
+            self._count_fallbacks("repaired", sum(o is not None for o in repaired))
+            if profiler is not None:
+                profiler.record(
+                    "phase",
+                    "repair",
+                    start,
+                    before,
+                    [selected[row][0] for row in unresolved],
+                )
+        return selected
 
     def optimize(
         self,
         prompt: str,
         system_prompt: str | None = None,
         preserve_keywords: list[str] | None = None,
+        max_tokens: int | None = None,
     ) -> OptimizationResult:
         """Optimize a prompt to reduce token count.
 
@@ -87,10 +494,22 @@ class TokenOptimizer:
             prompt: The user prompt to optimize.
             system_prompt: Optional system prompt to also optimize.
             preserve_keywords: Additional keywords to preserve (merged with config).
+            max_tokens: Token budget.  When given, the configured strategy
+                is ignored: a prompt already within budget is returned
+                unchanged after a single count; otherwise analyzers run one
+                at a time through conservative, moderate and aggressive
+                until the text fits (see :meth:`_optimize_to_budget`).
 
         Returns:
             OptimizationResult with original/optimized text and metrics.
+            In budget mode, ``optimized_tokens`` may still exceed
+            ``max_tokens`` if even aggressive optimization is not enough,
+            unless ``budget_pruning`` is set, in which case sentences are
+            dropped until it fits (preserved-keyword sentences excepted).
         """
+        if max_tokens is not None and max_tokens < 0:
+            raise ValueError("max_tokens must be non-negative")
+        called = perf_counter()
         keywords = list(self.config.preserve_keywords)
         if preserve_keywords:
             keywords.extend(preserve_keywords)
@@ -100,53 +519,216 @@ class TokenOptimizer:
         if system_prompt:
             full_text = f"{system_prompt}\n\n{prompt}"
 
-        # Check cache
-        strategy_name = self._strategy.name
-        if self._cache is not None:
-            cached = self._cache.get(full_text, strategy_name)
-            if cached is not None:
-                original_tokens = self._calculator.count_tokens(full_text)
-                optimized_tokens = self._calculator.count_tokens(cached)
-                savings_pct, cost_savings = self._calculator.calculate_savings(
-                    original_tokens, optimized_tokens
-                )
-                return OptimizationResult(
-                    original_text=full_text,
-                    optimized_text=cached,
-                    original_tokens=original_tokens,
-                    optimized_tokens=optimized_tokens,
-                    savings_percent=savings_pct,
-                    estimated_cost_savings=cost_savings,
-                    similarity_score=1.0,
-                    strategy_used=strategy_name,
-                    from_cache=True,
-                )
+        profiler = Profiler() if self.config.profile else None
 
-        # Run optimization
-        optimized = self._strategy.optimize(full_text, preserve_keywords=keywords)
+        # Check cache; the fingerprint is computed once and reused for the store
+        start = perf_counter()
+        fingerprint = Fingerprint.of(full_text)
+        variant = self._cache_variant(keywords, max_tokens)
+        cached = self._from_cache(full_text, fingerprint, variant)
+        if profiler is not None and self._cache is not None:
+            profiler.record("phase", "cache.lookup", start)
+        if cached is not None:
+            if self._telemetry is not None:
+                self._record_telemetry("optimize_seconds", called, [cached], hits=1)
+            return self._with_profile(cached, profiler)
 
-        # Compute similarity
-        similarity = self._similarity.score(full_text, optimized)
+        if max_tokens is None:
+            result = self._optimize_uncached(
+                full_text, keywords, fingerprint, profiler
+            )
+        else:
+            result = self._optimize_to_budget(
+                full_text, keywords, max_tokens, fingerprint, profiler
+            )
+        start = perf_counter()
+        self._to_cache(full_text, fingerprint, variant, result)
+        if profiler is not None and self._cache is not None:
+            profiler.record("phase", "cache.store", start)
+        if self._telemetry is not None:
+            self._record_telemetry("optimize_seconds", called, [result], misses=1)
+        return self._with_profile(result, profiler)
 
-        # If similarity is too low, fall back to conservative
-        if similarity < self.config.similarity_threshold and strategy_name != "conservative":
-            from token_optimizer.strategies.conservative import ConservativeStrategy
-            fallback = ConservativeStrategy()
-            optimized = fallback.optimize(full_text, preserve_keywords=keywords)
-            similarity = self._similarity.score(full_text, optimized)
-            strategy_name = f"{self._strategy.name}->conservative"
+    def _with_profile(
+        self, result: OptimizationResult, profiler: Profiler | None
+    ) -> OptimizationResult:
+        """Attach the finished profile to a copy of ``result``.
 
-        # Calculate metrics
-        original_tokens = self._calculator.count_tokens(full_text)
-        optimized_tokens = self._calculator.count_tokens(optimized)
-        savings_pct, cost_savings = self._calculator.calculate_savings(
-            original_tokens, optimized_tokens
+        The cache keeps the result without it: a profile describes one call.
+        """
+        if profiler is None:
+            return result
+        # Deferred: a cache hit records no texts and needs no tokenizer.
+        profile = profiler.finish(
+            lambda texts: self._calculator.count_tokens_batch(texts)
         )
+        return replace(result, profile=profile)
+
+    def _record_telemetry(
+        self,
+        histogram: str,
+        called: float,
+        returned: Sequence[OptimizationResult],
+        hits: int = 0,
+        misses: int = 0,
+    ) -> None:
+        """Record one optimize or optimize_batch call in the telemetry registry.
+
+        Fallbacks are counted where they happen, by :meth:`_count_fallbacks`.
 
-        # Cache result
+        Args:
+            histogram: Latency histogram to observe the call in.
+            called: ``perf_counter()`` value taken when the call began.
+            returned: The results returned, one per prompt.
+            hits: Number of distinct prompts answered from the cache.
+            misses: Number of distinct prompts optimized in this call.
+        """
+        telemetry = self._telemetry
+        assert telemetry is not None
+        labels = (self.config.model,)
+        telemetry.inc("prompts", labels, len(returned))
+        telemetry.inc("tokens_saved", labels, sum(r.tokens_saved for r in returned))
+        telemetry.inc(
+            "cost_saved_dollars",
+            labels,
+            sum(r.estimated_cost_savings for r in returned),
+        )
         if self._cache is not None:
-            self._cache.put(full_text, self._strategy.name, optimized)
+            telemetry.inc("cache_hits", labels, hits)
+            telemetry.inc("cache_misses", labels, misses)
+        telemetry.observe(histogram, labels, perf_counter() - called)
+
+    def _optimize_uncached(
+        self,
+        full_text: str,
+        keywords: list[str],
+        fingerprint: Fingerprint | None = None,
+        profiler: Profiler | None = None,
+    ) -> OptimizationResult:
+        """Optimize ``full_text`` and measure the result, bypassing the cache."""
+        # Run optimization, falling back to conservative if needed
+        outcome = self._run_strategy(full_text, keywords, profiler)
+
+        # Calculate metrics
+        start = perf_counter()
+        original_tokens = self._calculator.count_tokens(full_text, fingerprint)
+        optimized_tokens = self._calculator.count_tokens(outcome[0])
+        if profiler is not None:
+            profiler.record("phase", "counting", start)
+        return self._make_result(full_text, outcome, original_tokens, optimized_tokens)
+
+    def _optimize_to_budget(
+        self,
+        full_text: str,
+        keywords: list[str],
+        max_tokens: int,
+        fingerprint: Fingerprint | None = None,
+        profiler: Profiler | None = None,
+    ) -> OptimizationResult:
+        """Escalate through analyzers only until ``full_text`` fits the budget.
 
+        Each level runs on the previous level's output, one analyzer at a
+        time, sharing a StageMemo so stages repeated across levels on
+        unchanged text are free.  After each analyzer that changes the text
+        the budget is checked with an IncrementalCounter, which encodes
+        only the lines and sentences that changed; a fit is confirmed with
+        one exact count of the whole text.  Checks are skipped while the
+        text's length, at the original's tokens per character, is more
+        than ``_BUDGET_SLACK`` times the budget.  If aggressive is not
+        enough and ``budget_pruning`` is set, a SentencePruner drops the
+        least central sentences.  Similarity is scored once, on the final
+        text, and reported but not enforced: the budget wins.
+
+        Profiled, each level is one phase, including its budget checks.
+        """
+        start = perf_counter()
+        original_tokens = self._calculator.count_tokens(full_text, fingerprint)
+        if profiler is not None:
+            profiler.record("phase", "counting", start)
+        if original_tokens <= max_tokens:
+            return self._make_result(
+                full_text, (full_text, 1.0, "budget"), original_tokens, original_tokens
+            )
+
+        counter = IncrementalCounter(self._calculator)
+        memo = StageMemo(profiler)
+        # Skip counting while a length-scaled estimate is clearly over budget.
+        tokens_per_char = original_tokens / len(full_text)
+        text: str = full_text
+        tokens: int | None = original_tokens  # None: text changed, not counted
+        strategy_used = "budget"
+        for level in self._budget_ladder:
+            start = perf_counter()
+            level_input = text
+            for group in level.stage_groups(keywords) or []:
+                optimized = memo.run(group, text)
+                if optimized == text:
+                    continue
+                text, tokens = optimized, None
+                strategy_used = f"budget->{level.name}"
+                if len(text) * tokens_per_char > max_tokens * _BUDGET_SLACK:
+                    continue
+                if counter.count(text) <= max_tokens:
+                    tokens = self._calculator.count_tokens(text)
+                    if tokens <= max_tokens:
+                        break
+            if profiler is not None:
+                profiler.record(
+                    "phase", f"budget.{level.name}", start, (level_input,), (text,)
+                )
+            if tokens is not None and tokens <= max_tokens:
+                break
+        if tokens is None:
+            start = perf_counter()
+            tokens = self._calculator.count_tokens(text)
+            if profiler is not None:
+                profiler.record("phase", "counting", start)
+        if tokens > max_tokens and self.config.budget_pruning:
+            start = perf_counter()
+            pruner = SentencePruner(max_tokens, self._calculator.count_tokens_batch)
+            pruned = pruner.analyze(text, keywords)
+            if profiler is not None:
+                profiler.record("phase", "pruning", start, (text,), (pruned,))
+            if pruned != text:
+                text, strategy_used = pruned, "budget->pruned"
+                tokens = self._calculator.count_tokens(text)
+
+        start = perf_counter()
+        similarity = self._similarity.score(full_text, text)
+        if profiler is not None:
+            profiler.record("phase", "similarity", start)
+        return self._make_result(
+            full_text, (text, similarity, strategy_used), original_tokens, tokens
+        )
+
+    def _measure_batch(
+        self,
+        texts: list[str],
+        outcomes: list[tuple[str, float, str]],
+        fingerprints: list[Fingerprint],
+    ) -> list[OptimizationResult]:
+        """Build results for many strategy outcomes with one bulk token count."""
+        optimized = [outcome[0] for outcome in outcomes]
+        counts = self._calculator.count_tokens_batch(
+            texts + optimized, [*fingerprints, *[None] * len(optimized)]
+        )
+        n = len(texts)
+        return [
+            self._make_result(text, outcome, counts[i], counts[n + i])
+            for i, (text, outcome) in enumerate(zip(texts, outcomes))
+        ]
+
+    def _make_result(
+        self,
+        full_text: str,
+        outcome: tuple[str, float, str],
+        original_tokens: int,
+        optimized_tokens: int,
+    ) -> OptimizationResult:
+        optimized, similarity, strategy_name = outcome
+        savings_pct, cost_savings = self._calculator.calculate_savings(
+            original_tokens, optimized_tokens
+        )
         return OptimizationResult(
             original_text=full_text,
             optimized_text=optimized,
@@ -157,3 +739,223 @@ class TokenOptimizer:
             similarity_score=similarity,
             strategy_used=strategy_name,
         )
+
+    def run_pipeline(
+        self, text: str, preserve_keywords: list[str] | None = None
+    ) -> tuple[str, float, str]:
+        """Run the strategy and similarity guard on ``text`` only.
+
+        Unlike :meth:`optimize`, this neither uses the cache nor counts
+        tokens, for callers that optimize a text in pieces.
+
+        Args:
+            text: The text to optimize.
+            preserve_keywords: Additional keywords to preserve (merged with config).
+
+        Returns:
+            (optimized_text, similarity_score, strategy_used)
+        """
+        keywords = list(self.config.preserve_keywords)
+        if preserve_keywords:
+            keywords.extend(preserve_keywords)
+        return self._run_strategy(text, keywords)
+
+    def optimize_stream(
+        self,
+        chunks: Iterable[str],
+        preserve_keywords: list[str] | None = None,
+        window_chars: int = 64_000,
+    ) -> OptimizationStream:
+        """Optimize a stream of text chunks with bounded memory.
+
+        Chunks are buffered to paragraph, line or sentence boundaries and
+        each window is optimized independently; optimized text is yielded
+        as soon as a window is complete.  The cache is not used.
+
+        Args:
+            chunks: Iterable of text pieces, e.g. an open file.
+            preserve_keywords: Additional keywords to preserve (merged with config).
+            window_chars: Approximate number of characters per window.
+
+        Returns:
+            An OptimizationStream yielding optimized chunks.  Its running
+            token counts are complete once it is exhausted.
+        """
+        from token_optimizer.streaming import OptimizationStream
+
+        return OptimizationStream(
+            self, chunks, preserve_keywords=preserve_keywords, window_chars=window_chars
+        )
+
+    async def optimize_async(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        preserve_keywords: list[str] | None = None,
+        executor: Executor | None = None,
+    ) -> OptimizationResult:
+        """Run :meth:`optimize` in an executor without blocking the event loop.
+
+        Args:
+            prompt: The user prompt to optimize.
+            system_prompt: Optional system prompt to also optimize.
+            preserve_keywords: Additional keywords to preserve (merged with config).
+            executor: Executor to run in. Defaults to the loop's default
+                executor. Use :class:`AsyncTokenOptimizer` for micro-batching
+                and backpressure.
+
+        Returns:
+            OptimizationResult with original/optimized text and metrics.
+        """
+        import asyncio
+        from functools import partial
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            partial(
+                self.optimize,
+                prompt,
+                system_prompt=system_prompt,
+                preserve_keywords=preserve_keywords,
+            ),
+        )
+
+    def optimize_batch(
+        self,
+        prompts: Sequence[str],
+        workers: int | None = None,
+        chunksize: int = 64,
+        preserve_keywords: list[str] | None = None,
+    ) -> list[OptimizationResult]:
+        """Optimize many prompts, fanning out to a process pool.
+
+        Identical prompts are optimized once, and prompts already in the
+        cache are served from it.  The rest are dispatched in chunks to
+        worker processes that each build their own optimizer once at
+        startup.  Token counts for the whole batch are then taken with the
+        tokenizer's bulk path, and the results are cached in this optimizer.
+
+        Args:
+            prompts: The prompts to optimize.
+            workers: Number of worker processes. Defaults to the CPU count;
+                ``1`` optimizes in the calling process.
+            chunksize: Number of prompts sent to a worker per task.
+            preserve_keywords: Additional keywords to preserve (merged with
+                config).
+
+        Returns:
+            One OptimizationResult per prompt, in input order.  Duplicate
+            prompts share the same result object.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        called = perf_counter()
+        keywords = list(self.config.preserve_keywords)
+        if preserve_keywords:
+            keywords.extend(preserve_keywords)
+        variant = self._cache_variant(keywords)
+
+        results: dict[str, OptimizationResult] = {}
+        pending: list[str] = []
+        fingerprints: dict[str, Fingerprint] = {}
+        for prompt in dict.fromkeys(prompts):
+            fingerprint = fingerprints[prompt] = Fingerprint.of(prompt)
+            cached = self._from_cache(prompt, fingerprint, variant)
+            if cached is not None:
+                results[prompt] = cached
+            else:
+                pending.append(prompt)
+
+        if workers == 1 or len(pending) <= 1:
+            outcomes = self._run_strategy_batch(pending, keywords)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            worker_config = replace(self.config, cache_enabled=False, cache_dir=None)
+            # Each task is one chunk, so workers score similarity per chunk.
+            chunks = [
+                pending[start : start + chunksize]
+                for start in range(0, len(pending), chunksize)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_init_batch_worker,
+                initargs=(worker_config,),
+            ) as pool:
+                outcomes = []
+                for chunk_outcomes, fallbacks in pool.map(
+                    _run_strategy_in_worker, chunks, [keywords] * len(chunks)
+                ):
+                    outcomes.extend(chunk_outcomes)
+                    for kind, count in fallbacks.items():
+                        self._count_fallbacks(kind, count)
+
+        # Token counts for all prompts go through the tokenizer's bulk path.
+        measured = self._measure_batch(
+            pending, outcomes, [fingerprints[prompt] for prompt in pending]
+        )
+        for prompt, result in zip(pending, measured):
+            results[prompt] = result
+            self._to_cache(prompt, fingerprints[prompt], variant, result)
+
+        returned = [results[prompt] for prompt in prompts]
+        if self._telemetry is not None:
+            self._record_telemetry(
+                "batch_seconds",
+                called,
+                returned,
+                hits=len(results) - len(pending),
+                misses=len(pending),
+            )
+        return returned
+
+
+# Optimizer owned by each optimize_batch worker process.
+_WARMUP_PROMPT = "Please write a function. In order to test it, add tests."
+_worker_optimizer: TokenOptimizer | None = None
+
+
+def _init_batch_worker(config: OptimizerConfig) -> None:
+    """Build the worker's optimizer once and warm its pattern caches.
+
+    With telemetry on, the worker counts fallbacks in a registry of its
+    own, drained per chunk and reported to the parent.
+    """
+    global _worker_optimizer
+    _worker_optimizer = TokenOptimizer.from_config(replace(config, telemetry=False))
+    _worker_optimizer.optimize(_WARMUP_PROMPT)
+    if config.telemetry:
+        from token_optimizer.metrics.telemetry import Telemetry
+
+        _worker_optimizer._telemetry = Telemetry()
+
+
+def _run_strategy_in_worker(
+    prompts: list[str], keywords: list[str]
+) -> tuple[list[tuple[str, float, str]], dict[str, int]]:
+    """Run the worker's strategy pipeline on one chunk of prompts.
+
+    Token counting is left to the parent, which counts the whole batch at
+    once.
+
+    Returns:
+        The chunk's outcomes, and its fallback counts by kind.
+    """
+    assert _worker_optimizer is not None, "worker was not initialized"
+    outcomes = _worker_optimizer._run_strategy_batch(prompts, keywords)
+    telemetry = _worker_optimizer._telemetry
+    if telemetry is None:
+        return outcomes, {}
+    fallbacks = {
+        labels[1]: int(count)
+        for (name, labels), count in telemetry.counters().items()
+        if name == "fallbacks"
+    }
+    telemetry.reset()
+    return outcomes, fallbacks
@@ -1,6 +1,58 @@
 """Metrics for measuring optimization effectiveness."""
 
-from token_optimizer.metrics.calculator import TokenCalculator
-from token_optimizer.metrics.similarity import SimilarityScorer
+from typing import TYPE_CHECKING
 
-__all__ = ["TokenCalculator", "SimilarityScorer"]
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.metrics.calculator import TokenCalculator
+    from token_optimizer.metrics.hashing import HashingBackend
+    from token_optimizer.metrics.profiling import Profiler
+    from token_optimizer.metrics.segments import SegmentGuard
+    from token_optimizer.metrics.telemetry import (
+        Telemetry,
+        serve_metrics,
+        shared_telemetry,
+    )
+    from token_optimizer.metrics.similarity import (
+        EmbeddingBackend,
+        KeywordBackend,
+        SimilarityBackend,
+        SimilarityScorer,
+    )
+    from token_optimizer.metrics.token_memo import TokenCountMemo, shared_token_memo
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TokenCalculator": "token_optimizer.metrics.calculator",
+        "SimilarityScorer": "token_optimizer.metrics.similarity",
+        "SimilarityBackend": "token_optimizer.metrics.similarity",
+        "KeywordBackend": "token_optimizer.metrics.similarity",
+        "EmbeddingBackend": "token_optimizer.metrics.similarity",
+        "HashingBackend": "token_optimizer.metrics.hashing",
+        "SegmentGuard": "token_optimizer.metrics.segments",
+        "Profiler": "token_optimizer.metrics.profiling",
+        "Telemetry": "token_optimizer.metrics.telemetry",
+        "shared_telemetry": "token_optimizer.metrics.telemetry",
+        "serve_metrics": "token_optimizer.metrics.telemetry",
+        "TokenCountMemo": "token_optimizer.metrics.token_memo",
+        "shared_token_memo": "token_optimizer.metrics.token_memo",
+    },
+)
+
+__all__ = [
+    "TokenCalculator",
+    "SimilarityScorer",
+    "SimilarityBackend",
+    "KeywordBackend",
+    "EmbeddingBackend",
+    "HashingBackend",
+    "SegmentGuard",
+    "Profiler",
+    "Telemetry",
+    "shared_telemetry",
+    "serve_metrics",
+    "TokenCountMemo",
+    "shared_token_memo",
+]
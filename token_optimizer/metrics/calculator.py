@@ -2,25 +2,99 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import re
+from typing import TYPE_CHECKING, Sequence
+
+from token_optimizer.cache.keys import Fingerprint
 
 if TYPE_CHECKING:
+    from token_optimizer.metrics.token_memo import TokenCountMemo
     from token_optimizer.tokenizers.base import BaseTokenizer
     from token_optimizer.providers.registry import ModelInfo
 
+# Positions where tiktoken's pre-tokenizer always starts a new token: after
+# a newline that precedes non-whitespace, and before the space that starts a
+# word after a sentence end (see ``split_at_safe_boundaries``).
+_CHUNK_BOUNDARY = re.compile(r"(?<=\n)(?=\S)|(?<=[.!?])(?= [A-Za-z])")
+
 
 class TokenCalculator:
-    """Calculates token counts and cost savings."""
+    """Calculates token counts and cost savings.
+
+    With a ``memo``, counts are remembered by content fingerprint, so
+    recounting a text seen before is a hash lookup instead of an encode.
+    The memo must belong to this calculator's tokenizer identity.
+    """
 
-    def __init__(self, tokenizer: BaseTokenizer, model_info: ModelInfo) -> None:
+    def __init__(
+        self,
+        tokenizer: BaseTokenizer,
+        model_info: ModelInfo,
+        memo: TokenCountMemo | None = None,
+    ) -> None:
         self._tokenizer = tokenizer
         self._model_info = model_info
+        self.memo = memo
 
-    def count_tokens(self, text: str) -> int:
-        """Count the number of tokens in text."""
+    def count_tokens(self, text: str, fingerprint: Fingerprint | None = None) -> int:
+        """Count the number of tokens in text.
+
+        Args:
+            text: The text to count.
+            fingerprint: Precomputed ``Fingerprint.of(text)``, if available,
+                used as the memo key.
+        """
         if not text:
             return 0
-        return self._tokenizer.count_tokens(text)
+        if self.memo is None:
+            return self._tokenizer.count_tokens(text)
+
+        digest = (fingerprint or Fingerprint.of(text)).digest
+        count = self.memo.get(digest)
+        if count is None:
+            count = self._tokenizer.count_tokens(text)
+            self.memo.put(digest, count)
+        return count
+
+    def count_tokens_batch(
+        self,
+        texts: Sequence[str],
+        fingerprints: Sequence[Fingerprint | None] | None = None,
+    ) -> list[int]:
+        """Count tokens for many texts with the tokenizer's bulk path.
+
+        Memoized texts are answered from the memo; the rest are counted in
+        one ``count_tokens_batch`` call.
+
+        Args:
+            texts: The texts to count.
+            fingerprints: Optional precomputed fingerprints, parallel to
+                ``texts``; ``None`` entries are computed as needed.
+        """
+        counts = [0] * len(texts)
+        pending: list[int] = []
+        digests: list[bytes] = []
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            if self.memo is not None:
+                fingerprint = fingerprints[i] if fingerprints is not None else None
+                digest = (fingerprint or Fingerprint.of(text)).digest
+                count = self.memo.get(digest)
+                if count is not None:
+                    counts[i] = count
+                    continue
+                digests.append(digest)
+            pending.append(i)
+
+        if pending:
+            fresh = self._tokenizer.count_tokens_batch([texts[i] for i in pending])
+            for i, count in zip(pending, fresh):
+                counts[i] = count
+            if self.memo is not None:
+                for digest, count in zip(digests, fresh):
+                    self.memo.put(digest, count)
+        return counts
 
     def calculate_cost(self, token_count: int, is_input: bool = True) -> float:
         """Calculate the cost for a given number of tokens."""
@@ -50,3 +124,32 @@ class TokenCalculator:
         cost_savings = cost_original - cost_optimized
 
         return savings_percent, cost_savings
+
+
+class IncrementalCounter:
+    """Counts successive versions of one text, encoding only what changed.
+
+    Each version is cut into lines and sentences at boundaries no token
+    spans, and chunk counts are remembered, so after a rewrite that touches
+    a few sentences only those are encoded again.  New chunks go through
+    the calculator's bulk path and its memo.
+
+    The sum of chunk counts can differ slightly from a whole-text count
+    (word-count estimators round per chunk; tiktoken's older encodings
+    treat some whitespace runs differently), so use it to decide when to
+    stop and confirm the final text with :meth:`TokenCalculator.count_tokens`.
+    """
+
+    def __init__(self, calculator: TokenCalculator) -> None:
+        self._calculator = calculator
+        self._counts: dict[str, int] = {}
+        self.counted_chars = 0
+
+    def count(self, text: str) -> int:
+        """Return the token count of ``text``, summed over its chunks."""
+        chunks = _CHUNK_BOUNDARY.split(text)
+        new = [chunk for chunk in dict.fromkeys(chunks) if chunk not in self._counts]
+        if new:
+            self._counts.update(zip(new, self._calculator.count_tokens_batch(new)))
+            self.counted_chars += sum(map(len, new))
+        return sum(map(self._counts.__getitem__, chunks))
@@ -0,0 +1,253 @@
+"""Model-free similarity from hashed word and character n-gram TF-IDF vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
+
+from token_optimizer.metrics.similarity import (
+    _NUMPY_MIN_BATCH,
+    _SEPARATOR,
+    _STOP_WORDS,
+    _WORD_OR_SEPARATOR,
+    SimilarityBackend,
+    extract_keywords,
+)
+
+_MASK = (1 << 64) - 1
+# Mixes the left word's hash into a bigram feature (64-bit golden ratio).
+_BIGRAM_MUL = 0x9E3779B97F4A7C15
+
+
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature string, the same in every process."""
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_features(
+    word: str, low: int, high: int, n_features: int
+) -> tuple[int, tuple[int, ...]]:
+    """Hash of ``word`` and the buckets of its own and its n-gram features.
+
+    The unbucketed word hash is kept for building bigram features.
+    """
+    padded = f" {word} "
+    word_hash = _feature_hash("w\x1f" + word)
+    features = [word_hash] + [
+        _feature_hash("c\x1f" + padded[i : i + n])
+        for n in range(low, high + 1)
+        for i in range(len(padded) - n + 1)
+    ]
+    return word_hash, tuple(feature % n_features for feature in features)
+
+
+class HashingBackend(SimilarityBackend):
+    """Cosine similarity of hashed TF-IDF vectors; no model download needed.
+
+    Each keyword (stop words are dropped, as for keyword overlap)
+    contributes a word feature, its character n-grams and, optionally, a
+    bigram with the preceding keyword.  Features are hashed into
+    ``n_features`` buckets, so no vocabulary is stored.  Character n-grams
+    make inflections such as "function" and "functions" overlap, and
+    bigrams reward preserved word order.
+
+    Weights are ``1 + log(tf)``, multiplied by the inverse document
+    frequency learned with :meth:`fit`; before fitting, every feature has
+    the same IDF.  Batches are scored with numpy when it is installed, with
+    a pure-Python path otherwise.
+
+    Args:
+        n_features: Number of hash buckets.
+        char_ngrams: Smallest and largest character n-gram length.
+        word_bigrams: Whether to add features for adjacent keyword pairs.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 1 << 18,
+        char_ngrams: tuple[int, int] = (3, 5),
+        word_bigrams: bool = True,
+    ) -> None:
+        low, high = char_ngrams
+        if n_features < 1:
+            raise ValueError("n_features must be at least 1")
+        if not 1 <= low <= high:
+            raise ValueError("char_ngrams must satisfy 1 <= low <= high")
+        self._n_features = n_features
+        self._ngrams = (low, high)
+        self._word_bigrams = word_bigrams
+        self._documents = 0
+        self._df: Counter[int] = Counter()
+        self._idf_array: Any = None
+
+    @property
+    def name(self) -> str:
+        return "hashing"
+
+    def fit(self, documents: Iterable[str]) -> HashingBackend:
+        """Learn inverse document frequencies from representative texts.
+
+        Features common to many documents, such as boilerplate shared by
+        every prompt, then count less toward similarity.  Calling ``fit``
+        again adds to the statistics already learned.
+
+        Returns:
+            This backend, for chaining.
+        """
+        for document in documents:
+            self._documents += 1
+            self._df.update(set(self._buckets(document)))
+        self._idf_array = None
+        return self
+
+    def _idf(self, bucket: int) -> float:
+        if not self._documents:
+            return 1.0
+        return math.log((1 + self._documents) / (1 + self._df[bucket])) + 1.0
+
+    def _buckets(self, text: str) -> list[int]:
+        """Hash bucket of every feature occurrence in ``text``."""
+        low, high = self._ngrams
+        width = self._n_features
+        buckets: list[int] = []
+        previous = None
+        for word in extract_keywords(text):
+            word_hash, word_buckets = _word_features(word, low, high, width)
+            buckets.extend(word_buckets)
+            if self._word_bigrams and previous is not None:
+                bigram = ((previous * _BIGRAM_MUL) ^ word_hash) & _MASK
+                buckets.append(bigram % width)
+            previous = word_hash
+        return buckets
+
+    def _vector(self, text: str) -> dict[int, float]:
+        counts = Counter(self._buckets(text))
+        if not self._documents:
+            return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+        return {
+            bucket: (1.0 + math.log(count)) * self._idf(bucket)
+            for bucket, count in counts.items()
+        }
+
+    def score(self, original: str, optimized: str) -> float:
+        """Cosine similarity of the two texts' TF-IDF vectors."""
+        left = self._vector(original)
+        right = self._vector(optimized)
+        if not left or not right:
+            return 1.0 if not left and not right else 0.0
+        if len(right) < len(left):
+            left, right = right, left
+        dot = sum(weight * right.get(bucket, 0.0) for bucket, weight in left.items())
+        norms = math.sqrt(
+            sum(w * w for w in left.values()) * sum(w * w for w in right.values())
+        )
+        return min(1.0, dot / norms)
+
+    def score_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float]:
+        if len(originals) >= _NUMPY_MIN_BATCH:
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+            else:
+                scores = self._score_numpy(np, originals, optimizeds)
+                if scores is not None:
+                    return scores
+        return [
+            self.score(original, optimized)
+            for original, optimized in zip(originals, optimizeds)
+        ]
+
+    def _dense_idf(self, np: Any) -> Any:
+        if self._idf_array is None:
+            if not self._documents:
+                self._idf_array = np.ones(self._n_features)
+            else:
+                df = np.zeros(self._n_features)
+                df[list(self._df)] = list(self._df.values())
+                self._idf_array = np.log((1 + self._documents) / (1 + df)) + 1.0
+        return self._idf_array
+
+    def _score_numpy(
+        self, np: Any, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float] | None:
+        """Vectorized scoring of a whole batch.
+
+        Words are extracted from every text in one pass and mapped to their
+        cached feature buckets; each feature occurrence becomes a
+        ``text * n_features + bucket`` key, so term frequencies, norms and
+        dot products reduce to np.unique, bincount and a sorted intersection.
+        """
+        n = len(originals)
+        joined = _SEPARATOR.join([*originals, *optimizeds]).lower()
+        if joined.count(_SEPARATOR) != 2 * n - 1:
+            return None  # a text contains the separator itself
+
+        tokens = _WORD_OR_SEPARATOR.findall(joined)
+        vocabulary = {w: i for i, w in enumerate(dict.fromkeys(tokens))}
+        ids = np.fromiter(
+            map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens)
+        )
+        texts = np.cumsum(ids == vocabulary[_SEPARATOR])
+
+        # Per vocabulary word: its word hash and a slice of all feature buckets.
+        low, high = self._ngrams
+        width = self._n_features
+        word_hashes = np.zeros(len(vocabulary), dtype=np.uint64)
+        lengths = np.zeros(len(vocabulary), dtype=np.int64)
+        flat: list[int] = []
+        for word, i in vocabulary.items():
+            if word not in _STOP_WORDS and len(word) > 1:
+                word_hash, word_buckets = _word_features(word, low, high, width)
+                word_hashes[i] = word_hash
+                lengths[i] = len(word_buckets)
+                flat.extend(word_buckets)
+        starts = np.cumsum(lengths) - lengths
+        features = np.array(flat, dtype=np.int64)
+
+        keep = lengths[ids] > 0
+        ids, texts = ids[keep], texts[keep]
+        counts = lengths[ids]
+        offsets = np.cumsum(counts) - counts
+        gather = np.repeat(starts[ids] - offsets, counts) + np.arange(counts.sum())
+        buckets = [features[gather]]
+        owners = [np.repeat(texts, counts)]
+        if self._word_bigrams and len(ids) > 1:
+            adjacent = texts[1:] == texts[:-1]
+            left, right = word_hashes[ids[:-1]], word_hashes[ids[1:]]
+            bigrams = ((left * np.uint64(_BIGRAM_MUL)) ^ right)[adjacent]
+            buckets.append((bigrams % np.uint64(width)).astype(np.int64))
+            owners.append(texts[1:][adjacent])
+        keys, tf = np.unique(
+            np.concatenate(owners) * width + np.concatenate(buckets),
+            return_counts=True,
+        )
+        weights = (1.0 + np.log(tf)) * self._dense_idf(np)[keys % width]
+        owner = keys // width
+        norms = np.bincount(owner, weights=weights * weights, minlength=2 * n)
+
+        from_original = owner < n
+        orig_keys, orig_weights = keys[from_original], weights[from_original]
+        opt_keys = keys[~from_original] - n * width
+        opt_weights = weights[~from_original]
+        common, in_orig, in_opt = np.intersect1d(
+            orig_keys, opt_keys, assume_unique=True, return_indices=True
+        )
+        dots = np.bincount(
+            common // width,
+            weights=orig_weights[in_orig] * opt_weights[in_opt],
+            minlength=n,
+        )
+        left_norm, right_norm = norms[:n], norms[n:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cosine = np.minimum(1.0, dots / np.sqrt(left_norm * right_norm))
+        cosine = np.where((left_norm == 0) | (right_norm == 0), 0.0, cosine)
+        cosine = np.where((left_norm == 0) & (right_norm == 0), 1.0, cosine)
+        return cosine.tolist()
@@ -0,0 +1,81 @@
+"""Opt-in recording of engine phase and analyzer stage timings."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Callable, Sequence
+
+from token_optimizer.config import OptimizationProfile, ProfileEntry, ProfileKind
+
+
+class Profiler:
+    """Collects timings during one optimization, for an OptimizationProfile.
+
+    Callers take ``perf_counter()`` before a phase or stage and call
+    :meth:`record` when it ends, passing the texts it read and wrote if it
+    rewrites text.  Recording keeps references only; sizes and tokens
+    removed are measured in :meth:`finish`, outside the timed sections.
+    Code paths check ``profiler is not None`` before recording, so an
+    optimization without a profiler does no extra work.
+    """
+
+    def __init__(self) -> None:
+        self._records: list[
+            tuple[ProfileKind, str, float, Sequence[str] | None, Sequence[str]]
+        ] = []
+
+    def record(
+        self,
+        kind: ProfileKind,
+        name: str,
+        start: float,
+        before: Sequence[str] | None = None,
+        after: Sequence[str] = (),
+    ) -> None:
+        """Record a phase or stage that began at ``start`` and ends now.
+
+        Args:
+            kind: ``"phase"`` for engine phases, ``"stage"`` for analyzer
+                stages.
+            name: Phase name or stage key.
+            start: ``perf_counter()`` value taken when it began.
+            before: Texts it rewrote, if it rewrites text.
+            after: The rewritten texts.
+        """
+        self._records.append((kind, name, perf_counter() - start, before, after))
+
+    def finish(
+        self, count_tokens_batch: Callable[[Sequence[str]], Sequence[int]]
+    ) -> OptimizationProfile:
+        """Measure the recorded texts and build the profile.
+
+        Args:
+            count_tokens_batch: Counts the recorded texts, all in one call;
+                not called if no texts were recorded.
+        """
+        texts = list(dict.fromkeys(
+            text
+            for _, _, _, before, after in self._records
+            if before is not None
+            for text in (*before, *after)
+        ))
+        tokens = dict(zip(texts, count_tokens_batch(texts))) if texts else {}
+        entries = []
+        for kind, name, seconds, before, after in self._records:
+            if before is None:
+                entries.append(ProfileEntry(kind, name, seconds))
+                continue
+            entries.append(
+                ProfileEntry(
+                    kind,
+                    name,
+                    seconds,
+                    input_chars=sum(map(len, before)),
+                    output_chars=sum(map(len, after)),
+                    tokens_removed=(
+                        sum(tokens[text] for text in before)
+                        - sum(tokens[text] for text in after)
+                    ),
+                )
+            )
+        return OptimizationProfile(entries)
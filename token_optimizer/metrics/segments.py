@@ -0,0 +1,256 @@
+"""Sentence-level similarity guard: align, score and revert single segments."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Sequence
+
+from token_optimizer.metrics.similarity import SimilarityScorer, extract_keywords
+
+# A sentence: from a non-space character to a terminator followed by
+# whitespace, or to the end of the line.  Segments never span lines.
+_SEGMENT = re.compile(r"\S(?:.*?[.!?](?=\s)|.*)")
+_LINE = re.compile(r"\S.*")
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One sentence (or line) of a text and its position in it."""
+
+    text: str
+    start: int
+    end: int
+    keywords: frozenset[str]
+
+
+def split_segments(
+    text: str, start: int = 0, end: int | None = None, lines: bool = False
+) -> list[Segment]:
+    """Split ``text[start:end]`` into sentences, or lines, keeping their spans."""
+    pattern = _LINE if lines else _SEGMENT
+    segments = []
+    for match in pattern.finditer(text, start, len(text) if end is None else end):
+        sentence = match.group().rstrip()
+        start = match.start()
+        segments.append(
+            Segment(
+                sentence,
+                start,
+                start + len(sentence),
+                frozenset(extract_keywords(sentence)),
+            )
+        )
+    return segments
+
+
+def _overlap(a: Segment, b: Segment) -> float:
+    """Dice coefficient of two segments' keyword sets."""
+    if not a.keywords or not b.keywords:
+        return 1.0 if a.text.lower() == b.text.lower() else 0.0
+    return 2 * len(a.keywords & b.keywords) / (len(a.keywords) + len(b.keywords))
+
+
+def align_segments(
+    original: Sequence[Segment], optimized: Sequence[Segment], band: int = 16
+) -> list[tuple[int, int]]:
+    """Monotonic alignment maximizing total keyword overlap of matched pairs.
+
+    Optimization deletes and shortens sentences but never reorders them,
+    so this is a global alignment with free gaps, restricted to a band of
+    ``band`` cells around the diagonal: O(len(original) * band) time
+    rather than quadratic.
+
+    Returns:
+        Matched ``(original_index, optimized_index)`` pairs, in order.
+        Unmatched original segments were deleted; unmatched optimized
+        segments have no counterpart.
+    """
+    n, m = len(original), len(optimized)
+    if not n or not m:
+        return []
+    # Widen the band when lengths differ so consecutive rows stay connected.
+    width = band + -(-max(n, m) // min(n, m))
+    lows = [max(0, i * m // n - width) for i in range(n + 1)]
+    highs = [min(m, i * m // n + width) for i in range(n + 1)]
+
+    minus_inf = float("-inf")
+    # score[i][j - lows[i]] is the best total for original[:i], optimized[:j];
+    # moves[i] records 0 = skip original, 1 = skip optimized, 2 = match.
+    score = [[minus_inf] * (highs[i] - lows[i] + 1) for i in range(n + 1)]
+    moves = [bytearray(highs[i] - lows[i] + 1) for i in range(n + 1)]
+    for j in range(highs[0] + 1):
+        score[0][j] = 0.0
+        moves[0][j] = 1
+    for i in range(1, n + 1):
+        low, high = lows[i], highs[i]
+        prev_low, prev_high = lows[i - 1], highs[i - 1]
+        row, prev, row_moves = score[i], score[i - 1], moves[i]
+        segment = original[i - 1]
+        for j in range(low, high + 1):
+            best = prev[j - prev_low] if prev_low <= j <= prev_high else minus_inf
+            move = 0
+            if j > low and row[j - 1 - low] > best:
+                best, move = row[j - 1 - low], 1
+            if j and prev_low <= j - 1 <= prev_high:
+                overlap = _overlap(segment, optimized[j - 1])
+                if overlap and prev[j - 1 - prev_low] + overlap > best:
+                    best, move = prev[j - 1 - prev_low] + overlap, 2
+            row[j - low] = best
+            row_moves[j - low] = move
+
+    pairs = []
+    i, j = n, m
+    while i and j:
+        move = moves[i][j - lows[i]]
+        if move == 2:
+            pairs.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif move == 1:
+            j -= 1
+        else:
+            i -= 1
+    pairs.reverse()
+    return pairs
+
+
+class SegmentGuard:
+    """Reverts only the sentences whose rewrite lost too much meaning.
+
+    Original and optimized texts are aligned line by line (optimization
+    keeps line breaks), then sentence by sentence within each matched pair
+    of lines, which keeps alignment cheap on long prompts.  Each matched
+    sentence pair is scored with the similarity scorer, all pairs of a
+    batch in one call; pairs below ``threshold`` get the original sentence
+    back in place of the rewrite.  A deleted sentence is restored when less
+    than ``threshold`` of its keywords survive anywhere in the optimized
+    text, so deduplicated sentences stay deleted.  Nothing is re-optimized:
+    the rest of the optimized text is kept as it is.
+
+    Args:
+        scorer: Scores each (original, optimized) sentence pair.
+        threshold: Minimum similarity a rewritten sentence must keep.
+        band: Alignment band half-width, in sentences.
+    """
+
+    def __init__(
+        self, scorer: SimilarityScorer, threshold: float, band: int = 16
+    ) -> None:
+        if band < 1:
+            raise ValueError("band must be at least 1")
+        self._scorer = scorer
+        self._threshold = threshold
+        self._band = band
+
+    def repair(self, original: str, optimized: str) -> tuple[str, int]:
+        """Repair one text; see :meth:`repair_batch`."""
+        return self.repair_batch([original], [optimized])[0]
+
+    def repair_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[tuple[str, int]]:
+        """Repair many optimized texts against their originals.
+
+        Returns:
+            One ``(repaired_text, reverted_segments)`` per text, in order.
+        """
+        if len(originals) != len(optimizeds):
+            raise ValueError("originals and optimizeds must have the same length")
+
+        plans = []
+        left: list[str] = []
+        right: list[str] = []
+        for original, optimized in zip(originals, optimizeds):
+            source, target, pairs = self._align(original, optimized)
+            plans.append((source, target, pairs))
+            left.extend(source[i].text for i, _ in pairs)
+            right.extend(target[j].text for _, j in pairs)
+        scores = iter(self._scorer.score_batch(left, right))
+
+        repaired = []
+        for optimized, (source, target, pairs) in zip(optimizeds, plans):
+            pair_scores = [next(scores) for _ in pairs]
+            repaired.append(
+                self._splice(optimized, source, target, pairs, pair_scores)
+            )
+        return repaired
+
+    def _align(
+        self, original: str, optimized: str
+    ) -> tuple[list[Segment], list[Segment], list[tuple[int, int]]]:
+        """Sentences of both texts and their matched pairs, lines first."""
+        source_lines = split_segments(original, lines=True)
+        target_lines = split_segments(optimized, lines=True)
+        source_groups = [
+            split_segments(original, line.start, line.end) for line in source_lines
+        ]
+        target_groups = [
+            split_segments(optimized, line.start, line.end) for line in target_lines
+        ]
+        source_offsets = _offsets(source_groups)
+        target_offsets = _offsets(target_groups)
+
+        pairs = []
+        for a, b in align_segments(source_lines, target_lines, self._band):
+            pairs.extend(
+                (source_offsets[a] + i, target_offsets[b] + j)
+                for i, j in align_segments(
+                    source_groups[a], target_groups[b], self._band
+                )
+            )
+        source = [segment for group in source_groups for segment in group]
+        target = [segment for group in target_groups for segment in group]
+        return source, target, pairs
+
+    def _splice(
+        self,
+        optimized: str,
+        source: list[Segment],
+        target: list[Segment],
+        pairs: list[tuple[int, int]],
+        scores: list[float],
+    ) -> tuple[str, int]:
+        """Apply reverts and restorations to ``optimized``, left to right."""
+        survivors = frozenset().union(*(segment.keywords for segment in target))
+        # Edits as (position, end, replacement), sorted by position.
+        edits: list[tuple[int, int, str]] = []
+        matched = dict(pairs)
+        anchor = 0  # where a deleted sentence goes: after the last match
+        for i, segment in enumerate(source):
+            j = matched.get(i)
+            if j is not None:
+                anchor = target[j].end
+                continue
+            if segment.keywords and (
+                len(segment.keywords & survivors) / len(segment.keywords)
+                < self._threshold
+            ):
+                edits.append((anchor, anchor, segment.text))
+        for (i, j), score in zip(pairs, scores):
+            if score < self._threshold:
+                edits.append((target[j].start, target[j].end, source[i].text))
+        if not edits:
+            return optimized, 0
+
+        edits.sort(key=lambda edit: (edit[0], edit[1]))
+        parts = []
+        position = 0
+        for start, end, text in edits:
+            parts.append(optimized[position:start])
+            if start == end:  # restored deletion
+                parts.append(f" {text}" if start else f"{text} ")
+            else:
+                parts.append(text)
+            position = end
+        parts.append(optimized[position:])
+        return "".join(parts).strip(), len(edits)
+
+
+def _offsets(groups: list[list[Segment]]) -> list[int]:
+    """Index of each group's first segment in the flattened list."""
+    offsets = []
+    total = 0
+    for group in groups:
+        offsets.append(total)
+        total += len(group)
+    return offsets
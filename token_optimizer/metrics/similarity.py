@@ -3,107 +3,354 @@
 from __future__ import annotations
 
 import re
+import warnings
+from abc import ABC, abstractmethod
 from collections import Counter
+from typing import Any, Sequence
 
+from token_optimizer.config import SimilarityBackendName
+
+_WORD = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+# Joins the texts of a batch so words are extracted in a single pass.
+_SEPARATOR = "\x00"
+_WORD_OR_SEPARATOR = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*|\x00")
+
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "could", "should", "may", "might", "shall", "can",
+    "to", "of", "in", "for", "on", "with", "at", "by", "from",
+    "as", "into", "through", "during", "before", "after", "and",
+    "but", "or", "nor", "not", "so", "yet", "both", "either",
+    "neither", "each", "every", "all", "any", "few", "more",
+    "most", "some", "such", "no", "only", "own", "same", "than",
+    "too", "very", "just", "because", "if", "when", "where",
+    "how", "what", "which", "who", "whom", "this", "that",
+    "these", "those", "i", "me", "my", "myself", "we", "our",
+    "ours", "you", "your", "yours", "he", "him", "his", "she",
+    "her", "hers", "it", "its", "they", "them", "their", "then",
+    "there", "here", "up", "out", "about",
+    # Common fillers that shouldn't affect similarity
+    "please", "kindly", "basically", "actually", "really",
+    "quite", "simply", "literally", "honestly", "frankly",
+    "obviously", "clearly", "definitely", "certainly",
+    "absolutely", "essentially", "hi", "hello", "hey",
+    "also", "make", "sure", "want", "need", "like",
+    "help", "note", "important",
+})
+
+# Below this many pairs, numpy's import and conversion cost outweighs its gain.
+_NUMPY_MIN_BATCH = 256
 
-class SimilarityScorer:
-    """Scores semantic similarity between original and optimized text.
 
-    Uses a keyword-overlap heuristic by default. If sentence-transformers
-    is installed, can optionally use embedding-based cosine similarity.
+def extract_keywords(text: str) -> list[str]:
+    """Extract meaningful keywords, filtering out stop words."""
+    return [
+        w
+        for w in _WORD.findall(text.lower())
+        if w not in _STOP_WORDS and len(w) > 1
+    ]
+
+
+class SimilarityBackend(ABC):
+    """Interface for the comparison behind :class:`SimilarityScorer`.
+
+    The scorer handles empty and identical texts itself, so backends only
+    see pairs of distinct, non-empty texts.
     """
 
-    def __init__(self, use_embeddings: bool = False) -> None:
-        self._use_embeddings = use_embeddings
-        self._model = None
-        if use_embeddings:
-            self._load_embedding_model()
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Return the backend name, which is part of cache keys."""
 
-    def _load_embedding_model(self) -> None:
-        """Load sentence-transformers model if available."""
-        try:
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer("all-MiniLM-L6-v2")
-        except ImportError:
-            self._use_embeddings = False
+    @abstractmethod
+    def score_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float]:
+        """Score each (original, optimized) pair between 0.0 and 1.0.
 
-    def score(self, original: str, optimized: str) -> float:
-        """Compute similarity score between 0.0 and 1.0."""
-        if not original or not optimized:
-            return 1.0 if original == optimized else 0.0
+        Args:
+            originals: Original texts.
+            optimizeds: Optimized texts, one per original.
+
+        Returns:
+            One score per pair, in input order.
+        """
 
-        if original == optimized:
-            return 1.0
 
-        if self._use_embeddings and self._model is not None:
-            return self._embedding_similarity(original, optimized)
+class KeywordBackend(SimilarityBackend):
+    """Keyword overlap: a blend of Jaccard similarity and keyword coverage.
+
+    Large batches are scored with array operations when numpy is installed;
+    both paths produce exactly the same floats.
+    """
 
-        return self._keyword_similarity(original, optimized)
+    @property
+    def name(self) -> str:
+        return "keyword"
 
-    def _keyword_similarity(self, original: str, optimized: str) -> float:
+    def score(self, original: str, optimized: str) -> float:
         """Compute similarity using keyword overlap (Jaccard + weighted)."""
-        original_words = self._extract_keywords(original)
-        optimized_words = self._extract_keywords(optimized)
+        orig_counter = Counter(extract_keywords(original))
+        opt_counter = Counter(extract_keywords(optimized))
 
-        if not original_words and not optimized_words:
+        if not orig_counter and not opt_counter:
             return 1.0
-        if not original_words or not optimized_words:
+        if not orig_counter or not opt_counter:
             return 0.0
 
         # Jaccard similarity on keyword sets
-        orig_set = set(original_words)
-        opt_set = set(optimized_words)
-        intersection = orig_set & opt_set
-        union = orig_set | opt_set
-        jaccard = len(intersection) / len(union) if union else 1.0
+        intersection = orig_counter.keys() & opt_counter.keys()
+        union = len(orig_counter) + len(opt_counter) - len(intersection)
+        jaccard = len(intersection) / union
 
         # Weighted overlap: what fraction of original keywords are preserved
-        orig_counter = Counter(original_words)
-        opt_counter = Counter(optimized_words)
         preserved = sum(
             min(orig_counter[w], opt_counter[w]) for w in intersection
         )
-        total = sum(orig_counter.values())
-        coverage = preserved / total if total else 1.0
+        coverage = preserved / orig_counter.total()
 
         # Blend both signals
         return 0.4 * jaccard + 0.6 * coverage
 
-    def _embedding_similarity(self, original: str, optimized: str) -> float:
-        """Compute cosine similarity using sentence embeddings."""
-        embeddings = self._model.encode([original, optimized])  # type: ignore[union-attr]
-        dot = sum(a * b for a, b in zip(embeddings[0], embeddings[1]))
-        norm_a = sum(a * a for a in embeddings[0]) ** 0.5
-        norm_b = sum(b * b for b in embeddings[1]) ** 0.5
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(dot / (norm_a * norm_b))
+    def score_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float]:
+        """Keyword similarity for many pairs, vectorized when possible.
+
+        The numpy path extracts words from all texts in one pass and turns
+        each keyword occurrence into a ``pair * vocabulary + word`` key;
+        unique keys with their counts give each pair's keyword multiset, so
+        Jaccard and coverage reduce to a sorted intersection and per-pair
+        sums.
+        """
+        if len(originals) >= _NUMPY_MIN_BATCH:
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+            else:
+                scores = self._score_numpy(np, originals, optimizeds)
+                if scores is not None:
+                    return scores
+        return [
+            self.score(original, optimized)
+            for original, optimized in zip(originals, optimizeds)
+        ]
+
+    def _score_numpy(
+        self, np: Any, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float] | None:
+        n = len(originals)
+        joined = _SEPARATOR.join([*originals, *optimizeds]).lower()
+        if joined.count(_SEPARATOR) != 2 * n - 1:
+            return None  # a text contains the separator itself
+
+        # One findall over every text; separator matches mark text bounds.
+        tokens = _WORD_OR_SEPARATOR.findall(joined)
+        vocabulary = {w: i for i, w in enumerate(dict.fromkeys(tokens))}
+        width = len(vocabulary)
+        ids = np.fromiter(
+            map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens)
+        )
+        texts = np.cumsum(ids == vocabulary[_SEPARATOR])
+        is_keyword = np.fromiter(
+            (w not in _STOP_WORDS and len(w) > 1 for w in vocabulary),
+            dtype=bool,
+            count=width,
+        )
+        keep = is_keyword[ids]
+        ids, texts = ids[keep], texts[keep]
+
+        # Text i < n is original i; text n + i is its optimized version.
+        keys = (texts % n) * width + ids
+        from_original = texts < n
+        orig_keys, orig_counts = np.unique(keys[from_original], return_counts=True)
+        opt_keys, opt_counts = np.unique(keys[~from_original], return_counts=True)
+        common, in_orig, in_opt = np.intersect1d(
+            orig_keys, opt_keys, assume_unique=True, return_indices=True
+        )
+        common_pairs = common // width
+        shared = np.bincount(common_pairs, minlength=n)
+        union = (
+            np.bincount(orig_keys // width, minlength=n)
+            + np.bincount(opt_keys // width, minlength=n)
+            - shared
+        )
+        preserved = np.bincount(
+            common_pairs,
+            weights=np.minimum(orig_counts[in_orig], opt_counts[in_opt]),
+            minlength=n,
+        )
+        lengths = np.bincount(texts, minlength=2 * n)
+        total, opt_total = lengths[:n], lengths[n:]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blended = 0.4 * (shared / union) + 0.6 * (preserved / total)
+        blended = np.where((total == 0) | (opt_total == 0), 0.0, blended)
+        blended = np.where((total == 0) & (opt_total == 0), 1.0, blended)
+        return blended.tolist()
+
+
+class EmbeddingBackend(SimilarityBackend):
+    """Cosine similarity of sentence-transformers embeddings.
+
+    Args:
+        model_name: sentence-transformers model to load.
+        model: An already loaded model (anything with ``encode(texts)``);
+            overrides ``model_name``.
+
+    Raises:
+        ImportError: If no ``model`` is given and sentence-transformers is
+            not installed.
+    """
+
+    def __init__(
+        self, model_name: str = "all-MiniLM-L6-v2", model: Any = None
+    ) -> None:
+        if model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers is required for embedding similarity. "
+                    "Install it with: pip install token-optimizer[embeddings]"
+                )
+            model = SentenceTransformer(model_name)
+        self._model = model
+
+    @property
+    def name(self) -> str:
+        return "embedding"
+
+    def score_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float]:
+        """Cosine similarity of sentence embeddings, one encode per batch."""
+        import numpy as np  # a dependency of sentence-transformers
+
+        embeddings = np.asarray(
+            self._model.encode([*originals, *optimizeds]), dtype=np.float64
+        )
+        left, right = embeddings[: len(originals)], embeddings[len(originals) :]
+        dots = np.einsum("ij,ij->i", left, right)
+        norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cosine = np.where(norms == 0, 0.0, dots / norms)
+        return cosine.tolist()
+
+
+def make_backend(name: SimilarityBackendName) -> SimilarityBackend:
+    """Create the built-in backend called ``name``.
+
+    Raises:
+        ValueError: If ``name`` is not a built-in backend.
+        ImportError: If the backend's optional dependency is missing.
+    """
+    if name == "keyword":
+        return KeywordBackend()
+    if name == "hashing":
+        from token_optimizer.metrics.hashing import HashingBackend
+        return HashingBackend()
+    if name == "embedding":
+        return EmbeddingBackend()
+    raise ValueError(f"unknown similarity backend: {name!r}")
+
+
+class SimilarityScorer:
+    """Scores semantic similarity between original and optimized text.
+
+    Uses a keyword-overlap heuristic by default.  Other comparisons plug in
+    as a :class:`SimilarityBackend`: ``"hashing"`` compares hashed word and
+    character n-gram TF-IDF vectors and needs no model download, and
+    ``"embedding"`` uses sentence-transformers.
+
+    Args:
+        use_embeddings: Shorthand for ``backend="embedding"``, except that
+            a missing sentence-transformers falls back to keyword overlap
+            with a warning instead of raising.
+        backend: A backend instance or built-in backend name.
+    """
+
+    def __init__(
+        self,
+        use_embeddings: bool = False,
+        backend: SimilarityBackend | SimilarityBackendName | None = None,
+    ) -> None:
+        if backend is None and use_embeddings:
+            try:
+                backend = EmbeddingBackend()
+            except ImportError as exc:
+                warnings.warn(
+                    f"{exc}; falling back to keyword similarity. "
+                    'Use backend="hashing" for a model-free alternative.',
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        if backend is None:
+            backend = KeywordBackend()
+        elif isinstance(backend, str):
+            backend = make_backend(backend)
+        self._backend = backend
+
+    @property
+    def backend(self) -> SimilarityBackend:
+        return self._backend
+
+    def score(self, original: str, optimized: str) -> float:
+        """Compute similarity score between 0.0 and 1.0."""
+        trivial = self._trivial_score(original, optimized)
+        if trivial is not None:
+            return trivial
+        return self._backend.score_batch([original], [optimized])[0]
+
+    def score_batch(
+        self, originals: Sequence[str], optimizeds: Sequence[str]
+    ) -> list[float]:
+        """Score many (original, optimized) pairs at once.
+
+        Equivalent to calling :meth:`score` on each pair, but the backend
+        sees the whole batch: embeddings are computed with one ``encode``
+        call, and with numpy installed, large batches are scored with array
+        operations.
+
+        Args:
+            originals: Original texts.
+            optimizeds: Optimized texts, one per original.
+
+        Returns:
+            One score per pair, in input order.
+
+        Raises:
+            ValueError: If the sequences differ in length.
+        """
+        if len(originals) != len(optimizeds):
+            raise ValueError("originals and optimizeds must have the same length")
+
+        scores: list[float] = [0.0] * len(originals)
+        pending: list[int] = []
+        for i, (original, optimized) in enumerate(zip(originals, optimizeds)):
+            trivial = self._trivial_score(original, optimized)
+            if trivial is None:
+                pending.append(i)
+            else:
+                scores[i] = trivial
+        if not pending:
+            return scores
+
+        computed = self._backend.score_batch(
+            [originals[i] for i in pending], [optimizeds[i] for i in pending]
+        )
+        for i, value in zip(pending, computed):
+            scores[i] = value
+        return scores
 
     @staticmethod
-    def _extract_keywords(text: str) -> list[str]:
-        """Extract meaningful keywords, filtering out stop words."""
-        stop_words = {
-            "a", "an", "the", "is", "are", "was", "were", "be", "been",
-            "being", "have", "has", "had", "do", "does", "did", "will",
-            "would", "could", "should", "may", "might", "shall", "can",
-            "to", "of", "in", "for", "on", "with", "at", "by", "from",
-            "as", "into", "through", "during", "before", "after", "and",
-            "but", "or", "nor", "not", "so", "yet", "both", "either",
-            "neither", "each", "every", "all", "any", "few", "more",
-            "most", "some", "such", "no", "only", "own", "same", "than",
-            "too", "very", "just", "because", "if", "when", "where",
-            "how", "what", "which", "who", "whom", "this", "that",
-            "these", "those", "i", "me", "my", "myself", "we", "our",
-            "ours", "you", "your", "yours", "he", "him", "his", "she",
-            "her", "hers", "it", "its", "they", "them", "their", "then",
-            "there", "here", "up", "out", "about",
-            # Common fillers that shouldn't affect similarity
-            "please", "kindly", "basically", "actually", "really",
-            "quite", "simply", "literally", "honestly", "frankly",
-            "obviously", "clearly", "definitely", "certainly",
-            "absolutely", "essentially", "hi", "hello", "hey",
-            "also", "make", "sure", "want", "need", "like",
-            "help", "note", "important",
-        }
-        words = re.findall(r"[a-zA-Z_][a-zA-Z0-9_]*", text.lower())
-        return [w for w in words if w not in stop_words and len(w) > 1]
+    def _trivial_score(original: str, optimized: str) -> float | None:
+        """Score pairs that need no comparison, or return None."""
+        if not original or not optimized:
+            return 1.0 if original == optimized else 0.0
+        if original == optimized:
+            return 1.0
+        return None
@@ -0,0 +1,308 @@
+"""Aggregate counters and latency histograms with text exposition.
+
+Enable with ``TokenOptimizer(telemetry=True)``; every such optimizer in
+the process records into :func:`shared_telemetry`.  Render the registry
+with :meth:`Telemetry.exposition` (Prometheus text format, or OpenMetrics)
+or serve it for scrapes with :func:`serve_metrics`.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Sequence
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+MetricType = Literal["counter", "histogram"]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+@dataclass(frozen=True)
+class MetricFamily:
+    """A metric's exposed name, type, help text and label names."""
+
+    name: str
+    type: MetricType
+    help: str
+    labels: tuple[str, ...] = ("model",)
+
+
+_PREFIX = "token_optimizer_"
+
+FAMILIES = {
+    family.name: family
+    for family in (
+        MetricFamily("prompts", "counter", "Prompts optimized."),
+        MetricFamily("cache_hits", "counter", "Prompts answered from the cache."),
+        MetricFamily(
+            "cache_misses", "counter", "Prompts optimized after a cache miss."
+        ),
+        MetricFamily(
+            "fallbacks",
+            "counter",
+            "Results that failed the similarity check and were rerun "
+            "conservatively or repaired.",
+            ("model", "kind"),
+        ),
+        MetricFamily("tokens_saved", "counter", "Input tokens removed."),
+        MetricFamily(
+            "cost_saved_dollars", "counter", "Estimated input cost saved, in dollars."
+        ),
+        MetricFamily(
+            "optimize_seconds", "histogram", "Latency of optimize() calls."
+        ),
+        MetricFamily(
+            "batch_seconds", "histogram", "Latency of optimize_batch() calls."
+        ),
+    )
+}
+
+
+class _Shard:
+    """One thread's values; only that thread writes to it."""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, tuple[str, ...]], float] = {}
+        # Per (name, labels): bucket counts, then the +Inf bucket, then sum.
+        self.histograms: dict[tuple[str, tuple[str, ...]], list[float]] = {}
+
+    def merge(self, other: _Shard) -> None:
+        for key, value in other.counters.copy().items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, counts in other.histograms.copy().items():
+            total = self.histograms.get(key)
+            if total is None:
+                self.histograms[key] = counts.copy()
+            else:
+                for i, count in enumerate(counts):
+                    total[i] += count
+
+
+class Telemetry:
+    """Thread-sharded counters and fixed-bucket histograms.
+
+    Every thread records into its own shard, found through a
+    ``threading.local``, so recording takes no lock: a lock is only taken
+    the first time a thread records, to register its shard, and when the
+    registry is read.  Reads sum all shards; a value being updated while a
+    scrape runs is counted in that scrape or the next one.  Shards of
+    threads that have exited are folded into one, so servers that start a
+    thread per request do not accumulate shards.
+
+    Metric names are the keys of :data:`FAMILIES`; label values are passed
+    as a tuple in the family's label order.
+
+    Args:
+        buckets: Upper bounds of the histogram buckets, in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets must be non-empty, increasing and unique")
+        self.buckets = tuple(float(bound) for bound in buckets)
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()  # values of exited threads
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._retire_exited()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_exited(self) -> None:
+        """Fold the shards of exited threads into ``_retired``; needs the lock."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._retired.merge(shard)
+        self._shards = live
+
+    def inc(self, name: str, labels: tuple[str, ...], value: float = 1) -> None:
+        """Add ``value`` to counter ``name`` for ``labels``."""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: tuple[str, ...], value: float) -> None:
+        """Record ``value`` in histogram ``name`` for ``labels``."""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def counters(self) -> dict[tuple[str, tuple[str, ...]], float]:
+        """Current counter totals keyed by ``(name, labels)``."""
+        return self._total().counters
+
+    def histograms(self) -> dict[tuple[str, tuple[str, ...]], list[float]]:
+        """Current histograms keyed by ``(name, labels)``.
+
+        Each value holds the count of every bucket (not cumulative), then
+        the count above the last bound, then the sum of observed values.
+        """
+        return self._total().histograms
+
+    def reset(self) -> None:
+        """Drop every recorded value (values recorded meanwhile may survive)."""
+        with self._lock:
+            self._retired = _Shard()
+            for _, shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+    def _total(self) -> _Shard:
+        """A new shard holding the sum of all shards."""
+        total = _Shard()
+        with self._lock:
+            self._retire_exited()
+            total.merge(self._retired)
+            for _, shard in self._shards:
+                total.merge(shard)
+        return total
+
+    def exposition(self, openmetrics: bool = False) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Args:
+            openmetrics: Render OpenMetrics 1.0 instead (counter families
+                named without ``_total``, terminated by ``# EOF``).  Serve
+                with :data:`OPENMETRICS_CONTENT_TYPE`, otherwise with
+                :data:`PROMETHEUS_CONTENT_TYPE`.
+        """
+        total = self._total()
+        counters, histograms = total.counters, total.histograms
+        lines = []
+        for family in FAMILIES.values():
+            name = _PREFIX + family.name
+            if family.type == "counter":
+                series = sorted(
+                    (labels, value)
+                    for (key, labels), value in counters.items()
+                    if key == family.name
+                )
+                header = name if openmetrics else f"{name}_total"
+                lines.append(f"# HELP {header} {family.help}")
+                lines.append(f"# TYPE {header} counter")
+                for labels, value in series:
+                    label_text = _labels(family.labels, labels)
+                    lines.append(f"{name}_total{label_text} {_number(value)}")
+                continue
+
+            lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, counts in sorted(
+                (labels, counts)
+                for (key, labels), counts in histograms.items()
+                if key == family.name
+            ):
+                cumulative = 0.0
+                bounds = [*map(_number, self.buckets), "+Inf"]
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    label_text = _labels(
+                        (*family.labels, "le"), (*labels, bound)
+                    )
+                    lines.append(f"{name}_bucket{label_text} {_number(cumulative)}")
+                label_text = _labels(family.labels, labels)
+                lines.append(f"{name}_sum{label_text} {_number(counts[-1])}")
+                lines.append(f"{name}_count{label_text} {_number(cumulative)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Integers without a fraction; other floats in shortest round-trip form."""
+    if float(value).is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
+
+
+_shared: Telemetry | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_telemetry() -> Telemetry:
+    """Return the process-wide registry, creating it if needed."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Telemetry()
+        return _shared
+
+
+def serve_metrics(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    telemetry: Telemetry | None = None,
+) -> ThreadingHTTPServer:
+    """Serve ``telemetry`` (default: the shared registry) for scrapes.
+
+    Every GET path answers with the exposition; clients that accept
+    ``application/openmetrics-text`` get OpenMetrics.  The server runs in
+    a daemon thread; call ``shutdown()`` on the returned server to stop it.
+    Pass ``port=0`` to pick a free port (see ``server_address``).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = telemetry if telemetry is not None else shared_telemetry()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            openmetrics = "application/openmetrics-text" in self.headers.get(
+                "Accept", ""
+            )
+            body = registry.exposition(openmetrics).encode()
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass  # scrapes are frequent; stay quiet
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="token-optimizer-metrics", daemon=True
+    ).start()
+    return server
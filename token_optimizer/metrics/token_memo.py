@@ -0,0 +1,81 @@
+"""Memoization of token counts by content fingerprint."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TokenMemoStats:
+    """Snapshot of token-count memo counters."""
+
+    hits: int
+    misses: int
+    entries: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TokenCountMemo:
+    """Bounded, thread-safe LRU map from content fingerprint to token count.
+
+    One memo serves one tokenizer identity; use :func:`shared_token_memo`
+    to get the memo shared by every optimizer using that tokenizer.
+    """
+
+    def __init__(self, maxsize: int = 65_536) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._maxsize = maxsize
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, digest: bytes) -> int | None:
+        """Return the memoized count for a fingerprint digest, or None."""
+        with self._lock:
+            count = self._counts.get(digest)
+            if count is None:
+                self._misses += 1
+                return None
+            self._counts.move_to_end(digest)
+            self._hits += 1
+            return count
+
+    def put(self, digest: bytes, count: int) -> None:
+        """Remember the token count for a fingerprint digest."""
+        with self._lock:
+            self._counts[digest] = count
+            self._counts.move_to_end(digest)
+            if len(self._counts) > self._maxsize:
+                self._counts.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def stats(self) -> TokenMemoStats:
+        with self._lock:
+            return TokenMemoStats(self._hits, self._misses, len(self._counts))
+
+
+_shared: dict[str, TokenCountMemo] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_token_memo(tokenizer_id: str, maxsize: int = 65_536) -> TokenCountMemo:
+    """Return the process-wide memo for ``tokenizer_id``, creating it if needed.
+
+    ``maxsize`` only applies when the memo is created.
+    """
+    with _shared_lock:
+        memo = _shared.get(tokenizer_id)
+        if memo is None:
+            memo = _shared[tokenizer_id] = TokenCountMemo(maxsize)
+        return memo
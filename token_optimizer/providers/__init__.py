@@ -1,5 +1,18 @@
 """Provider registry for model-to-tokenizer and pricing mappings."""
 
-from token_optimizer.providers.registry import ProviderRegistry
+from typing import TYPE_CHECKING
 
-__all__ = ["ProviderRegistry"]
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.providers.registry import ProviderRegistry, preload_encodings
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ProviderRegistry": "token_optimizer.providers.registry",
+        "preload_encodings": "token_optimizer.providers.registry",
+    },
+)
+
+__all__ = ["ProviderRegistry", "preload_encodings"]
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import os
 import re
+import threading
+import warnings
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable
 
 if TYPE_CHECKING:
     from token_optimizer.tokenizers.base import BaseTokenizer
@@ -61,11 +65,93 @@ _MODEL_PATTERNS: list[tuple[str, ModelInfo]] = [
 ]
 
 
+_UNKNOWN_MODEL = ModelInfo(
+    provider="unknown",
+    tokenizer_type="generic",
+    cost_per_1k_input=0.0,
+    cost_per_1k_output=0.0,
+)
+
+@lru_cache(maxsize=1)
+def _combined_pattern() -> re.Pattern[str]:
+    """All patterns in one regex, compiled on the first lookup.
+
+    Alternatives are tried in list order at the start of the name, and each
+    may match anywhere in it, so the first matching pattern wins exactly as
+    with one re.search per pattern.
+    """
+    return re.compile(
+        "|".join(f".*?({pattern})" for pattern, _ in _MODEL_PATTERNS),
+        re.IGNORECASE | re.DOTALL,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _lookup_builtin(model: str) -> ModelInfo:
+    """Resolve a model name against the built-in patterns (memoized)."""
+    match = _combined_pattern().match(model)
+    if match is None:
+        return _UNKNOWN_MODEL
+    return _MODEL_PATTERNS[match.lastindex - 1][1]
+
+
+# Tokenizers are stateless once built, so one instance per encoding is
+# shared by every registry in the process.
+_tokenizer_pool: dict[str, BaseTokenizer] = {}
+_pool_lock = threading.Lock()
+
+
+def _pooled(key: str, factory: Callable[[], BaseTokenizer]) -> BaseTokenizer:
+    with _pool_lock:
+        tokenizer = _tokenizer_pool.get(key)
+    if tokenizer is None:
+        # Built outside the lock: loading an encoding can take a while.
+        built = factory()
+        with _pool_lock:
+            tokenizer = _tokenizer_pool.setdefault(key, built)
+    return tokenizer
+
+
+def preload_encodings(
+    names: Iterable[str] = ("o200k_base", "cl100k_base"),
+    cache_dir: str | os.PathLike[str] | None = None,
+) -> None:
+    """Load tiktoken encodings into the shared tokenizer pool ahead of time.
+
+    Args:
+        names: tiktoken encoding names to load.
+        cache_dir: Directory holding tiktoken's cached encoding files (as
+            written by any earlier run with ``TIKTOKEN_CACHE_DIR`` set).
+            It is exported as ``TIKTOKEN_CACHE_DIR`` so that offline hosts
+            load encodings from disk instead of downloading them.
+
+    Raises:
+        ImportError: If tiktoken is not installed.
+        Exception: Whatever tiktoken raises if an encoding cannot be loaded;
+            preloading never falls back to an estimate.
+    """
+    if cache_dir is not None:
+        os.environ["TIKTOKEN_CACHE_DIR"] = os.fspath(cache_dir)
+    from token_optimizer.tokenizers.openai_tokenizer import OpenAITokenizer
+
+    for name in names:
+        _pooled(f"openai:{name}", lambda name=name: OpenAITokenizer(encoding=name))
+
+
 class ProviderRegistry:
-    """Maps model names to tokenizers and pricing information."""
+    """Maps model names to tokenizers and pricing information.
+
+    Built-in lookups are memoized process-wide and tokenizers are pooled
+    per encoding, so creating many registries (one per optimizer) is cheap.
+
+    Args:
+        strict: Raise instead of warning when an exact tokenizer cannot be
+            loaded and the word-count estimate would be used.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, strict: bool = False) -> None:
         self._custom_models: dict[str, ModelInfo] = {}
+        self._strict = strict
 
     def register_model(
         self,
@@ -84,20 +170,14 @@ class ProviderRegistry:
         )
 
     def lookup(self, model: str) -> ModelInfo:
-        """Look up model info by name. Falls back to generic if unknown."""
+        """Look up model info by name. Falls back to generic if unknown.
+
+        The returned object is shared; copy it (e.g. with
+        ``dataclasses.replace``) before changing it.
+        """
         if model in self._custom_models:
             return self._custom_models[model]
-
-        for pattern, info in _MODEL_PATTERNS:
-            if re.search(pattern, model, re.IGNORECASE):
-                return info
-
-        return ModelInfo(
-            provider="unknown",
-            tokenizer_type="generic",
-            cost_per_1k_input=0.0,
-            cost_per_1k_output=0.0,
-        )
+        return _lookup_builtin(model)
 
     def get_tokenizer(self, model: str) -> BaseTokenizer:
         """Get the appropriate tokenizer for a model."""
@@ -105,22 +185,61 @@ class ProviderRegistry:
         return self._create_tokenizer(info.tokenizer_type, model)
 
     def _create_tokenizer(self, tokenizer_type: str, model: str) -> BaseTokenizer:
-        """Create a tokenizer instance by type."""
+        """Return the pooled tokenizer instance for a type."""
         if tokenizer_type == "openai":
             try:
-                from token_optimizer.tokenizers.openai_tokenizer import OpenAITokenizer
-                return OpenAITokenizer(model=model)
-            except ImportError:
-                from token_optimizer.tokenizers.generic import GenericTokenizer
-                return GenericTokenizer()
+                return self._openai_tokenizer(model)
+            except (ImportError, OSError, KeyError) as exc:
+                if self._strict:
+                    raise
+                _warn_fallback(model, exc)
 
         if tokenizer_type == "anthropic":
             from token_optimizer.tokenizers.anthropic_tokenizer import AnthropicTokenizer
-            return AnthropicTokenizer()
+            return _pooled("anthropic", AnthropicTokenizer)
 
         if tokenizer_type == "gemini":
             from token_optimizer.tokenizers.gemini_tokenizer import GeminiTokenizer
-            return GeminiTokenizer()
+            return _pooled("gemini", GeminiTokenizer)
 
         from token_optimizer.tokenizers.generic import GenericTokenizer
-        return GenericTokenizer()
+        return _pooled("generic", GenericTokenizer)
+
+    @staticmethod
+    def _openai_tokenizer(model: str) -> BaseTokenizer:
+        from token_optimizer.tokenizers.openai_tokenizer import OpenAITokenizer
+
+        encoding = _openai_encoding_name(model)
+        return _pooled(
+            f"openai:{encoding}", lambda: OpenAITokenizer(model, encoding=encoding)
+        )
+
+
+_fallback_warned: set[str] = set()
+
+
+def _warn_fallback(model: str, exc: Exception) -> None:
+    """Warn (once per model) that token counts for ``model`` are estimated."""
+    with _pool_lock:
+        if model in _fallback_warned:
+            return
+        _fallback_warned.add(model)
+    warnings.warn(
+        f"Exact token counts unavailable for {model!r} ({exc}); falling back "
+        "to the word-count estimate. Install tiktoken or call "
+        "preload_encodings() with a local cache_dir.",
+        RuntimeWarning,
+        stacklevel=4,
+    )
+
+
+@lru_cache(maxsize=256)
+def _openai_encoding_name(model: str) -> str:
+    try:
+        from tiktoken.model import encoding_name_for_model
+    except ImportError:
+        raise ImportError(
+            "tiktoken is required for OpenAI token counting. "
+            "Install it with: pip install token-optimizer[openai]"
+        )
+    return encoding_name_for_model(model)
@@ -1,10 +1,28 @@
 """Optimization strategies with varying levels of aggression."""
 
-from token_optimizer.strategies.base import BaseStrategy
-from token_optimizer.strategies.conservative import ConservativeStrategy
-from token_optimizer.strategies.moderate import ModerateStrategy
-from token_optimizer.strategies.aggressive import AggressiveStrategy
-from token_optimizer.strategies.custom import CustomStrategy
+from typing import TYPE_CHECKING
+
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.strategies.base import BaseStrategy
+    from token_optimizer.strategies.conservative import ConservativeStrategy
+    from token_optimizer.strategies.moderate import ModerateStrategy
+    from token_optimizer.strategies.aggressive import AggressiveStrategy
+    from token_optimizer.strategies.custom import CustomStrategy
+    from token_optimizer.strategies.best import BestOfStrategy
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseStrategy": "token_optimizer.strategies.base",
+        "ConservativeStrategy": "token_optimizer.strategies.conservative",
+        "ModerateStrategy": "token_optimizer.strategies.moderate",
+        "AggressiveStrategy": "token_optimizer.strategies.aggressive",
+        "CustomStrategy": "token_optimizer.strategies.custom",
+        "BestOfStrategy": "token_optimizer.strategies.best",
+    },
+)
 
 __all__ = [
     "BaseStrategy",
@@ -12,4 +30,5 @@ __all__ = [
     "ModerateStrategy",
     "AggressiveStrategy",
     "CustomStrategy",
+    "BestOfStrategy",
 ]
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from token_optimizer.analyzers.filler import FillerAnalyzer
-from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+from token_optimizer.analyzers.redundancy import DedupMode, RedundancyAnalyzer
+from token_optimizer.analyzers.stages import Stage
 from token_optimizer.analyzers.structural import StructuralAnalyzer
 from token_optimizer.analyzers.verbosity import VerbosityAnalyzer
 from token_optimizer.strategies.base import BaseStrategy
@@ -15,22 +18,39 @@ class AggressiveStrategy(BaseStrategy):
     Runs analyzers in order: structural -> filler -> verbosity -> redundancy.
     """
 
+    def __init__(
+        self, redundancy_mode: DedupMode = "exact", cross_paragraph: bool = False
+    ) -> None:
+        self.redundancy_mode = redundancy_mode
+        self.cross_paragraph = cross_paragraph
+
     @property
     def name(self) -> str:
         return "aggressive"
 
-    def optimize(
-        self, text: str, preserve_keywords: list[str] | None = None
-    ) -> str:
-        """Optimize text with maximum aggressiveness."""
-        analyzers = [
+    def _analyzers(self) -> list[Any]:
+        return [
             StructuralAnalyzer(aggressiveness=3),
             FillerAnalyzer(aggressiveness=3),
             VerbosityAnalyzer(aggressiveness=3),
-            RedundancyAnalyzer(),
+            self.redundancy(),
         ]
 
+    def redundancy(self) -> RedundancyAnalyzer:
+        return RedundancyAnalyzer(
+            mode=self.redundancy_mode, cross_paragraph=self.cross_paragraph
+        )
+
+    def optimize(
+        self, text: str, preserve_keywords: list[str] | None = None
+    ) -> str:
+        """Optimize text with maximum aggressiveness."""
         result = text
-        for analyzer in analyzers:
+        for analyzer in self._analyzers():
             result = analyzer.analyze(result, preserve_keywords=preserve_keywords)
         return result
+
+    def stage_groups(
+        self, preserve_keywords: list[str] | None = None
+    ) -> list[list[Stage]]:
+        return [analyzer.stages(preserve_keywords) for analyzer in self._analyzers()]
@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+    from token_optimizer.analyzers.stages import Stage, StageMemo
 
 
 class BaseStrategy(ABC):
@@ -31,3 +36,44 @@ class BaseStrategy(ABC):
         Returns:
             The optimized text.
         """
+
+    def stage_groups(
+        self, preserve_keywords: list[str] | None = None
+    ) -> list[list[Stage]] | None:
+        """Return the pipeline as memoizable stages, one list per analyzer.
+
+        Running all stages in order must give the same text as
+        :meth:`optimize`, and the text between two groups is a finished
+        analyzer output.  Strategies that expose stages can share work with
+        other strategies through a
+        :class:`~token_optimizer.analyzers.stages.StageMemo`.  Returns None
+        if the pipeline is opaque.
+        """
+        return None
+
+    def redundancy(self) -> RedundancyAnalyzer | None:
+        """Return the analyzer that removes duplicate sentences, or None.
+
+        :class:`~token_optimizer.streaming.OptimizationStream` uses its
+        settings to carry deduplication across windows.
+        """
+        return None
+
+    def stages(self, preserve_keywords: list[str] | None = None) -> list[Stage] | None:
+        """Return :meth:`stage_groups` flattened, or None if it is opaque."""
+        groups = self.stage_groups(preserve_keywords)
+        if groups is None:
+            return None
+        return [stage for group in groups for stage in group]
+
+    def optimize_memoized(
+        self,
+        text: str,
+        memo: StageMemo,
+        preserve_keywords: list[str] | None = None,
+    ) -> str:
+        """Like :meth:`optimize`, reusing and recording stage outputs in ``memo``."""
+        stages = self.stages(preserve_keywords)
+        if stages is None:
+            return self.optimize(text, preserve_keywords=preserve_keywords)
+        return memo.run(stages, text)
@@ -0,0 +1,55 @@
+"""Best-of strategy — evaluates several strategies on the same text."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from token_optimizer.analyzers.stages import StageMemo
+from token_optimizer.strategies.base import BaseStrategy
+
+if TYPE_CHECKING:
+    from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+
+
+class BestOfStrategy(BaseStrategy):
+    """Runs candidate strategies together, sharing their stage outputs.
+
+    Candidates are ordered from least to most aggressive.  They share one
+    :class:`StageMemo` per text, so a stage that two candidates apply to
+    the same intermediate text runs once.  :class:`TokenOptimizer` picks
+    the most compressed candidate whose similarity meets its threshold;
+    :meth:`optimize` on its own, with no similarity check, returns the
+    least aggressive candidate.
+    """
+
+    def __init__(self, candidates: list[BaseStrategy]) -> None:
+        if not candidates:
+            raise ValueError("candidates must not be empty")
+        self.candidates = candidates
+
+    @property
+    def name(self) -> str:
+        return "best"
+
+    def evaluate(
+        self,
+        text: str,
+        preserve_keywords: list[str] | None = None,
+        memo: StageMemo | None = None,
+    ) -> list[tuple[str, str]]:
+        """Return ``(strategy_name, optimized_text)`` for every candidate."""
+        memo = memo if memo is not None else StageMemo()
+        return [
+            (candidate.name, candidate.optimize_memoized(text, memo, preserve_keywords))
+            for candidate in self.candidates
+        ]
+
+    def optimize(
+        self, text: str, preserve_keywords: list[str] | None = None
+    ) -> str:
+        """Optimize text with the least aggressive candidate."""
+        return self.candidates[0].optimize(text, preserve_keywords=preserve_keywords)
+
+    def redundancy(self) -> RedundancyAnalyzer | None:
+        """Return the least aggressive candidate's redundancy analyzer."""
+        return self.candidates[0].redundancy()
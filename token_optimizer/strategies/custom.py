@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from token_optimizer.analyzers.stages import Stage, analyzer_stages
 from token_optimizer.strategies.base import BaseStrategy
 
+if TYPE_CHECKING:
+    from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+
 
 class CustomStrategy(BaseStrategy):
     """Strategy that runs a user-supplied list of analyzer instances.
@@ -29,3 +33,17 @@ class CustomStrategy(BaseStrategy):
         for analyzer in self._analyzers:
             result = analyzer.analyze(result, preserve_keywords=preserve_keywords)
         return result
+
+    def redundancy(self) -> RedundancyAnalyzer | None:
+        """Return the last RedundancyAnalyzer in the pipeline, if any."""
+        from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+
+        found = [a for a in self._analyzers if isinstance(a, RedundancyAnalyzer)]
+        return found[-1] if found else None
+
+    def stage_groups(
+        self, preserve_keywords: list[str] | None = None
+    ) -> list[list[Stage]]:
+        return [
+            analyzer_stages(analyzer, preserve_keywords) for analyzer in self._analyzers
+        ]
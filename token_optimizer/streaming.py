@@ -0,0 +1,215 @@
+"""Streaming optimization for documents too large to hold in memory."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from token_optimizer.analyzers.lsh import MinHashLSH
+from token_optimizer.analyzers.redundancy import RedundancyAnalyzer
+
+if TYPE_CHECKING:
+    from token_optimizer.engine import TokenOptimizer
+
+_SENTENCE_END = re.compile(r"[.!?]\s")
+_WHITESPACE = re.compile(r"\s")
+
+
+def _find_boundary(text: str, start: int, end: int) -> tuple[int, str]:
+    """Find the best place to end a window inside ``text[start:end]``.
+
+    Prefers a paragraph break, then a line break, then a sentence end, then
+    any whitespace, looking only in the second half of the window so windows
+    stay reasonably full.
+
+    Returns:
+        (cut_position, separator) where ``separator`` is the whitespace to
+        emit between this window's output and the next one.
+    """
+    floor = start + (end - start) // 2
+    cut = text.rfind("\n\n", floor, end)
+    if cut != -1:
+        return cut, "\n\n"
+    cut = text.rfind("\n", floor, end)
+    if cut != -1:
+        return cut, "\n"
+    last = None
+    for last in _SENTENCE_END.finditer(text, floor, end):
+        pass
+    if last is not None:
+        return last.start() + 1, " "
+    for last in _WHITESPACE.finditer(text, floor, end):
+        pass
+    if last is not None:
+        return last.start(), " "
+    return end, ""
+
+
+class _SeenSentences:
+    """Bounded index of emitted sentences' word sets, for near-duplicates.
+
+    Candidates come from a MinHash/LSH index and are confirmed with exact
+    Jaccard similarity.  Sentences are kept in two generations of at most
+    ``capacity // 2`` each; when the newer one fills, the older one is
+    forgotten.
+    """
+
+    def __init__(self, threshold: float, capacity: int) -> None:
+        self._threshold = threshold
+        self._half = max(capacity // 2, 1)
+        self._generations = [self._generation(), self._generation()]
+
+    @staticmethod
+    def _generation() -> tuple[MinHashLSH, list[set[str]]]:
+        return MinHashLSH(), []
+
+    def add_if_new(self, words: set[str]) -> bool:
+        """Remember ``words`` unless a similar sentence was seen; return
+        whether it was new."""
+        # Every MinHashLSH uses the same seed, so any one can sign.
+        signature = self._generations[0][0].signature(words)
+        for lsh, word_sets in self._generations:
+            for i in lsh.query(signature):
+                seen = word_sets[i]
+                if len(words & seen) / len(words | seen) > self._threshold:
+                    return False
+        lsh, word_sets = self._generations[-1]
+        if len(word_sets) >= self._half:
+            self._generations = [self._generations[1], self._generation()]
+            lsh, word_sets = self._generations[-1]
+        lsh.add(len(word_sets), signature)
+        word_sets.append(words)
+        return True
+
+
+class OptimizationStream:
+    """Iterator that optimizes a stream of text chunks window by window.
+
+    Incoming chunks are buffered until a window of roughly ``window_chars``
+    characters is available, cut at a paragraph, line or sentence boundary,
+    and run through the optimizer's strategy pipeline.  Optimized windows
+    are yielded as soon as they are ready, so memory stays bounded by the
+    window size plus the largest input chunk.
+
+    State carried across windows is kept small: running token counts and,
+    when the strategy deduplicates sentences across paragraphs (as
+    :meth:`TokenOptimizer.optimize` would on the whole document), a bounded
+    index of sentences already emitted.  A sentence similar to one of them
+    under the strategy's redundancy threshold is dropped, unless it
+    contains a preserved keyword.  Without cross-paragraph deduplication,
+    windows are optimized independently.
+
+    Usage:
+        stream = optimizer.optimize_stream(open("transcript.txt"))
+        for chunk in stream:
+            sys.stdout.write(chunk)
+        print(stream.savings_percent)
+    """
+
+    def __init__(
+        self,
+        optimizer: TokenOptimizer,
+        chunks: Iterable[str],
+        preserve_keywords: list[str] | None = None,
+        window_chars: int = 64_000,
+        max_fingerprints: int = 100_000,
+        min_dedup_words: int = 4,
+    ) -> None:
+        if window_chars < 2:
+            raise ValueError("window_chars must be at least 2")
+        self._optimizer = optimizer
+        self._chunks = chunks
+        self._preserve_keywords = preserve_keywords
+        self._window_chars = window_chars
+        self._min_dedup_words = min_dedup_words
+        self._seen: _SeenSentences | None = None
+        redundancy = optimizer.strategy.redundancy()
+        if redundancy is not None and redundancy.cross_paragraph:
+            self._seen = _SeenSentences(
+                redundancy.similarity_threshold, max_fingerprints
+            )
+        keywords = [*optimizer.config.preserve_keywords, *(preserve_keywords or [])]
+        keywords = [kw for kw in keywords if kw.strip()]
+        self._preserved = (
+            re.compile(
+                "|".join(rf"(?<!\w){re.escape(kw)}(?!\w)" for kw in keywords),
+                re.IGNORECASE,
+            )
+            if keywords
+            else None
+        )
+        self.original_tokens = 0
+        self.optimized_tokens = 0
+        self.windows = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.optimized_tokens
+
+    @property
+    def savings_percent(self) -> float:
+        if self.original_tokens == 0:
+            return 0.0
+        return self.tokens_saved / self.original_tokens * 100
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = ""
+        pos = 0
+        separator = ""
+        emitted = False
+
+        for chunk in self._chunks:
+            buffer = buffer[pos:] + chunk if pos else buffer + chunk
+            pos = 0
+            while len(buffer) - pos >= self._window_chars:
+                cut, next_separator = _find_boundary(
+                    buffer, pos, pos + self._window_chars
+                )
+                output = self._process(buffer[pos:cut])
+                if output:
+                    yield (separator if emitted else "") + output
+                    emitted = True
+                    separator = next_separator
+                elif emitted:
+                    separator = max(separator, next_separator, key=len)
+                pos = cut
+
+        output = self._process(buffer[pos:])
+        if output:
+            yield (separator if emitted else "") + output
+
+    def _process(self, window: str) -> str:
+        """Optimize one window and drop sentences seen in earlier windows."""
+        if not window.strip():
+            return ""
+        self.windows += 1
+        optimizer = self._optimizer
+        optimized, _, _ = optimizer.run_pipeline(window, self._preserve_keywords)
+        if self._seen is not None:
+            optimized = self._drop_seen_sentences(optimized, self._seen)
+
+        self.original_tokens += optimizer.count_tokens(window)
+        self.optimized_tokens += optimizer.count_tokens(optimized)
+        return optimized
+
+    def _drop_seen_sentences(self, text: str, seen: _SeenSentences) -> str:
+        """Remove sentences similar to ones already emitted."""
+        lines: list[str] = []
+        for line in text.split("\n"):
+            kept: list[str] = []
+            dropped = False
+            for sentence in RedundancyAnalyzer._split_sentences(line):
+                words = RedundancyAnalyzer._tokenize(sentence)
+                if (
+                    len(words) >= self._min_dedup_words
+                    and not (self._preserved and self._preserved.search(sentence))
+                    and not seen.add_if_new(set(words))
+                ):
+                    dropped = True
+                    continue
+                kept.append(sentence)
+            if not dropped:
+                lines.append(line)
+            elif kept:
+                lines.append(" ".join(kept))
+        return "\n".join(lines).strip()
@@ -1,6 +1,19 @@
 """Provider-specific tokenizers for accurate token counting."""
 
-from token_optimizer.tokenizers.base import BaseTokenizer
-from token_optimizer.tokenizers.generic import GenericTokenizer
+from typing import TYPE_CHECKING
+
+from token_optimizer._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from token_optimizer.tokenizers.base import BaseTokenizer
+    from token_optimizer.tokenizers.generic import GenericTokenizer
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseTokenizer": "token_optimizer.tokenizers.base",
+        "GenericTokenizer": "token_optimizer.tokenizers.generic",
+    },
+)
 
 __all__ = ["BaseTokenizer", "GenericTokenizer"]
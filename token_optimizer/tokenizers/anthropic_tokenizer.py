@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Sequence
+
 from token_optimizer.tokenizers.base import BaseTokenizer
 
 
@@ -17,6 +19,14 @@ class AnthropicTokenizer(BaseTokenizer):
     def name(self) -> str:
         return "anthropic"
 
+    @property
+    def is_estimate(self) -> bool:
+        return True
+
     def count_tokens(self, text: str) -> int:
         """Estimate token count using characters / 3.5 heuristic."""
         return round(len(text) / 3.5)
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+        """Estimate token counts for many texts in one loop."""
+        return [round(len(text) / 3.5) for text in texts]
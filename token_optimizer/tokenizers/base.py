@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 
 class BaseTokenizer(ABC):
@@ -13,6 +14,22 @@ class BaseTokenizer(ABC):
     def name(self) -> str:
         """Return the tokenizer name."""
 
+    @property
+    def identity(self) -> str:
+        """Identify the exact vocabulary, so counts can be shared safely.
+
+        Tokenizers whose name covers several encodings should override this.
+        """
+        return self.name
+
+    @property
+    def is_estimate(self) -> bool:
+        """Whether counts come from a cheap heuristic rather than a real encoder.
+
+        Estimated counts are cheaper to recompute than to memoize.
+        """
+        return False
+
     @abstractmethod
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in the given text.
@@ -23,3 +40,16 @@ class BaseTokenizer(ABC):
         Returns:
             The token count.
         """
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+        """Count tokens for many texts at once.
+
+        Subclasses override this with a faster bulk path where one exists.
+
+        Args:
+            texts: The input texts.
+
+        Returns:
+            One token count per text, in order.
+        """
+        return [self.count_tokens(text) for text in texts]
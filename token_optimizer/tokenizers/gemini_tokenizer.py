@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Sequence
+
 from token_optimizer.tokenizers.base import BaseTokenizer
 
 
@@ -18,6 +20,14 @@ class GeminiTokenizer(BaseTokenizer):
     def name(self) -> str:
         return "gemini"
 
+    @property
+    def is_estimate(self) -> bool:
+        return True
+
     def count_tokens(self, text: str) -> int:
         """Estimate token count using characters / 4.0 heuristic."""
         return round(len(text) / 4.0)
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+        """Estimate token counts for many texts in one loop."""
+        return [round(len(text) / 4.0) for text in texts]
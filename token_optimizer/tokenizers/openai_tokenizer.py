@@ -2,13 +2,125 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
 from token_optimizer.tokenizers.base import BaseTokenizer
 
+# Texts encoded per encode_batch call, per thread; bounds the token lists
+# held in memory at once.
+_BATCH_PER_THREAD = 256
+# encode_batch starts a thread pool per call; smaller batches encode serially.
+_MIN_THREADED_BATCH = 16
+# Chunks per thread when splitting one large text, for load balancing.
+_CHUNKS_PER_THREAD = 4
+# Characters on each side of a cut re-encoded to verify it.
+_VERIFY_CHARS = 128
+
+
+def split_at_safe_boundaries(text: str, chunk_chars: int) -> list[int]:
+    """Return cut positions splitting ``text`` into chunks of ~``chunk_chars``.
+
+    Cuts are only placed where tiktoken's pre-tokenizer always starts a new
+    pre-token, so BPE merges can never span a cut:
+
+    * just after a newline that is followed by a non-whitespace character;
+    * failing that, just before a space that follows a non-whitespace
+      character and precedes a letter (the space starts a `` word`` token).
+
+    Each cut is taken as late as possible in the second half of its window;
+    if the window has no safe position, the next safe position after it is
+    used.  Text with no safe position at all is left whole.
+    """
+    cuts: list[int] = []
+    length = len(text)
+    pos = 0
+    while length - pos > chunk_chars:
+        target = pos + chunk_chars
+        cut = _last_safe_cut(text, pos + max(1, chunk_chars // 2), target)
+        if cut is None:
+            cut = _next_safe_cut(text, target)
+            if cut is None:
+                break
+        cuts.append(cut)
+        pos = cut
+    return cuts
+
+
+def _newline_cut(text: str, i: int) -> bool:
+    return i + 1 < len(text) and not text[i + 1].isspace()
+
+
+def _space_cut(text: str, i: int) -> bool:
+    return (
+        i > 0
+        and i + 1 < len(text)
+        and not text[i - 1].isspace()
+        and text[i + 1].isalpha()
+    )
+
+
+def _last_safe_cut(text: str, floor: int, end: int) -> int | None:
+    """Latest safe cut in ``[floor, end]``, preferring newlines."""
+    i = text.rfind("\n", floor, end)
+    while i != -1:
+        if _newline_cut(text, i):
+            return i + 1
+        i = text.rfind("\n", floor, i)
+    i = text.rfind(" ", floor, end)
+    while i != -1:
+        if _space_cut(text, i):
+            return i
+        i = text.rfind(" ", floor, i)
+    return None
+
+
+def _next_safe_cut(text: str, start: int) -> int | None:
+    """Earliest safe cut after ``start``."""
+    newline = text.find("\n", start)
+    while newline != -1 and not _newline_cut(text, newline):
+        newline = text.find("\n", newline + 1)
+    space = text.find(" ", start)
+    while space != -1 and not _space_cut(text, space):
+        space = text.find(" ", space + 1)
+    candidates = []
+    if newline != -1:
+        candidates.append(newline + 1)
+    if space != -1:
+        candidates.append(space)
+    return min(candidates, default=None)
+
 
 class OpenAITokenizer(BaseTokenizer):
-    """Tokenizer that uses tiktoken for accurate OpenAI token counting."""
+    """Tokenizer that uses tiktoken for accurate OpenAI token counting.
 
-    def __init__(self, model: str = "gpt-4o") -> None:
+    Texts of at least ``parallel_min_chars`` characters are split at
+    boundaries where the encoder's pre-tokenizer always splits (see
+    :func:`split_at_safe_boundaries`) and the chunks are encoded in
+    parallel.  Each cut is double-checked by re-encoding a small window
+    around it; a cut whose window tokenizes differently is dropped, so the
+    count equals a serial ``encode`` of the whole text.  (The check matters
+    for the older r50k/p50k encodings, which group a whitespace run ending
+    in a newline differently at the end of a string.)
+
+    Args:
+        model: Model name used to pick the tiktoken encoding.
+        encoding: tiktoken encoding name; overrides ``model`` when given.
+        num_threads: Threads used for batches and large texts. tiktoken
+            releases the GIL while encoding, so these use several cores.
+            Defaults to the CPU count.
+        parallel_min_chars: Minimum text length for parallel counting, or
+            None to always count serially.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        encoding: str | None = None,
+        num_threads: int | None = None,
+        parallel_min_chars: int | None = 1_000_000,
+    ) -> None:
         try:
             import tiktoken
         except ImportError:
@@ -16,12 +128,63 @@ class OpenAITokenizer(BaseTokenizer):
                 "tiktoken is required for OpenAI token counting. "
                 "Install it with: pip install token-optimizer[openai]"
             )
-        self._encoding = tiktoken.encoding_for_model(model)
+        if encoding is not None:
+            self._encoding = tiktoken.get_encoding(encoding)
+        else:
+            self._encoding = tiktoken.encoding_for_model(model)
+        self._num_threads = num_threads or os.cpu_count() or 1
+        self._parallel_min_chars = parallel_min_chars
 
     @property
     def name(self) -> str:
         return "openai"
 
+    @property
+    def identity(self) -> str:
+        return f"openai:{self._encoding.name}"
+
     def count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken's encoding."""
+        if (
+            self._parallel_min_chars is not None
+            and self._num_threads > 1
+            and len(text) >= self._parallel_min_chars
+            # Special tokens make encode() raise; keep that on the serial path.
+            and "<|" not in text
+        ):
+            return self._count_parallel(text)
         return len(self._encoding.encode(text))
+
+    def _count_parallel(self, text: str) -> int:
+        """Count a large text by encoding safe-boundary chunks in threads."""
+        chunk_chars = -(-len(text) // (self._num_threads * _CHUNKS_PER_THREAD))
+        cuts = [
+            cut
+            for cut in split_at_safe_boundaries(text, chunk_chars)
+            if self._cut_is_exact(text, cut)
+        ]
+        bounds = [0, *cuts, len(text)]
+        chunks = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+        encode = self._encoding.encode
+        with ThreadPoolExecutor(max_workers=self._num_threads) as pool:
+            return sum(pool.map(lambda chunk: len(encode(chunk)), chunks))
+
+    def _cut_is_exact(self, text: str, cut: int) -> bool:
+        """Check that no token spans ``cut`` in a window around it."""
+        left = text[max(0, cut - _VERIFY_CHARS) : cut]
+        right = text[cut : cut + _VERIFY_CHARS]
+        encode = self._encoding.encode
+        return encode(left + right) == encode(left) + encode(right)
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+        """Count tokens for many texts with tiktoken's threaded batch encoder."""
+        if len(texts) < _MIN_THREADED_BATCH or self._num_threads == 1:
+            return [self.count_tokens(text) for text in texts]
+        step = _BATCH_PER_THREAD * self._num_threads
+        counts: list[int] = []
+        for start in range(0, len(texts), step):
+            encoded = self._encoding.encode_batch(
+                list(texts[start : start + step]), num_threads=self._num_threads
+            )
+            counts.extend(map(len, encoded))
+        return counts